@@ -4,6 +4,7 @@ from flask_cors import CORS
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
+from datetime import timedelta
 from database import db
 import os
 
@@ -16,9 +17,11 @@ app = Flask(__name__)
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-string-change-in-production')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = False  # Tokens don't expire for now
+# Short-lived access tokens renewed with a refresh token, so revocations can be pruned once the token expires
+app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_MINUTES', '15')))
+app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=int(os.getenv('JWT_REFRESH_TOKEN_DAYS', '7')))
 app.config['JWT_BLACKLIST_ENABLED'] = True
-app.config['JWT_BLACKLIST_TOKEN_CHECKS'] = ['access']
+app.config['JWT_BLACKLIST_TOKEN_CHECKS'] = ['access', 'refresh']
 app.config['FRONTEND_URL'] = os.getenv('FRONTEND_URL', 'http://localhost:3000')
 
 # Database configuration
@@ -39,9 +42,17 @@ CORS(app)
 # JWT blacklist checking
 @jwt.token_in_blocklist_loader
 def check_if_token_revoked(jwt_header, jwt_payload):
-    from models.jwt_blacklist import JWTBlacklist
-    jti = jwt_payload['jti']
-    return JWTBlacklist.is_blacklisted(jti)
+    from utils.token_revocations import token_revocations
+    # Tokens issued before expiry was enforced never expire, so their revocations could never be pruned
+    if 'exp' not in jwt_payload:
+        return True
+    return token_revocations.is_revoked(jwt_payload['jti'])
+
+# Load the user behind each request's JWT once; handlers read it with get_current_user()
+@jwt.user_lookup_loader
+def load_current_user(jwt_header, jwt_payload):
+    from utils.current_user import current_users
+    return current_users.load(int(jwt_payload['sub']))
 
 # Import models (to ensure they're registered with SQLAlchemy)
 from models import *
@@ -59,6 +70,7 @@ from routes.sos import sos_bp
 from routes.relocation import relocation_bp
 from routes.locations import locations_bp
 from routes.populate import populate_bp
+from routes.jobs import jobs_bp
 
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(barangay_bp, url_prefix='/api/barangay')
@@ -72,6 +84,7 @@ app.register_blueprint(sos_bp, url_prefix='/api/sos')
 app.register_blueprint(relocation_bp, url_prefix='/api/relocation')
 app.register_blueprint(locations_bp, url_prefix='/api/locations')
 app.register_blueprint(populate_bp, url_prefix='/api/populate')
+app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
 
 @app.route('/')
 def health_check():
@@ -90,8 +103,8 @@ def api_health_check():
 @app.route('/uploads/documents/<filename>')
 def serve_document(filename):
     """Serve generated PDF documents"""
-    uploads_dir = os.path.join(app.root_path, 'uploads', 'documents')
-    return send_from_directory(uploads_dir, filename)
+    from routes.documents import serve_document_file
+    return serve_document_file(filename)
 
 @app.route('/uploads/<path:file_path>')
 def serve_file(file_path):
@@ -109,9 +122,31 @@ if __name__ == '__main__':
         with app.app_context():
             db.create_all()
             print("✅ Database tables created successfully")
+            
+            # Warm the in-memory location tree and search index used by /api/locations
+            from utils.location_tree import location_tree
+            from utils.location_search import location_search
+            location_tree.load()
+            location_search.warm()
     except Exception as e:
         print(f"⚠️ Database initialization warning: {e}")
         print("Continuing startup...")
     
+    # Signed QR codes are only issued with a dedicated secret, never with the public SECRET_KEY default
+    from utils.document_signing import document_signer
+    if not document_signer.enabled:
+        print("⚠️ DOCUMENT_SIGNING_SECRET is not set: documents are issued with unsigned QR codes "
+              "and /api/documents/verify-signed and /api/documents/signing-keys answer 503")
+    
+    # Background workers for document rendering and email delivery
+    from utils.job_queue import job_queue
+    workers = job_queue.start(app)
+    print(f"🧵 Started {workers} background job worker(s)")
+    
+    # Periodic maintenance (expired document sweep, priority aging); leases keep each task to one process at a time
+    from utils.scheduler import scheduler
+    tasks = scheduler.start(app)
+    print(f"⏰ Scheduled tasks: {', '.join(tasks) or 'none'}")
+    
     print(f"🚀 Starting BarangayLink API on port {port}")
     app.run(debug=debug, host='0.0.0.0', port=port)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the (expires_at, status) index used by the expired document sweeper
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+
+def run_migration():
+    """Create ix_document_requests_expires_at_status on document_requests"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            with db.engine.begin() as conn:
+                conn.execute(db.text(
+                    'CREATE INDEX IF NOT EXISTS ix_document_requests_expires_at_status '
+                    'ON document_requests (expires_at, status)'
+                ))
+            print("✅ ix_document_requests_expires_at_status index created on document_requests")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
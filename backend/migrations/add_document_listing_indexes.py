@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the indexes behind the keyset-paginated document request listing
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+
+def run_migration():
+    """Create the (created_at, id), (requester_id, created_at, id) and (status, created_at, id) indexes on document_requests"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            with db.engine.begin() as conn:
+                conn.execute(db.text(
+                    'CREATE INDEX IF NOT EXISTS ix_document_requests_created_at_id '
+                    'ON document_requests (created_at, id)'
+                ))
+                print("✅ ix_document_requests_created_at_id index created on document_requests")
+                conn.execute(db.text(
+                    'CREATE INDEX IF NOT EXISTS ix_document_requests_requester_created_at '
+                    'ON document_requests (requester_id, created_at, id)'
+                ))
+                print("✅ ix_document_requests_requester_created_at index created on document_requests")
+                conn.execute(db.text(
+                    'CREATE INDEX IF NOT EXISTS ix_document_requests_status_created_at '
+                    'ON document_requests (status, created_at, id)'
+                ))
+                print("✅ ix_document_requests_status_created_at index created on document_requests")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the indexed verification_code column to the document_requests table
+"""
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+
+BACKFILL_BATCH_SIZE = 500
+
+def run_migration():
+    """Add, backfill and uniquely index document_requests.verification_code"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            columns = [column['name'] for column in db.inspect(db.engine).get_columns('document_requests')]
+            with db.engine.begin() as conn:
+                if 'verification_code' not in columns:
+                    conn.execute(db.text('ALTER TABLE document_requests ADD COLUMN verification_code VARCHAR(36)'))
+                    print("✅ verification_code column added to document_requests table")
+                else:
+                    print("✅ document_requests.verification_code already exists")
+
+                # Copy the code out of the QR JSON blob
+                updates = []
+                seen = set()
+                rows = conn.execute(db.text(
+                    'SELECT id, qr_code_data FROM document_requests '
+                    'WHERE qr_code_data IS NOT NULL AND verification_code IS NULL'
+                ))
+                for row in rows:
+                    try:
+                        verification_code = json.loads(row.qr_code_data)['verification_code']
+                    except (ValueError, KeyError, TypeError):
+                        print(f"⚠️ Skipping document request {row.id}: unreadable qr_code_data")
+                        continue
+                    if verification_code in seen:
+                        print(f"⚠️ Skipping document request {row.id}: duplicate verification code")
+                        continue
+                    seen.add(verification_code)
+                    updates.append({'id': row.id, 'verification_code': verification_code})
+
+                for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+                    conn.execute(
+                        db.text('UPDATE document_requests SET verification_code = :verification_code WHERE id = :id'),
+                        updates[start:start + BACKFILL_BATCH_SIZE]
+                    )
+                print(f"✅ Backfilled verification_code for {len(updates):,} document requests")
+
+                conn.execute(db.text(
+                    'CREATE UNIQUE INDEX IF NOT EXISTS ix_document_requests_verification_code '
+                    'ON document_requests (verification_code)'
+                ))
+                print("✅ Unique index on verification_code created")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
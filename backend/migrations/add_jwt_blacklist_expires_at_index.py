@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Migration script to index jwt_blacklist.expires_at for pruning expired token revocations
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+
+def run_migration():
+    """Create ix_jwt_blacklist_expires_at on jwt_blacklist"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            with db.engine.begin() as conn:
+                conn.execute(db.text(
+                    'CREATE INDEX IF NOT EXISTS ix_jwt_blacklist_expires_at '
+                    'ON jwt_blacklist (expires_at)'
+                ))
+            print("✅ ix_jwt_blacklist_expires_at index created on jwt_blacklist")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the is_active (soft delete) column to the locations table
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+
+def run_migration():
+    """Add locations.is_active, defaulting existing rows to active"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            columns = [column['name'] for column in db.inspect(db.engine).get_columns('locations')]
+            if 'is_active' in columns:
+                print("✅ locations.is_active already exists")
+                return True
+
+            with db.engine.begin() as conn:
+                conn.execute(db.text('ALTER TABLE locations ADD COLUMN is_active BOOLEAN DEFAULT TRUE'))
+                conn.execute(db.text('UPDATE locations SET is_active = TRUE WHERE is_active IS NULL'))
+
+            print("✅ is_active column added to locations table")
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+        print("You can now run populate_locations.py --sync.")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
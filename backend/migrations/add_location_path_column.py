@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the materialized ancestry path column to the locations table
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+from utils.location_loader import location_path
+
+BACKFILL_BATCH_SIZE = 2000
+
+def run_migration():
+    """Add, index and backfill locations.path"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            columns = [column['name'] for column in db.inspect(db.engine).get_columns('locations')]
+            with db.engine.begin() as conn:
+                if 'path' not in columns:
+                    conn.execute(db.text('ALTER TABLE locations ADD COLUMN path VARCHAR(64)'))
+                    conn.execute(db.text('CREATE INDEX IF NOT EXISTS ix_locations_path ON locations (path)'))
+                    print("✅ path column added to locations table")
+                else:
+                    print("✅ locations.path already exists")
+
+                # Parents sort before their children by level, so one ordered pass fills every path
+                paths = {}
+                updates = []
+                for row in conn.execute(db.text('SELECT id, parent_id FROM locations ORDER BY level, id')):
+                    paths[row.id] = location_path(paths.get(row.parent_id), row.id)
+                    updates.append({'id': row.id, 'path': paths[row.id]})
+
+                for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+                    conn.execute(
+                        db.text('UPDATE locations SET path = :path WHERE id = :id'),
+                        updates[start:start + BACKFILL_BATCH_SIZE]
+                    )
+                print(f"✅ Backfilled path for {len(updates):,} locations")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the normalized search_name column (and its trigram index) to the locations table
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+from utils.location_search import normalize_name
+
+BACKFILL_BATCH_SIZE = 2000
+
+def run_migration():
+    """Add and backfill locations.search_name; on PostgreSQL also build the pg_trgm GIN index"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            columns = [column['name'] for column in db.inspect(db.engine).get_columns('locations')]
+            with db.engine.begin() as conn:
+                if 'search_name' not in columns:
+                    conn.execute(db.text('ALTER TABLE locations ADD COLUMN search_name VARCHAR(255)'))
+                    print("✅ search_name column added to locations table")
+                else:
+                    print("✅ locations.search_name already exists")
+
+                # Accent stripping needs unicodedata, so the backfill runs in Python
+                rows = conn.execute(db.text('SELECT id, name FROM locations')).fetchall()
+                updates = [{'id': row.id, 'search_name': normalize_name(row.name)} for row in rows]
+                for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+                    conn.execute(
+                        db.text('UPDATE locations SET search_name = :search_name WHERE id = :id'),
+                        updates[start:start + BACKFILL_BATCH_SIZE]
+                    )
+                print(f"✅ Backfilled search_name for {len(updates):,} locations")
+
+                if conn.dialect.name == 'postgresql':
+                    conn.execute(db.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+                    conn.execute(db.text(
+                        'CREATE INDEX IF NOT EXISTS ix_locations_search_name_trgm '
+                        'ON locations USING gin (search_name gin_trgm_ops)'
+                    ))
+                    print("✅ pg_trgm GIN index created on locations.search_name")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+        print("/api/locations/search will use the trigram index after the next restart.")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
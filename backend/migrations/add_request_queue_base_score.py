@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Migration script to add request_queue.base_score and recompute stored priorities
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+from utils.request_queue import rebuild
+
+def run_migration():
+    """Add base_score to request_queue, then rebuild the queue so every row has it"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            columns = [column['name'] for column in db.inspect(db.engine).get_columns('request_queue')]
+            if 'base_score' not in columns:
+                with db.engine.begin() as conn:
+                    conn.execute(db.text('ALTER TABLE request_queue ADD COLUMN base_score INTEGER NOT NULL DEFAULT 0'))
+                print("✅ base_score column added to request_queue table")
+            else:
+                print("✅ request_queue.base_score already exists")
+
+            total = rebuild()
+            print(f"✅ Recomputed priorities for {total:,} queued requests")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Migration script to index request_queue.request_id for request detail lookups by bare id
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+
+def run_migration():
+    """Create ix_request_queue_request_id on request_queue"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            with db.engine.begin() as conn:
+                conn.execute(db.text(
+                    'CREATE INDEX IF NOT EXISTS ix_request_queue_request_id '
+                    'ON request_queue (request_id)'
+                ))
+            print("✅ ix_request_queue_request_id index created on request_queue")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
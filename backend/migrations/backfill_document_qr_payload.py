@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Migration script to replace stored QR code images with the QR payload (verification URL)
+"""
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+
+BACKFILL_BATCH_SIZE = 500
+
+def run_migration():
+    """Set document_requests.qr_code to the verification URL of every issued document"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            frontend_url = app.config.get('FRONTEND_URL', 'http://localhost:3000')
+            with db.engine.begin() as conn:
+                updates = []
+                rows = conn.execute(db.text(
+                    'SELECT id, qr_code_data FROM document_requests WHERE qr_code_data IS NOT NULL'
+                ))
+                for row in rows:
+                    try:
+                        verification_code = json.loads(row.qr_code_data)['verification_code']
+                    except (ValueError, KeyError, TypeError):
+                        print(f"⚠️ Skipping document request {row.id}: unreadable qr_code_data")
+                        continue
+                    updates.append({'id': row.id, 'qr_code': f"{frontend_url}/verify-document/{verification_code}"})
+
+                for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+                    conn.execute(
+                        db.text('UPDATE document_requests SET qr_code = :qr_code WHERE id = :id'),
+                        updates[start:start + BACKFILL_BATCH_SIZE]
+                    )
+                print(f"✅ Stored the QR payload for {len(updates):,} document requests")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
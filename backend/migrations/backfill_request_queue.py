@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Migration script to create and fill the request_queue read model behind /api/admin/requests
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+from models.request_queue import RequestQueueEntry
+from utils.request_queue import rebuild
+
+def run_migration():
+    """Create request_queue if needed and rebuild it from the four request tables"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            RequestQueueEntry.__table__.create(db.engine, checkfirst=True)
+            print("✅ request_queue table ready")
+
+            total = rebuild()
+            print(f"✅ Projected {total:,} requests into request_queue")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Migration script to widen document_requests.qr_code for signed QR payloads
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app
+from database import db
+
+def run_migration():
+    """Change document_requests.qr_code from VARCHAR(255) to TEXT"""
+    with app.app_context():
+        try:
+            print("Starting migration...")
+
+            if db.engine.dialect.name == 'postgresql':
+                with db.engine.begin() as conn:
+                    conn.execute(db.text('ALTER TABLE document_requests ALTER COLUMN qr_code TYPE TEXT'))
+                print("✅ document_requests.qr_code is now TEXT")
+            else:
+                # SQLite does not enforce VARCHAR lengths
+                print("✅ No change needed for this database")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("\n🎉 Database migration completed successfully!")
+    else:
+        print("\n💥 Migration failed. Please check the error messages above.")
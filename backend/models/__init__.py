@@ -16,3 +16,8 @@ from .relocation_request import RelocationRequest
 from .activity_log import ActivityLog
 from .jwt_blacklist import JWTBlacklist
 from .uploaded_file import UploadedFile
+from .job import Job
+from .document_revocation import DocumentRevocation
+from .lease import Lease
+from .request_queue import RequestQueueEntry
+from .dashboard_counter import DashboardCounter
@@ -0,0 +1,38 @@
+from database import db
+from datetime import datetime, timezone
+
+class DashboardCounter(db.Model):
+    """Running totals behind the admin dashboard, one row per barangay.
+
+    Adjusted by the session hooks in utils/dashboard_counters.py in the
+    same transaction as the user, document or SOS write that changes
+    them, and recounted from the source tables by a nightly task.
+    """
+    __tablename__ = 'dashboard_counters'
+
+    barangay_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # The admin's barangay_id (a locations.id); SOS routes store the same value, documents count under their requester's
+
+    # Residents
+    total_residents = db.Column(db.Integer, nullable=False, default=0)
+    pending_residents = db.Column(db.Integer, nullable=False, default=0)
+    approved_residents = db.Column(db.Integer, nullable=False, default=0)
+
+    # Requests waiting on the barangay
+    pending_documents = db.Column(db.Integer, nullable=False, default=0)
+    active_sos = db.Column(db.Integer, nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), onupdate=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    def __repr__(self):
+        return f'<DashboardCounter barangay {self.barangay_id}>'
+
+    def to_dict(self):
+        return {
+            'barangay_id': self.barangay_id,
+            'pending_residents': self.pending_residents,
+            'total_residents': self.total_residents,
+            'approved_residents': self.approved_residents,
+            'pending_documents': self.pending_documents,
+            'active_sos': self.active_sos,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -3,6 +3,12 @@ from datetime import datetime, timezone
 
 class DocumentRequest(db.Model):
     __tablename__ = 'document_requests'
+    __table_args__ = (
+        db.Index('ix_document_requests_expires_at_status', 'expires_at', 'status'),  # Expired document sweeper
+        db.Index('ix_document_requests_created_at_id', 'created_at', 'id'),  # Admin listing, newest first
+        db.Index('ix_document_requests_requester_created_at', 'requester_id', 'created_at', 'id'),  # Resident listing
+        db.Index('ix_document_requests_status_created_at', 'status', 'created_at', 'id'),  # Listing filtered by status, status counts
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     barangay_id = db.Column(db.Integer, db.ForeignKey('barangays.id'), nullable=False)
@@ -24,8 +30,9 @@ class DocumentRequest(db.Model):
     
     # Document Generation
     document_url = db.Column(db.String(255), nullable=True)
-    qr_code = db.Column(db.String(255), nullable=True)  # QR code for verification
+    qr_code = db.Column(db.Text, nullable=True)  # Payload encoded in the QR code (verification URL with signed token)
     qr_code_data = db.Column(db.Text, nullable=True)  # Data encoded in QR code
+    verification_code = db.Column(db.String(36), nullable=True, unique=True, index=True)  # Looked up by the public verify endpoint
     
     # Requirement Files
     requirement_files = db.Column(db.Text, nullable=True)  # JSON array of uploaded file IDs
@@ -88,6 +95,34 @@ class DocumentRequest(db.Model):
             print(f"Failed to get requirement files for request {self.id}: {str(e)}")
             return []
     
+    @staticmethod
+    def load_requirement_files(requests):
+        """Get {request id: requirement file dicts} for many requests in one query"""
+        import json
+        from models.uploaded_file import UploadedFile
+        
+        file_ids_by_request = {}
+        for doc_request in requests:
+            try:
+                file_ids_by_request[doc_request.id] = json.loads(doc_request.requirement_files) if doc_request.requirement_files else []
+            except Exception as e:
+                print(f"Failed to get requirement files for request {doc_request.id}: {str(e)}")
+                file_ids_by_request[doc_request.id] = []
+        
+        all_ids = {file_id for file_ids in file_ids_by_request.values() for file_id in file_ids}
+        files = {}
+        if all_ids:
+            files = {
+                file.id: file.to_dict() for file in UploadedFile.query.filter(
+                    UploadedFile.id.in_(all_ids),
+                    UploadedFile.is_active == True
+                )
+            }
+        return {
+            request_id: [files[file_id] for file_id in file_ids if file_id in files]
+            for request_id, file_ids in file_ids_by_request.items()
+        }
+    
     def add_requirement_file(self, file_id):
         """Add a requirement file to this document request"""
         import json
@@ -125,7 +160,8 @@ class DocumentRequest(db.Model):
             print(f"Failed to remove requirement file {file_id} from request {self.id}: {str(e)}")
             return False
 
-    def to_dict(self):
+    def to_dict(self, requirement_files=None):
+        """requirement_files: this request's entry from load_requirement_files(), if already loaded"""
         return {
             'id': self.id,
             'barangay_id': self.barangay_id,
@@ -141,7 +177,8 @@ class DocumentRequest(db.Model):
             'document_url': self.document_url,
             'qr_code': self.qr_code,
             'qr_code_data': self.qr_code_data,
-            'requirement_files': self.get_requirement_files(),
+            'verification_code': self.verification_code,
+            'requirement_files': requirement_files if requirement_files is not None else self.get_requirement_files(),
             'expires_at': self.expires_at.isoformat() if self.expires_at else None,
             'is_expired': self.is_expired,
             'delivery_method': self.delivery_method,
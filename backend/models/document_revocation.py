@@ -0,0 +1,35 @@
+from database import db
+from datetime import datetime, timezone
+
+class DocumentRevocation(db.Model):
+    __tablename__ = 'document_revocations'
+
+    id = db.Column(db.Integer, primary_key=True)
+    verification_code = db.Column(db.String(36), nullable=False, unique=True, index=True)
+    request_id = db.Column(db.Integer, nullable=True, index=True)  # No FK: the revocation outlives a deleted request
+    reason = db.Column(db.String(50), nullable=False)  # 'reissued', 'rejected', 'cancelled', 'expired', 'deleted'
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)  # When the revoked document would have expired anyway
+    revoked_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    def __repr__(self):
+        return f'<DocumentRevocation {self.verification_code} ({self.reason})>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'verification_code': self.verification_code,
+            'request_id': self.request_id,
+            'reason': self.reason,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'revoked_at': self.revoked_at.isoformat() if self.revoked_at else None
+        }
+
+    @staticmethod
+    def get_active_codes():
+        """Verification codes revoked before their document expired"""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return [
+            code for (code,) in db.session.query(DocumentRevocation.verification_code).filter(
+                db.or_(DocumentRevocation.expires_at == None, DocumentRevocation.expires_at >= now)
+            )
+        ]
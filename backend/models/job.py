@@ -0,0 +1,56 @@
+from database import db
+from datetime import datetime, timezone
+import json
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    idempotency_key = db.Column(db.String(100), nullable=True, unique=True)  # e.g. 'render_document:42'
+    payload = db.Column(db.Text, nullable=True)  # JSON arguments for the handler
+    result = db.Column(db.Text, nullable=True)  # JSON returned by the handler
+
+    # Scheduling
+    status = db.Column(db.String(20), default='queued', index=True)  # 'queued', 'running', 'succeeded', 'failed'
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=5)
+    run_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), index=True)  # Not before; pushed back on retry
+    last_error = db.Column(db.Text, nullable=True)
+
+    # Lease held by the worker running the job
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), onupdate=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.job_type} ({self.status})>'
+
+    def get_payload(self):
+        """Get payload as a dict"""
+        return json.loads(self.payload) if self.payload else {}
+
+    def get_result(self):
+        """Get result as a dict"""
+        return json.loads(self.result) if self.result else None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'idempotency_key': self.idempotency_key,
+            'payload': self.get_payload(),
+            'result': self.get_result(),
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_at': self.run_at.isoformat() if self.run_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -9,7 +9,7 @@ class JWTBlacklist(db.Model):
     token_type = db.Column(db.String(10), nullable=False)  # 'access' or 'refresh'
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     revoked_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # When the token itself expires; pruned after that
     
     def __repr__(self):
         return f'<JWTBlacklist {self.jti}>'
@@ -19,6 +19,25 @@ class JWTBlacklist(db.Model):
         """Check if a JWT ID is blacklisted"""
         return cls.query.filter_by(jti=jti).first() is not None
     
+    @classmethod
+    def get_active_jtis(cls):
+        """JWT IDs of revoked tokens that have not expired yet"""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return [jti for (jti,) in db.session.query(cls.jti).filter(cls.expires_at >= now)]
+    
+    @classmethod
+    def revoke(cls, jwt_payload, user_id=None):
+        """Blacklist a decoded token until it would have expired"""
+        existing = cls.query.filter_by(jti=jwt_payload['jti']).first()
+        if existing:
+            return existing
+        return cls.add_to_blacklist(
+            jti=jwt_payload['jti'],
+            token_type=jwt_payload['type'],
+            user_id=user_id,
+            expires_at=datetime.fromtimestamp(jwt_payload['exp'], timezone.utc).replace(tzinfo=None)
+        )
+    
     @classmethod
     def add_to_blacklist(cls, jti, token_type, user_id=None, expires_at=None):
         """Add a JWT ID to the blacklist"""
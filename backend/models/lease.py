@@ -0,0 +1,60 @@
+from database import db
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.exc import IntegrityError
+
+class Lease(db.Model):
+    __tablename__ = 'leases'
+
+    name = db.Column(db.String(100), primary_key=True)  # e.g. 'sweep_expired_documents'
+    holder = db.Column(db.String(100), nullable=True)  # host:pid of the process holding it
+    acquired_at = db.Column(db.DateTime, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<Lease {self.name} held by {self.holder}>'
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'holder': self.holder,
+            'acquired_at': self.acquired_at.isoformat() if self.acquired_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None
+        }
+
+    @staticmethod
+    def acquire(name, holder, seconds):
+        """Take or renew a named lease for `seconds`; False if another holder has it.
+
+        Works on any database: the lease is a row claimed with a conditional
+        UPDATE, so of several processes racing for it exactly one wins.
+        Commits the current session.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        claimed = db.session.execute(
+            db.update(Lease).where(
+                Lease.name == name,
+                db.or_(Lease.holder == holder, Lease.holder == None, Lease.expires_at < now)
+            ).values(holder=holder, acquired_at=now, expires_at=now + timedelta(seconds=seconds))
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return True
+
+        if db.session.get(Lease, name) is not None:
+            return False
+        try:
+            db.session.add(Lease(name=name, holder=holder, acquired_at=now, expires_at=now + timedelta(seconds=seconds)))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            # Another process created the row first
+            db.session.rollback()
+            return False
+
+    @staticmethod
+    def release(name, holder):
+        """Give up a lease early if this holder still has it"""
+        db.session.execute(
+            db.update(Lease).where(Lease.name == name, Lease.holder == holder).values(holder=None, expires_at=None)
+        )
+        db.session.commit()
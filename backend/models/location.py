@@ -7,6 +7,7 @@ class Location(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     psgc_code = db.Column(db.String(10), unique=True, nullable=False)
     name = db.Column(db.String(255), nullable=False)
+    search_name = db.Column(db.String(255), nullable=True)  # Casefolded, accent-stripped name; pg_trgm GIN indexed
     correspondence_code = db.Column(db.String(10), nullable=True)
     geographic_level = db.Column(db.String(20), nullable=False)  # Reg, Prov, City, Mun, Bgy
     old_names = db.Column(db.Text, nullable=True)
@@ -15,10 +16,12 @@ class Location(db.Model):
     urban_rural = db.Column(db.String(10), nullable=True)  # U, R
     population_2020 = db.Column(db.Integer, nullable=True)
     status = db.Column(db.String(50), nullable=True)
+    is_active = db.Column(db.Boolean, default=True)  # False once dropped from the source dataset (soft delete)
     
     # Hierarchical relationships
     parent_id = db.Column(db.Integer, db.ForeignKey('locations.id'), nullable=True)
     level = db.Column(db.Integer, nullable=False)  # 1=Region, 2=Province, 3=City/Mun, 4=Barangay
+    path = db.Column(db.String(64), nullable=True, index=True)  # Materialized path of ids, root first: "1/2/15/320"
     
     # Relationships
     parent = db.relationship('Location', remote_side=[id], backref='children')
@@ -42,8 +45,10 @@ class Location(db.Model):
             'urban_rural': self.urban_rural,
             'population_2020': self.population_2020,
             'status': self.status,
+            'is_active': self.is_active,
             'parent_id': self.parent_id,
             'level': self.level,
+            'path': self.path,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -51,14 +56,15 @@ class Location(db.Model):
     @staticmethod
     def get_provinces():
         """Get all provinces"""
-        return Location.query.filter_by(geographic_level='Prov').all()
+        return Location.query.filter_by(geographic_level='Prov', is_active=True).all()
     
     @staticmethod
     def get_municipalities_by_province(province_id):
         """Get municipalities/cities by province"""
         return Location.query.filter(
             Location.parent_id == province_id,
-            Location.geographic_level.in_(['City', 'Mun'])
+            Location.geographic_level.in_(['City', 'Mun']),
+            Location.is_active == True
         ).all()
     
     @staticmethod
@@ -66,7 +72,8 @@ class Location(db.Model):
         """Get barangays by municipality/city"""
         return Location.query.filter(
             Location.parent_id == municipality_id,
-            Location.geographic_level == 'Bgy'
+            Location.geographic_level == 'Bgy',
+            Location.is_active == True
         ).all()
     
     @staticmethod
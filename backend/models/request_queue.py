@@ -0,0 +1,64 @@
+from database import db
+from datetime import datetime, timezone
+
+class RequestQueueEntry(db.Model):
+    """One row per document, SOS, relocation or item request, shaped for the admin queue.
+
+    Doubles as the registry of every request: its key ('document-42',
+    'sos-7', ...) names the table and row a request lives in. Kept in step with the request tables by the session hooks in
+    utils/request_queue.py, in the same transaction as the write; the
+    age part of the priority is refreshed by a scheduled UPDATE.
+    """
+    __tablename__ = 'request_queue'
+    __table_args__ = (
+        db.UniqueConstraint('request_type', 'request_id', name='uq_request_queue_request'),
+        db.Index('ix_request_queue_request_id', 'request_id'),  # Lookups by bare request id
+        db.Index('ix_request_queue_order', 'priority_rank', 'created_at', 'id'),
+        db.Index('ix_request_queue_status_order', 'status', 'priority_rank', 'created_at', 'id'),
+        db.Index('ix_request_queue_type_status_order', 'request_type', 'status', 'priority_rank', 'created_at', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    request_type = db.Column(db.String(20), nullable=False)  # 'document', 'sos', 'relocation', 'item'
+    request_id = db.Column(db.Integer, nullable=False)  # id in the request's own table
+    status = db.Column(db.String(20), nullable=True)
+
+    # Requester, denormalized so the queue never joins users
+    requester_id = db.Column(db.Integer, nullable=True, index=True)
+    requester_barangay_id = db.Column(db.Integer, nullable=True)  # Item requests are scoped by the requester's barangay
+    requester_name = db.Column(db.String(200), nullable=True)
+
+    description = db.Column(db.Text, nullable=True)
+
+    # Priority
+    base_score = db.Column(db.Integer, nullable=False, default=0)  # From the request's content, set on write
+    priority_score = db.Column(db.Integer, nullable=False, default=0)  # base_score plus the age bonus, refreshed by the aging task
+    priority = db.Column(db.String(10), nullable=False, default='low')  # 'low', 'medium', 'high', 'urgent'
+    priority_rank = db.Column(db.SmallInteger, nullable=False, default=3)  # 0 = urgent ... 3 = low, for sorting
+
+    # Timestamps of the request itself
+    created_at = db.Column(db.DateTime, nullable=True)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), onupdate=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    def __repr__(self):
+        return f'<RequestQueueEntry {self.request_type}:{self.request_id} ({self.priority})>'
+
+    @property
+    def key(self):
+        """Typed request id that is unique across all request tables"""
+        return f"{self.request_type}-{self.request_id}"
+
+    def to_dict(self):
+        return {
+            'id': self.request_id,
+            'key': self.key,
+            'type': self.request_type,
+            'requester_name': self.requester_name or 'Unknown',
+            'status': self.status,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
+            'priority': self.priority,
+            'priority_score': self.priority_score,
+            'description': self.description
+        }
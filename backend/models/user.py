@@ -1,7 +1,7 @@
 from database import db
 from datetime import datetime, timedelta, timezone
-import bcrypt
 import uuid
+from utils.password_hasher import password_hasher, PasswordHasherBusy
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -59,7 +59,7 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
     
     def set_phone_number(self, phone_number):
         """Set phone number and sync with contact_number for frontend compatibility"""
@@ -68,7 +68,18 @@ class User(db.Model):
     
     def check_password(self, password):
         """Check if provided password matches hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.verify(password, self.password_hash)
+    
+    def rehash_password_if_needed(self, password):
+        """Re-hash a just-verified password if the bcrypt cost has gone up since it was set"""
+        if not password_hasher.needs_rehash(self.password_hash):
+            return False
+        try:
+            self.set_password(password)
+        except PasswordHasherBusy:
+            return False  # The login still succeeds; the upgrade waits for the next one
+        password_hasher.record_rehash()
+        return True
     
     def generate_email_verification_token(self):
         """Generate email verification token"""
@@ -122,11 +133,9 @@ class User(db.Model):
     
     def get_location_string(self):
         """Get formatted location string"""
-        location_parts = []
-        if self.barangay:
-            location_parts.append(self.barangay.name)
-        if self.municipality:
-            location_parts.append(self.municipality.name)
-        if self.province:
-            location_parts.append(self.province.name)
-        return ', '.join(location_parts)
+        from utils.location_tree import location_tree, address_names
+        
+        # The deepest location's materialized path names every level above it
+        location_id = self.barangay_id or self.municipality_id or self.province_id
+        names = address_names(location_tree.get_ancestries([location_id]).get(location_id, []))
+        return ', '.join(names[part] for part in ('barangay', 'municipality', 'province') if part in names)
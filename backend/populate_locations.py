@@ -3,176 +3,109 @@
 Script to populate Railway PostgreSQL database with Philippine location data from PH_LOC.json
 """
 
-import json
+import argparse
 import os
 import sys
-from datetime import datetime, timezone
 
 # Add the backend directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import app
-from database import db
-from models.location import Location
+from utils.location_tree import location_tree
+from utils.location_loader import find_location_file, iter_location_file, bulk_load_locations, sync_locations, DEFAULT_BATCH_SIZE
 
 def load_location_data():
-    """Load location data from PH_LOC.json"""
-    try:
-        with open('../PH_LOC.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
+    """Open PH_LOC.json as a stream of (province, municipality, [barangays]) tuples"""
+    location_file = find_location_file()
+    if not location_file:
         print("Error: PH_LOC.json not found. Make sure it's in the project root.")
         return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON: {e}")
-        return None
+    return iter_location_file(location_file)
+
+def print_progress(rows_written):
+    """Progress callback for the bulk loader"""
+    print(f"  Loaded {rows_written:,} locations...")
+
+def sync_location_data(batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Apply only the differences between PH_LOC.json and the locations table"""
+    print("Streaming location data from PH_LOC.json...")
+    location_data = load_location_data()
+
+    if not location_data:
+        return False
+
+    print("Dry run: computing differences without writing..." if dry_run else "Synchronizing locations...")
+
+    with app.app_context():
+        stats = sync_locations(location_data, batch_size=batch_size, progress=print_progress, dry_run=dry_run)
+        if not dry_run:
+            location_tree.invalidate()
 
-def generate_psgc_code(level, parent_code="", index=0):
-    """Generate a simple PSGC code for locations without official codes"""
-    if level == 1:  # Region
-        return f"R{index:02d}"
-    elif level == 2:  # Province
-        return f"{parent_code}P{index:02d}"
-    elif level == 3:  # Municipality/City
-        return f"{parent_code}M{index:02d}"
-    elif level == 4:  # Barangay
-        return f"{parent_code}B{index:03d}"
-    return f"LOC{index:06d}"
-
-def populate_locations():
+        print(f"\n✅ Location sync {'dry run ' if dry_run else ''}completed!")
+        print(f"📊 Changes:")
+        print(f"   Compared: {stats['total_compared']:,}")
+        print(f"   Inserted: {stats['inserted']:,}")
+        print(f"   Updated: {stats['updated']:,}")
+        print(f"   Reactivated: {stats['reactivated']:,}")
+        print(f"   Soft deleted: {stats['deleted']:,}")
+        print(f"   Unchanged: {stats['unchanged']:,}")
+        print(f"   Elapsed: {stats['elapsed_seconds']}s")
+        print(f"   Peak memory: {stats['peak_memory_mb']} MB")
+
+        return True
+
+def populate_locations(batch_size=DEFAULT_BATCH_SIZE, method='auto', dry_run=False):
     """Populate the database with location data"""
-    print("Loading location data from PH_LOC.json...")
+    print("Streaming location data from PH_LOC.json...")
     location_data = load_location_data()
-    
+
     if not location_data:
         return False
-    
-    print("Starting database population...")
-    
+
+    print("Dry run: generating rows without writing..." if dry_run else "Starting database population...")
+
     with app.app_context():
-        # Clear existing location data
-        print("Clearing existing location data...")
-        Location.query.delete()
-        db.session.commit()
-        
-        region_id = None
-        province_id = None
-        municipality_id = None
-        
-        region_index = 1
-        province_index = 1
-        municipality_index = 1
-        barangay_index = 1
-        
-        # Create a default region (we'll use the first province's region)
-        region = Location(
-            psgc_code=generate_psgc_code(1, "", region_index),
-            name="Philippines",
-            geographic_level="Reg",
-            level=1,
-            parent_id=None
+        stats = bulk_load_locations(
+            location_data,
+            batch_size=batch_size,
+            method=method,
+            progress=print_progress,
+            dry_run=dry_run
         )
-        db.session.add(region)
-        db.session.flush()  # Get the ID
-        region_id = region.id
-        region_index += 1
-        
-        print(f"Created region: {region.name}")
-        
-        # Process each province
-        for province_name, municipalities in location_data.items():
-            print(f"Processing province: {province_name}")
-            
-            # Create province
-            province = Location(
-                psgc_code=generate_psgc_code(2, region.psgc_code, province_index),
-                name=province_name,
-                geographic_level="Prov",
-                level=2,
-                parent_id=region_id
-            )
-            db.session.add(province)
-            db.session.flush()  # Get the ID
-            province_id = province.id
-            province_index += 1
-            
-            print(f"  Created province: {province_name}")
-            
-            # Process each municipality/city in the province
-            for municipality_name, barangays in municipalities.items():
-                print(f"    Processing municipality: {municipality_name}")
-                
-                # Determine if it's a city or municipality
-                # Simple heuristic: if it contains "City" or is a major city, mark as City
-                is_city = "City" in municipality_name or municipality_name in [
-                    "Manila", "Quezon City", "Caloocan", "Las Piñas", "Makati", 
-                    "Malabon", "Mandaluyong", "Marikina", "Muntinlupa", "Navotas",
-                    "Parañaque", "Pasay", "Pasig", "San Juan", "Taguig", "Valenzuela"
-                ]
-                
-                municipality = Location(
-                    psgc_code=generate_psgc_code(3, province.psgc_code, municipality_index),
-                    name=municipality_name,
-                    geographic_level="City" if is_city else "Mun",
-                    level=3,
-                    parent_id=province_id
-                )
-                db.session.add(municipality)
-                db.session.flush()  # Get the ID
-                municipality_id = municipality.id
-                municipality_index += 1
-                
-                print(f"      Created {'city' if is_city else 'municipality'}: {municipality_name}")
-                
-                # Process each barangay in the municipality
-                for barangay_name in barangays:
-                    barangay = Location(
-                        psgc_code=generate_psgc_code(4, municipality.psgc_code, barangay_index),
-                        name=barangay_name,
-                        geographic_level="Bgy",
-                        level=4,
-                        parent_id=municipality_id
-                    )
-                    db.session.add(barangay)
-                    barangay_index += 1
-                
-                print(f"        Added {len(barangays)} barangays")
-                
-                # Commit every 1000 records to avoid memory issues
-                if barangay_index % 1000 == 0:
-                    db.session.commit()
-                    print(f"        Committed {barangay_index} records so far...")
-        
-        # Final commit
-        print("Committing final changes...")
-        db.session.commit()
-        
-        # Print statistics
-        total_locations = Location.query.count()
-        regions = Location.query.filter_by(geographic_level="Reg").count()
-        provinces = Location.query.filter_by(geographic_level="Prov").count()
-        municipalities = Location.query.filter_by(geographic_level="Mun").count()
-        cities = Location.query.filter_by(geographic_level="City").count()
-        barangays = Location.query.filter_by(geographic_level="Bgy").count()
-        
-        print(f"\n✅ Database population completed!")
+        if not dry_run:
+            location_tree.invalidate()
+
+        print(f"\n✅ Database population {'dry run ' if dry_run else ''}completed!")
         print(f"📊 Statistics:")
-        print(f"   Total locations: {total_locations:,}")
-        print(f"   Regions: {regions}")
-        print(f"   Provinces: {provinces}")
-        print(f"   Municipalities: {municipalities}")
-        print(f"   Cities: {cities}")
-        print(f"   Barangays: {barangays:,}")
-        
+        print(f"   Total locations: {stats['total_locations']:,}")
+        print(f"   Regions: {stats['regions']}")
+        print(f"   Provinces: {stats['provinces']}")
+        print(f"   Municipalities: {stats['municipalities']}")
+        print(f"   Cities: {stats['cities']}")
+        print(f"   Barangays: {stats['barangays']:,}")
+        print(f"   Method: {stats['method']}")
+        print(f"   Elapsed: {stats['elapsed_seconds']}s")
+        print(f"   Peak memory: {stats['peak_memory_mb']} MB")
+
         return True
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Populate the locations table from PH_LOC.json')
+    parser.add_argument('--dry-run', action='store_true', help='Generate and time the rows without writing to the database')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per insert/COPY batch')
+    parser.add_argument('--method', choices=['auto', 'insert', 'copy'], default='auto', help='Write strategy (copy requires PostgreSQL)')
+    parser.add_argument('--sync', action='store_true', help='Apply only inserts, renames and soft deletes instead of reloading the table')
+    args = parser.parse_args()
+
     print("🇵🇭 Philippine Location Data Population Script")
     print("=" * 50)
-    
+
     try:
-        success = populate_locations()
+        if args.sync:
+            success = sync_location_data(batch_size=args.batch_size, dry_run=args.dry_run)
+        else:
+            success = populate_locations(batch_size=args.batch_size, method=args.method, dry_run=args.dry_run)
         if success:
             print("\n🎉 Successfully populated Railway database with Philippine location data!")
         else:
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from database import db
+from sqlalchemy.orm import joinedload
 from models.user import User
 from models.resident_profile import ResidentProfile
 from models.activity_log import ActivityLog
@@ -8,100 +9,39 @@ from models.document_request import DocumentRequest
 from models.sos_request import SOSRequest
 from models.relocation_request import RelocationRequest
 from models.item_request import ItemRequest
+from models.request_queue import RequestQueueEntry
+from models.uploaded_file import UploadedFile
 from utils.file_handler import move_temp_to_permanent, delete_user_files, migrate_user_files_to_permanent, update_user_file_paths
 from utils.email_service import email_service
+from utils.pagination import encode_cursor, decode_cursor, page_size, InvalidCursor
+from utils.request_priority import PRIORITY_RANKS
+from utils.request_queue import find_request, parse_request_key
+from utils.dashboard_counters import get_counters
+from utils.user_listing import paginate_users, serialize_users
 from datetime import datetime, timedelta, timezone
 import os
 import re
 
 admin_bp = Blueprint('admin', __name__)
 
-def determine_priority(request_type, request_data=None, document_type_name=None, purpose=None, emergency_type=None, created_at=None):
-    """
-    Determine request priority based on various factors
-    Returns: 'low', 'medium', 'high', 'urgent'
-    """
-    priority_score = 0
-    
-    # Base priority by request type
-    if request_type == 'sos':
-        priority_score += 50  # SOS requests are always high priority
-        if emergency_type:
-            emergency_high_priority = ['medical', 'fire', 'police', 'accident', 'crime']
-            if any(keyword in emergency_type.lower() for keyword in emergency_high_priority):
-                priority_score += 30
-    elif request_type == 'document':
-        priority_score += 20  # Base score for documents
-        
-        # Document type priority
-        if document_type_name:
-            high_priority_docs = ['medical', 'emergency', 'death', 'funeral', 'hospital', 'accident']
-            medium_priority_docs = ['employment', 'business', 'scholarship', 'education']
-            low_priority_docs = ['indigency', 'clearance', 'certificate', 'residency']
-            
-            doc_name_lower = document_type_name.lower()
-            if any(keyword in doc_name_lower for keyword in high_priority_docs):
-                priority_score += 30
-            elif any(keyword in doc_name_lower for keyword in medium_priority_docs):
-                priority_score += 15
-            elif any(keyword in doc_name_lower for keyword in low_priority_docs):
-                priority_score += 5
-        
-        # Purpose-based priority
-        if purpose:
-            purpose_lower = purpose.lower()
-            urgent_keywords = ['emergency', 'urgent', 'asap', 'immediately', 'hospital', 'medical', 'death', 'funeral', 'accident']
-            high_keywords = ['employment', 'job', 'work', 'business', 'scholarship', 'education', 'deadline']
-            medium_keywords = ['government', 'official', 'requirement', 'application']
-            
-            if any(keyword in purpose_lower for keyword in urgent_keywords):
-                priority_score += 40
-            elif any(keyword in purpose_lower for keyword in high_keywords):
-                priority_score += 25
-            elif any(keyword in purpose_lower for keyword in medium_keywords):
-                priority_score += 10
-    
-    elif request_type == 'relocation':
-        priority_score += 15  # Relocation requests are usually medium priority
-    
-    elif request_type == 'item':
-        priority_score += 10  # Item requests are usually low-medium priority
-    
-    # Time-based priority (older requests get higher priority)
-    if created_at:
-        try:
-            if isinstance(created_at, str):
-                created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            else:
-                created_date = created_at
-            
-            days_old = (datetime.now() - created_date.replace(tzinfo=None)).days
-            if days_old >= 7:
-                priority_score += 20  # Very old requests
-            elif days_old >= 3:
-                priority_score += 10  # Old requests
-            elif days_old >= 1:
-                priority_score += 5   # Slightly old requests
-        except:
-            pass  # If date parsing fails, continue without time bonus
-    
-    # Convert score to priority level
-    if priority_score >= 80:
-        return 'urgent'
-    elif priority_score >= 60:
-        return 'high'
-    elif priority_score >= 30:
-        return 'medium'
-    else:
-        return 'low'
+# Model and eager loads for each request type's detail view
+REQUEST_DETAIL_LOADERS = {
+    'document': (DocumentRequest, (joinedload(DocumentRequest.requester), joinedload(DocumentRequest.document_type))),
+    'sos': (SOSRequest, (joinedload(SOSRequest.requester),)),
+    'relocation': (RelocationRequest, (
+        joinedload(RelocationRequest.requester),
+        joinedload(RelocationRequest.from_barangay),
+        joinedload(RelocationRequest.to_barangay)
+    )),
+    'item': (ItemRequest, (joinedload(ItemRequest.requester), joinedload(ItemRequest.item)))
+}
 
 def admin_required(f):
     """Decorator to require admin role"""
     from functools import wraps
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         return f(*args, **kwargs)
@@ -113,38 +53,11 @@ def admin_required(f):
 def get_dashboard():
     """Get admin dashboard data"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
-        # Get barangay-specific statistics
-        barangay_id = user.barangay_id
-        
-        # Count pending residents
-        pending_residents = User.query.filter_by(
-            barangay_id=barangay_id,
-            status='pending',
-            role='resident'
-        ).count()
-        
-        # Count total residents
-        total_residents = User.query.filter_by(
-            barangay_id=barangay_id,
-            role='resident'
-        ).count()
-        
-        # Count approved residents
-        approved_residents = User.query.filter_by(
-            barangay_id=barangay_id,
-            status='approved',
-            role='resident'
-        ).count()
-        
-        return jsonify({
-            'barangay_id': barangay_id,
-            'pending_residents': pending_residents,
-            'total_residents': total_residents,
-            'approved_residents': approved_residents
-        }), 200
+        # Counters are kept current on every write, so this is a single primary-key read
+        counters = get_counters(user.barangay_id)
+        return jsonify(counters.to_dict()), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -155,8 +68,7 @@ def get_dashboard():
 def get_pending_residents():
     """Get pending resident registrations with pagination and filtering"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         # Get query parameters
         page = request.args.get('page', 1, type=int)
@@ -191,21 +103,10 @@ def get_pending_residents():
                 query = query.order_by(getattr(User, sort_by).asc())
         
         # Paginate results
-        pagination = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
-        
-        residents_data = []
-        for resident in pagination.items:
-            profile = ResidentProfile.query.filter_by(user_id=resident.id).first()
-            resident_data = resident.to_dict()
-            resident_data['profile'] = profile.to_dict() if profile else None
-            residents_data.append(resident_data)
+        pagination = paginate_users(query, page, per_page)
         
         return jsonify({
-            'residents': residents_data,
+            'residents': serialize_users(pagination.items),
             'pagination': {
                 'page': pagination.page,
                 'pages': pagination.pages,
@@ -225,8 +126,7 @@ def get_pending_residents():
 def get_resident_details(resident_id):
     """Get detailed resident information for verification"""
     try:
-        admin_id = int(get_jwt_identity())
-        admin = User.query.get(admin_id)
+        admin = get_current_user()
         
         resident = User.query.get(resident_id)
         if not resident:
@@ -263,7 +163,7 @@ def approve_resident(resident_id):
     """Approve a resident registration"""
     try:
         admin_id = int(get_jwt_identity())
-        admin = User.query.get(admin_id)
+        admin = get_current_user()
         
         resident = User.query.get(resident_id)
         if not resident:
@@ -345,7 +245,7 @@ def reject_resident(resident_id):
     """Reject a resident registration"""
     try:
         admin_id = int(get_jwt_identity())
-        admin = User.query.get(admin_id)
+        admin = get_current_user()
         
         resident = User.query.get(resident_id)
         if not resident:
@@ -409,8 +309,7 @@ def reject_resident(resident_id):
 def get_all_requests():
     """Get all types of requests for admin management"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         barangay_id = user.barangay_id
         
         # Get query parameters
@@ -418,326 +317,175 @@ def get_all_requests():
         status = request.args.get('status', 'all')
         priority = request.args.get('priority', 'all')
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        per_page = page_size(request.args.get('per_page', 10, type=int))
+        cursor = request.args.get('cursor')
+        
+        # Document, SOS and relocation requests are not scoped by barangay (there's only one barangay);
+        # item requests are scoped by the requester's barangay
+        query = RequestQueueEntry.query.filter(db.or_(
+            RequestQueueEntry.request_type != 'item',
+            RequestQueueEntry.requester_barangay_id == barangay_id
+        ))
+        if request_type != 'all':
+            query = query.filter(RequestQueueEntry.request_type == request_type)
+        if status != 'all':
+            query = query.filter(RequestQueueEntry.status == status)
+        if priority != 'all':
+            if priority not in PRIORITY_RANKS:
+                return jsonify({'success': False, 'error': 'Invalid priority'}), 400
+            query = query.filter(RequestQueueEntry.priority_rank == PRIORITY_RANKS[priority])
         
-        all_requests = []
+        total = query.order_by(None).count()
         
-        # Get document requests
-        if request_type in ['all', 'document']:
-            # Since DocumentRequest.barangay_id references barangays.id but User.barangay_id references locations.id,
-            # we need to get all document requests (there's only one barangay)
-            doc_requests = DocumentRequest.query
-            if status != 'all':
-                doc_requests = doc_requests.filter_by(status=status)
-            
-            for req in doc_requests.order_by(DocumentRequest.created_at.desc()).all():
-                requester = User.query.get(req.requester_id)
-                doc_type_name = 'Unknown'
-                try:
-                    if req.document_type:
-                        doc_type_name = req.document_type.name
-                except Exception:
-                    doc_type_name = 'Unknown'
-                
-                # Determine priority based on document type, purpose, and age
-                priority = determine_priority(
-                    request_type='document',
-                    document_type_name=doc_type_name,
-                    purpose=req.purpose,
-                    created_at=req.created_at
-                )
-                
-                all_requests.append({
-                    'id': req.id,
-                    'type': 'document',
-                    'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
-                    'status': req.status,
-                    'created_at': req.created_at.isoformat(),
-                    'processed_at': req.processed_at.isoformat() if req.processed_at else None,
-                    'priority': priority,
-                    'description': f"Document request: {doc_type_name}",
+        # Urgent first, then oldest first
+        order = (RequestQueueEntry.priority_rank, RequestQueueEntry.created_at, RequestQueueEntry.id)
+        if cursor:
+            try:
+                after = decode_cursor(cursor, int, datetime, int)
+            except InvalidCursor as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            query = query.filter(db.tuple_(*order) > after).order_by(*order)
+        else:
+            query = query.order_by(*order).offset((max(page, 1) - 1) * per_page)
+        entries = query.limit(per_page + 1).all()
+        
+        next_cursor = None
+        if len(entries) > per_page:
+            entries = entries[:per_page]
+            last = entries[-1]
+            next_cursor = encode_cursor(last.priority_rank, last.created_at, last.id)
+        
+        # Document rows carry delivery and contact details, fetched for the whole page at once
+        document_ids = [entry.request_id for entry in entries if entry.request_type == 'document']
+        documents = {}
+        if document_ids:
+            documents = {
+                doc.id: doc for doc in DocumentRequest.query.options(
+                    joinedload(DocumentRequest.requester),
+                    joinedload(DocumentRequest.document_type)
+                ).filter(DocumentRequest.id.in_(document_ids))
+            }
+        
+        paginated_requests = []
+        for entry in entries:
+            data = entry.to_dict()
+            req = documents.get(entry.request_id) if entry.request_type == 'document' else None
+            if req is not None:
+                requester = req.requester
+                data.update({
                     'purpose': req.purpose or 'No purpose specified',
                     'quantity': req.quantity,
                     'delivery_method': req.delivery_method,
                     'delivery_address': req.delivery_address,
                     'delivery_notes': req.delivery_notes,
-                    'document_type_name': doc_type_name,
+                    'document_type_name': req.document_type.name if req.document_type else 'Unknown',
                     'requester_email': requester.email if requester else 'Unknown',
-                    'requester_phone': requester.phone_number or requester.contact_number or 'No phone number'
+                    'requester_phone': (requester.phone_number or requester.contact_number or 'No phone number') if requester else 'No phone number'
                 })
-        
-        # Get SOS requests
-        if request_type in ['all', 'sos']:
-            # Since SOSRequest.barangay_id references barangays.id but User.barangay_id references locations.id,
-            # we need to get all SOS requests (there's only one barangay)
-            sos_requests = SOSRequest.query
-            if status != 'all':
-                sos_requests = sos_requests.filter_by(status=status)
-            
-            for req in sos_requests.order_by(SOSRequest.created_at.desc()).all():
-                requester = User.query.get(req.requester_id)
-                
-                # Determine priority based on emergency type and age
-                priority = determine_priority(
-                    request_type='sos',
-                    emergency_type=req.emergency_type,
-                    created_at=req.created_at
-                )
-                
-                all_requests.append({
-                    'id': req.id,
-                    'type': 'sos',
-                    'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
-                    'status': req.status,
-                    'created_at': req.created_at.isoformat(),
-                    'processed_at': req.responded_at.isoformat() if req.responded_at else None,
-                    'priority': priority,
-                    'description': f"SOS Request: {req.emergency_type} - {req.description}"
-                })
-        
-        # Get relocation requests
-        if request_type in ['all', 'relocation']:
-            # Since RelocationRequest.barangay_id references barangays.id but User.barangay_id references locations.id,
-            # we need to get all relocation requests (there's only one barangay)
-            relocation_requests = RelocationRequest.query
-            if status != 'all':
-                relocation_requests = relocation_requests.filter_by(status=status)
-            
-            for req in relocation_requests.order_by(RelocationRequest.created_at.desc()).all():
-                requester = User.query.get(req.requester_id)
-                from_barangay_name = 'Unknown'
-                to_barangay_name = 'Unknown'
-                try:
-                    if req.from_barangay:
-                        from_barangay_name = req.from_barangay.name
-                    if req.to_barangay:
-                        to_barangay_name = req.to_barangay.name
-                except Exception:
-                    pass
-                
-                # Determine priority based on age
-                priority = determine_priority(
-                    request_type='relocation',
-                    created_at=req.created_at
-                )
-                
-                all_requests.append({
-                    'id': req.id,
-                    'type': 'relocation',
-                    'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
-                    'status': req.status,
-                    'created_at': req.created_at.isoformat(),
-                    'processed_at': req.processed_at.isoformat() if req.processed_at else None,
-                    'priority': priority,
-                    'description': f"Relocation Request: {from_barangay_name} to {to_barangay_name}"
-                })
-        
-        # Get item requests
-        if request_type in ['all', 'item']:
-            item_requests = ItemRequest.query.join(User, ItemRequest.requester_id == User.id).filter(User.barangay_id == barangay_id)
-            if status != 'all':
-                item_requests = item_requests.filter_by(status=status)
-            
-            for req in item_requests.order_by(ItemRequest.created_at.desc()).all():
-                requester = User.query.get(req.requester_id)
-                item_title = 'Unknown Item'
-                try:
-                    if req.item:
-                        item_title = req.item.title
-                except Exception:
-                    item_title = 'Unknown Item'
-                
-                # Determine priority based on age
-                priority = determine_priority(
-                    request_type='item',
-                    created_at=req.created_at
-                )
-                
-                all_requests.append({
-                    'id': req.id,
-                    'type': 'item',
-                    'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
-                    'status': req.status,
-                    'created_at': req.created_at.isoformat(),
-                    'processed_at': req.processed_at.isoformat() if req.processed_at else None,
-                    'priority': priority,
-                    'description': f"Item Request: {item_title}"
-                })
-        
-        # Debug logging before filtering
-        print(f"Before priority filtering - Total requests: {len(all_requests)}")
-        print(f"Priority filter: {priority}")
-        print(f"Request priorities: {[req['priority'] for req in all_requests]}")
-        
-        # Filter by priority if specified
-        if priority != 'all':
-            original_count = len(all_requests)
-            all_requests = [req for req in all_requests if req['priority'] == priority]
-            print(f"After priority filtering - Filtered from {original_count} to {len(all_requests)} requests")
-        
-        # Sort all requests by priority (urgent first), then by created_at desc
-        priority_order = {'urgent': 0, 'high': 1, 'medium': 2, 'low': 3}
-        all_requests.sort(key=lambda x: (priority_order.get(x['priority'], 4), x['created_at']), reverse=False)
-        
-        # Simple pagination
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_requests = all_requests[start:end]
-        
-        # Debug logging
-        print(f"Admin requests endpoint - Found {len(all_requests)} total requests")
-        print(f"Request types: {[req['type'] for req in all_requests]}")
-        print(f"Request priorities: {[req['priority'] for req in all_requests]}")
-        print(f"Priority filter applied: {priority}")
+            paginated_requests.append(data)
         
         return jsonify({
             'success': True,
             'data': paginated_requests,
-            'total': len(all_requests),
+            'total': total,
             'page': page,
             'per_page': per_page,
-            'pages': (len(all_requests) + per_page - 1) // per_page,
-            'debug_info': {
-                'priority_filter': priority,
-                'all_priorities': list(set([req['priority'] for req in all_requests])),
-                'total_before_filter': len(all_requests)
-            }
+            'pages': (total + per_page - 1) // per_page,
+            'next_cursor': next_cursor
         }), 200
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @admin_bp.route('/requests/<int:request_id>/details', methods=['GET'])
+@admin_bp.route('/requests/<string:request_key>/details', methods=['GET'])
 @jwt_required()
 @admin_required
-def get_request_details(request_id):
-    """Get detailed information about a specific request"""
+def get_request_details(request_id=None, request_key=None):
+    """Get detailed information about a specific request.
+
+    Accepts a typed key from the request list ('document-42', 'sos-7') or a
+    bare id, optionally narrowed with ?type=.
+    """
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
-        
-        # Try to find the request in different tables
-        request_data = None
-        request_type = None
-        
-        # Check document requests
-        doc_request = DocumentRequest.query.get(request_id)
-        if doc_request:
-            requester = User.query.get(doc_request.requester_id)
-            doc_type_name = 'Unknown'
-            try:
-                if doc_request.document_type:
-                    doc_type_name = doc_request.document_type.name
-            except Exception:
-                doc_type_name = 'Unknown'
-            
-            request_data = {
-                'id': doc_request.id,
-                'type': 'document',
-                'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
-                'requester_email': requester.email if requester else 'Unknown',
-                'requester_phone': requester.phone_number or requester.contact_number or 'No phone number',
-                'status': doc_request.status,
-                'created_at': doc_request.created_at.isoformat(),
-                'processed_at': doc_request.processed_at.isoformat() if doc_request.processed_at else None,
-                'purpose': doc_request.purpose or 'No purpose specified',
-                'quantity': doc_request.quantity,
-                'delivery_method': doc_request.delivery_method,
-                'delivery_address': doc_request.delivery_address,
-                'delivery_notes': doc_request.delivery_notes,
-                'document_type_name': doc_type_name,
-                'processing_notes': doc_request.processing_notes,
-                'rejection_reason': doc_request.rejection_reason
-            }
-            request_type = 'document'
-        
-        # Check SOS requests
-        if not request_data:
-            sos_request = SOSRequest.query.get(request_id)
-            if sos_request:
-                requester = User.query.get(sos_request.requester_id)
-                request_data = {
-                    'id': sos_request.id,
-                    'type': 'sos',
-                    'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
-                    'requester_email': requester.email if requester else 'Unknown',
-                    'requester_phone': requester.phone_number or requester.contact_number or 'No phone number',
-                    'status': sos_request.status,
-                    'created_at': sos_request.created_at.isoformat(),
-                    'processed_at': sos_request.responded_at.isoformat() if sos_request.responded_at else None,
-                    'emergency_type': sos_request.emergency_type,
-                    'description': sos_request.description,
-                    'location': sos_request.location,
-                    'contact_number': sos_request.contact_number
-                }
-                request_type = 'sos'
-        
-        # Check relocation requests
-        if not request_data:
-            relocation_request = RelocationRequest.query.get(request_id)
-            if relocation_request:
-                requester = User.query.get(relocation_request.requester_id)
-                from_barangay_name = 'Unknown'
-                to_barangay_name = 'Unknown'
-                try:
-                    if relocation_request.from_barangay:
-                        from_barangay_name = relocation_request.from_barangay.name
-                    if relocation_request.to_barangay:
-                        to_barangay_name = relocation_request.to_barangay.name
-                except Exception:
-                    pass
-                
-                request_data = {
-                    'id': relocation_request.id,
-                    'type': 'relocation',
-                    'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
-                    'requester_email': requester.email if requester else 'Unknown',
-                    'requester_phone': requester.phone_number or requester.contact_number or 'No phone number',
-                    'status': relocation_request.status,
-                    'created_at': relocation_request.created_at.isoformat(),
-                    'processed_at': relocation_request.processed_at.isoformat() if relocation_request.processed_at else None,
-                    'from_barangay': from_barangay_name,
-                    'to_barangay': to_barangay_name,
-                    'reason': relocation_request.reason,
-                    'notes': relocation_request.notes
-                }
-                request_type = 'relocation'
-        
-        # Check item requests
-        if not request_data:
-            item_request = ItemRequest.query.get(request_id)
-            if item_request:
-                requester = User.query.get(item_request.requester_id)
-                item_title = 'Unknown Item'
-                try:
-                    if item_request.item:
-                        item_title = item_request.item.title
-                except Exception:
-                    item_title = 'Unknown Item'
-                
-                request_data = {
-                    'id': item_request.id,
-                    'type': 'item',
-                    'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
-                    'requester_email': requester.email if requester else 'Unknown',
-                    'requester_phone': requester.phone_number or requester.contact_number or 'No phone number',
-                    'status': item_request.status,
-                    'created_at': item_request.created_at.isoformat(),
-                    'processed_at': item_request.processed_at.isoformat() if item_request.processed_at else None,
-                    'item_title': item_title,
-                    'message': item_request.message,
-                    'quantity': item_request.quantity
-                }
-                request_type = 'item'
-        
-        if not request_data:
+        if request_key is not None:
+            parsed = parse_request_key(request_key)
+            if parsed is None:
+                return jsonify({'success': False, 'error': 'Request not found'}), 404
+            request_type, request_id = parsed
+        else:
+            request_type = request.args.get('type')
+        
+        # One indexed lookup in the request registry says which table the request is in
+        entry = find_request(request_id, request_type)
+        if not entry:
+            return jsonify({'success': False, 'error': 'Request not found'}), 404
+        
+        model, options = REQUEST_DETAIL_LOADERS[entry.request_type]
+        req = model.query.options(*options).filter(model.id == entry.request_id).first()
+        if not req:
             return jsonify({'success': False, 'error': 'Request not found'}), 404
         
-        # Get uploaded files for document requests
+        requester = req.requester
+        request_data = {
+            'id': req.id,
+            'key': entry.key,
+            'type': entry.request_type,
+            'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
+            'requester_email': requester.email if requester else 'Unknown',
+            'requester_phone': (requester.phone_number or requester.contact_number or 'No phone number') if requester else 'No phone number',
+            'status': req.status,
+            'created_at': req.created_at.isoformat() if req.created_at else None,
+            'processed_at': entry.processed_at.isoformat() if entry.processed_at else None
+        }
+        
+        if entry.request_type == 'document':
+            request_data.update({
+                'purpose': req.purpose or 'No purpose specified',
+                'quantity': req.quantity,
+                'delivery_method': req.delivery_method,
+                'delivery_address': req.delivery_address,
+                'delivery_notes': req.delivery_notes,
+                'document_type_name': req.document_type.name if req.document_type else 'Unknown',
+                'processing_notes': req.processing_notes,
+                'rejection_reason': req.rejection_reason,
+                'requirement_files': DocumentRequest.load_requirement_files([req])[req.id]
+            })
+        elif entry.request_type == 'sos':
+            request_data.update({
+                'emergency_type': req.emergency_type,
+                'description': req.description,
+                'location': req.location,
+                'contact_number': req.contact_phone
+            })
+        elif entry.request_type == 'relocation':
+            request_data.update({
+                'from_barangay': req.from_barangay.name if req.from_barangay else 'Unknown',
+                'to_barangay': req.to_barangay.name if req.to_barangay else 'Unknown',
+                'new_address': req.new_address,
+                'reason': req.reason,
+                'notes': req.transfer_notes
+            })
+        else:
+            request_data.update({
+                'item_title': req.item.title if req.item else 'Unknown Item',
+                'purpose': req.purpose,
+                'message': req.requester_message,
+                'requested_loan_days': req.requested_loan_days,
+                'rejection_reason': req.rejection_reason
+            })
+        
+        # Get uploaded files for document requests, in one query
         uploaded_files = []
-        if request_type == 'document':
-            from utils.file_handler import get_user_files
-            uploaded_files = get_user_files(doc_request.requester_id)
+        if entry.request_type == 'document':
+            files = UploadedFile.query.filter(
+                UploadedFile.user_id == req.requester_id,
+                UploadedFile.is_active == True
+            ).order_by(UploadedFile.created_at.desc()).all()
+            uploaded_files = [
+                {**file.to_dict(), 'filename': file.original_filename, 'size': file.file_size, 'url': f"/uploads/{file.file_path}"}
+                for file in files
+            ]
         
         return jsonify({
             'success': True,
@@ -754,8 +502,7 @@ def get_request_details(request_id):
 def get_all_users():
     """Get all users for admin management"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         barangay_id = user.barangay_id
         
         # Get query parameters
@@ -774,28 +521,11 @@ def get_all_users():
             query = query.filter_by(status=status)
         
         # Paginate results
-        pagination = query.order_by(User.created_at.desc()).paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
-        
-        users_data = []
-        for user in pagination.items:
-            profile = ResidentProfile.query.filter_by(user_id=user.id).first()
-            user_data = user.to_dict()
-            user_data['profile'] = profile.to_dict() if profile else None
-            
-            # Add location relationship data for address construction
-            user_data['province'] = {'name': user.province.name} if user.province else None
-            user_data['municipality'] = {'name': user.municipality.name} if user.municipality else None
-            user_data['barangay'] = {'name': user.barangay.name} if user.barangay else None
-            
-            users_data.append(user_data)
+        pagination = paginate_users(query.order_by(User.created_at.desc()), page, per_page)
         
         return jsonify({
             'success': True,
-            'data': users_data,
+            'data': serialize_users(pagination.items),
             'total': pagination.total,
             'page': pagination.page,
             'per_page': pagination.per_page,
@@ -1,9 +1,10 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from database import db
 from models.announcement import Announcement
 from models.user import User
 from models.activity_log import ActivityLog
+from utils.response_cache import cached_response
 from datetime import datetime
 import json
 
@@ -70,6 +71,7 @@ def get_announcement(announcement_id):
         return jsonify({'error': str(e)}), 500
 
 @announcements_bp.route('/categories', methods=['GET'])
+@cached_response(ttl=300, tables=('announcements',))
 def get_announcement_categories():
     """Get all announcement categories"""
     try:
@@ -85,7 +87,7 @@ def create_announcement():
     """Create a new announcement (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -142,7 +144,7 @@ def update_announcement(announcement_id):
     """Update an announcement (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -198,7 +200,7 @@ def delete_announcement(announcement_id):
     """Delete an announcement (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -243,7 +245,7 @@ def pin_announcement(announcement_id):
     """Pin/unpin an announcement (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -290,8 +292,7 @@ def pin_announcement(announcement_id):
 def get_all_announcements():
     """Get all announcements for admin management"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
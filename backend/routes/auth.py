@@ -5,7 +5,8 @@ from flask_jwt_extended import (
     get_jwt_identity, 
     get_jwt,
     create_refresh_token,
-    jwt_required
+    get_current_user,
+    decode_token
 )
 from database import db
 from models.user import User
@@ -15,6 +16,7 @@ from models.activity_log import ActivityLog
 from models.jwt_blacklist import JWTBlacklist
 from utils.file_handler import validate_file, save_temp_file, delete_temp_file, get_user_files, migrate_user_files_to_permanent, update_user_file_paths
 from utils.email_service import email_service
+from utils.password_hasher import PasswordHasherBusy
 from datetime import datetime, timedelta, timezone
 import uuid
 import os
@@ -56,11 +58,11 @@ def register():
         municipality = Location.query.get(data['municipality_id'])
         barangay = Location.query.get(data['barangay_id'])
         
-        if not province or province.geographic_level != 'Prov':
+        if not province or province.geographic_level != 'Prov' or province.is_active is False:
             return jsonify({'error': 'Invalid province'}), 400
-        if not municipality or municipality.geographic_level not in ['City', 'Mun']:
+        if not municipality or municipality.geographic_level not in ['City', 'Mun'] or municipality.is_active is False:
             return jsonify({'error': 'Invalid municipality/city'}), 400
-        if not barangay or barangay.geographic_level != 'Bgy':
+        if not barangay or barangay.geographic_level != 'Bgy' or barangay.is_active is False:
             return jsonify({'error': 'Invalid barangay'}), 400
         
         # Validate file uploads
@@ -189,6 +191,8 @@ def register():
                 delete_temp_file(profile_pic_filename)
         except:
             pass
+        if isinstance(e, PasswordHasherBusy):
+            return jsonify({'error': 'Too many sign-ins right now. Please try again in a moment.'}), 503, {'Retry-After': str(e.retry_after)}
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/verify/<token>', methods=['GET'])
@@ -319,6 +323,9 @@ def login():
                 'status': 'pending_approval'
             }), 401
         
+        # Upgrade the stored hash if the bcrypt cost has gone up since it was made
+        user.rehash_password_if_needed(password)
+        
         # Update last login
         user.last_login = datetime.now(timezone.utc).replace(tzinfo=None)
         db.session.commit()
@@ -333,6 +340,7 @@ def login():
             identity=str(user.id),
             additional_claims=additional_claims
         )
+        refresh_token = create_refresh_token(identity=str(user.id))
         
         # Log activity
         activity = ActivityLog(
@@ -350,10 +358,13 @@ def login():
         
         return jsonify({
             'access_token': access_token,
+            'refresh_token': refresh_token,
             'user': user.to_dict(),
             'barangay': user.barangay.to_dict() if user.barangay else None
         }), 200
         
+    except PasswordHasherBusy as e:
+        return jsonify({'error': 'Too many sign-ins right now. Please try again in a moment.'}), 503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -362,8 +373,7 @@ def login():
 def get_profile():
     """Get current user profile"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -376,22 +386,49 @@ def get_profile():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """Issue a new access token for a valid refresh token"""
+    try:
+        user = get_current_user()
+        
+        if not user or not user.is_active or user.status != 'approved':
+            return jsonify({'error': 'Session is no longer valid. Please log in again.'}), 401
+        
+        # Claims are re-read so a role or barangay change applies from the next refresh
+        access_token = create_access_token(
+            identity=str(user.id),
+            additional_claims={
+                'role': user.role,
+                'status': user.status,
+                'barangay_id': user.barangay_id
+            }
+        )
+        
+        return jsonify({'access_token': access_token}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
     """Logout user and blacklist token"""
     try:
         user_id = int(get_jwt_identity())
-        jti = get_jwt()['jti']  # JWT ID
-        user = User.query.get(user_id)
-        
-        # Add token to blacklist
-        JWTBlacklist.add_to_blacklist(
-            jti=jti,
-            token_type='access',
-            user_id=user_id,
-            expires_at=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=1)
-        )
+        user = get_current_user()
+        
+        # Blacklist the access token, and the refresh token if the client sent it, until they expire
+        JWTBlacklist.revoke(get_jwt(), user_id=user_id)
+        refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+        if refresh_token:
+            try:
+                refresh_payload = decode_token(refresh_token)
+            except Exception:
+                refresh_payload = None  # Expired or malformed: nothing left to revoke
+            if refresh_payload and refresh_payload['type'] == 'refresh' and refresh_payload['sub'] == str(user_id):
+                JWTBlacklist.revoke(refresh_payload, user_id=user_id)
         
         if user:
             # Log activity
@@ -525,6 +562,9 @@ def re_register():
             'user': user.to_dict()
         }), 200
         
+    except PasswordHasherBusy as e:
+        db.session.rollback()
+        return jsonify({'error': 'Too many sign-ins right now. Please try again in a moment.'}), 503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -535,7 +575,7 @@ def get_user_files_endpoint():
     """Get all files uploaded by the current user"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -557,7 +597,7 @@ def update_profile():
     """Update user profile including profile picture"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -635,7 +675,7 @@ def migrate_user_files():
     """Migrate user's temporary files to permanent storage"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -2,10 +2,12 @@ from flask import Blueprint, request, jsonify
 from database import db
 from models.barangay import Barangay
 from models.activity_log import ActivityLog
+from utils.response_cache import cached_response
 
 barangay_bp = Blueprint('barangay', __name__)
 
 @barangay_bp.route('/', methods=['GET'])
+@cached_response(ttl=600, tables=('barangays',))
 def get_barangays():
     """Get all active barangays"""
     try:
@@ -1,10 +1,11 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from database import db
 from models.benefit import Benefit
 from models.benefit_application import BenefitApplication
 from models.user import User
 from models.activity_log import ActivityLog
+from utils.response_cache import cached_response
 from datetime import datetime, timezone
 import json
 
@@ -60,6 +61,7 @@ def get_benefit(benefit_id):
         return jsonify({'error': str(e)}), 500
 
 @benefits_bp.route('/categories', methods=['GET'])
+@cached_response(ttl=300, tables=('benefits',))
 def get_benefit_categories():
     """Get all benefit categories"""
     try:
@@ -74,8 +76,7 @@ def get_benefit_categories():
 def get_admin_benefits():
     """Get all benefits for admin management (including inactive)"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -121,7 +122,7 @@ def create_benefit():
     """Create a new benefit (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -170,7 +171,7 @@ def update_benefit(benefit_id):
     """Update a benefit (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -220,7 +221,7 @@ def delete_benefit(benefit_id):
     """Delete a benefit (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -258,7 +259,7 @@ def create_benefit_application():
     """Create a new benefit application (resident only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -318,7 +319,7 @@ def get_my_applications():
     """Get current user's benefit applications"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -351,8 +352,7 @@ def get_my_applications():
 def get_all_applications():
     """Get all benefit applications (admin only)"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -386,7 +386,7 @@ def approve_application(application_id):
     """Approve a benefit application (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -433,7 +433,7 @@ def reject_application(application_id):
     """Reject a benefit application (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -483,7 +483,7 @@ def complete_application(application_id):
     """Mark a benefit application as completed (admin only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
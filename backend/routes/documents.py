@@ -1,291 +1,154 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask import Blueprint, request, jsonify, current_app, send_file, send_from_directory, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, get_current_user
 from models.document_type import DocumentType
 from models.document_request import DocumentRequest
 from models.user import User
 from models.barangay import Barangay
 from models.activity_log import ActivityLog
+from models.lease import Lease
 from database import db
-import qrcode
+from sqlalchemy.orm import joinedload, selectinload
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit, parse_qs
 import io
-import base64
-from datetime import datetime, timezone
 import json
 import os
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+import re
 import uuid
 from utils.file_handler import cleanup_expired_documents, cleanup_expired_documents_by_type
 from utils.email_service import email_service
+from utils.response_cache import cached_response
+from utils.job_queue import job_queue
+from utils.document_artifacts import document_artifacts
+from utils.document_sweeper import document_sweeper, LEASE_NAME as SWEEP_LEASE_NAME
+from utils.document_pdf import print_index_page_count, render_print_index
+from utils.pdf_stream import StreamingPdfWriter
+from utils.qr_code import qr_png
+from utils.pagination import keyset_page, page_size, InvalidCursor
+from utils.verification_cache import verification_cache
+from utils.document_signing import document_signer, InvalidDocumentToken
+from utils.document_revocations import revocation_list
 
 documents_bp = Blueprint('documents', __name__)
 
-# Helper function to generate QR code
-def generate_qr_code(data):
-    """Generate QR code for document verification"""
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(data)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    
-    return img_str
+BULK_APPROVE_LIMIT = 200
+PRINT_BATCH_LIMIT = 500
+PRINT_BATCH_CHUNK = 50
 
-# Helper function to generate PDF document
-def generate_document_pdf(document_request):
-    """Generate modern PDF document with professional styling"""
-    # Create a buffer to store the PDF
-    buffer = io.BytesIO()
-    
-    # Create the PDF document with custom margins
-    doc = SimpleDocTemplate(
-        buffer, 
-        pagesize=letter,
-        rightMargin=72,
-        leftMargin=72,
-        topMargin=72,
-        bottomMargin=72
-    )
-    styles = getSampleStyleSheet()
-    
-    # Modern color scheme
-    primary_color = colors.HexColor('#1e40af')  # Blue-800
-    secondary_color = colors.HexColor('#64748b')  # Slate-500
-    accent_color = colors.HexColor('#059669')  # Emerald-600
-    light_gray = colors.HexColor('#f8fafc')  # Slate-50
-    dark_gray = colors.HexColor('#334155')  # Slate-700
-    
-    # Custom modern styles
-    title_style = ParagraphStyle(
-        'ModernTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        fontName='Helvetica-Bold',
-        textColor=primary_color,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        leading=28
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'ModernSubtitle',
-        parent=styles['Heading2'],
-        fontSize=14,
-        fontName='Helvetica',
-        textColor=secondary_color,
-        spaceAfter=15,
-        alignment=TA_CENTER,
-        leading=18
-    )
-    
-    section_header_style = ParagraphStyle(
-        'SectionHeader',
-        parent=styles['Heading2'],
-        fontSize=14,
-        fontName='Helvetica-Bold',
-        textColor=dark_gray,
-        spaceAfter=12,
-        spaceBefore=20,
-        leading=18
-    )
-    
-    normal_style = ParagraphStyle(
-        'ModernNormal',
-        parent=styles['Normal'],
-        fontSize=11,
-        fontName='Helvetica',
-        textColor=dark_gray,
-        spaceAfter=8,
-        leading=14
-    )
-    
-    small_style = ParagraphStyle(
-        'ModernSmall',
-        parent=styles['Normal'],
-        fontSize=9,
-        fontName='Helvetica',
-        textColor=secondary_color,
-        spaceAfter=4,
-        leading=12
-    )
-    
-    # Build the PDF content
-    story = []
-    
-    # Modern Header with Barangay Info
-    story.append(Spacer(1, 20))
-    
-    # Barangay Name (if available)
-    barangay_name = "BARANGAY OFFICE"
-    if hasattr(document_request, 'barangay') and document_request.barangay:
-        barangay_name = document_request.barangay.name.upper()
-    
-    story.append(Paragraph(barangay_name, title_style))
-    story.append(Paragraph("OFFICIAL DOCUMENT", subtitle_style))
-    story.append(Spacer(1, 30))
-    
-    # Document Type with modern styling
-    doc_type_box = Table([
-        [Paragraph(f"<b>{document_request.document_type.name.upper()}</b>", 
-                  ParagraphStyle('DocType', parent=styles['Heading1'], 
-                               fontSize=18, fontName='Helvetica-Bold',
-                               textColor=colors.white, alignment=TA_CENTER))]
-    ], colWidths=[6*inch])
+def render_job_key(request_id):
+    """Idempotency key of the render + deliver job for a document request"""
+    return f"render_document:{request_id}"
+
+def stamp_document(doc_request, processed_by):
+    """Give a request a fresh verification code, issue date and expiry and mark it 'ready'.
     
-    doc_type_box.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), primary_color),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 18),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 15),
-        ('ROUNDEDCORNERS', (0, 0), (-1, -1), 8),
-    ]))
+    Nothing is rendered here: the PDF is rendered the first time its
+    document_url is downloaded (see utils/document_artifacts.py).
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     
-    story.append(doc_type_box)
-    story.append(Spacer(1, 25))
+    # Generate QR code data
+    qr_data = {
+        'request_id': doc_request.id,
+        'document_type': doc_request.document_type.name,
+        'requester': doc_request.requester.get_full_name(),
+        'barangay': doc_request.barangay.name,
+        'issued_date': now.isoformat(),
+        'verification_code': str(uuid.uuid4())
+    }
     
-    # Document Information Section
-    story.append(Paragraph("DOCUMENT INFORMATION", section_header_style))
+    doc_request.status = 'ready'
+    doc_request.qr_code_data = json.dumps(qr_data)
+    doc_request.verification_code = qr_data['verification_code']
+    doc_request.processed_by = processed_by
+    doc_request.processed_at = now
     
-    # Create modern table for document details
-    data = [
-        ['Document ID:', f"#{str(document_request.id).zfill(6)}"],
-        ['Date Issued:', document_request.processed_at.strftime('%B %d, %Y') if document_request.processed_at else 'Pending'],
-        ['Valid Until:', document_request.expires_at.strftime('%B %d, %Y') if document_request.expires_at else 'N/A'],
-        ['Requester Name:', document_request.requester.get_full_name()],
-        ['Purpose:', document_request.purpose or 'Not specified'],
-        ['Quantity:', str(document_request.quantity)],
-        ['Status:', f"<b>{document_request.status.title()}</b>"],
-    ]
+    # Set expiration date based on document type validity period
+    if doc_request.document_type.validity_days:
+        doc_request.expires_at = now + timedelta(days=doc_request.document_type.validity_days)
     
-    # Modern table styling
-    table = Table(data, colWidths=[2.2*inch, 3.8*inch])
-    table.setStyle(TableStyle([
-        # Header row styling
-        ('BACKGROUND', (0, 0), (0, -1), light_gray),
-        ('TEXTCOLOR', (0, 0), (0, -1), dark_gray),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (0, -1), 10),
-        
-        # Data row styling
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (1, 0), (1, -1), 10),
-        ('TEXTCOLOR', (1, 0), (1, -1), dark_gray),
-        
-        # Alignment and spacing
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('LEFTPADDING', (0, 0), (-1, -1), 12),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-        
-        # Borders
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('LINEBELOW', (0, 0), (-1, 0), 1, primary_color),
-    ]))
+    # The QR code carries a signed copy of the document details, so it verifies offline;
+    # without a signing secret it is the plain URL, verified against the database
+    signature = document_signer.sign(doc_request)
+    doc_request.qr_code = verification_url_for(doc_request) + (f"?sig={signature}" if signature else '')
+    doc_request.document_url = document_url_for(doc_request)
+
+def issue_document(doc_request, processed_by):
+    """Stamp verification data on a request and, for email delivery, queue the delivery job.
     
-    story.append(table)
-    story.append(Spacer(1, 25))
+    Returns the job, or None when there is nothing to deliver. The caller commits.
+    """
+    stamp_document(doc_request, processed_by)
+    if doc_request.delivery_method != 'email':
+        return None
+    return job_queue.enqueue('render_document', {'request_id': doc_request.id}, idempotency_key=render_job_key(doc_request.id))
+
+def document_url_for(doc_request):
+    """Download URL of a stamped document; the verification code makes it unguessable"""
+    return f"/uploads/documents/document_{doc_request.id}_{doc_request.verification_code}.pdf"
+
+def verification_url_for(doc_request):
+    """URL encoded in a document's QR code; it opens the frontend verification page"""
+    verification_code = doc_request.verification_code
+    frontend_url = current_app.config.get('FRONTEND_URL', 'http://localhost:3000')
+    return f"{frontend_url}/verify-document/{verification_code}"
+
+@job_queue.register('render_document')
+def render_document_job(job):
+    """Render a document request's PDF (if it is not cached yet) and email it"""
+    doc_request = DocumentRequest.query.get(job.get_payload()['request_id'])
+    if doc_request is None:
+        return {'skipped': 'Document request no longer exists'}
     
-    # QR Code section with modern styling
-    if document_request.qr_code_data:
-        # QR Code header
-        qr_header = Table([
-            [Paragraph("DOCUMENT VERIFICATION", 
-                      ParagraphStyle('QRHeader', parent=styles['Heading2'],
-                                   fontSize=12, fontName='Helvetica-Bold',
-                                   textColor=colors.white, alignment=TA_CENTER))]
-        ], colWidths=[6*inch])
-        
-        qr_header.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), accent_color),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('ROUNDEDCORNERS', (0, 0), (-1, -1), 4),
-        ]))
-        
-        story.append(qr_header)
-        story.append(Spacer(1, 15))
-        
-        # QR Code description
-        story.append(Paragraph(
-            "Scan the QR code below to verify the authenticity and validity of this document.", 
-            normal_style
-        ))
-        story.append(Spacer(1, 15))
-        
-        # Add QR code image
-        try:
-            import base64
-            from reportlab.lib.utils import ImageReader
-            
-            # Decode base64 image
-            qr_image_data = base64.b64decode(document_request.qr_code)
-            qr_buffer = io.BytesIO(qr_image_data)
-            
-            # Create image object with modern styling
-            from reportlab.platypus import Image
-            qr_img = Image(qr_buffer, width=120, height=120)
-            
-            # Center the QR code
-            qr_table = Table([[qr_img]], colWidths=[6*inch])
-            qr_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ]))
-            
-            story.append(qr_table)
-            
-        except Exception as e:
-            # Fallback: show error message
-            story.append(Paragraph(
-                f"<i>QR Code generation failed: {str(e)}</i>", 
-                small_style
-            ))
+    key, filepath = document_artifacts.fetch(doc_request)
+    result = {'document_url': doc_request.document_url, 'document_path': filepath}
     
-    # Modern Footer
-    story.append(Spacer(1, 40))
+    # Send email if delivery method is email
+    if doc_request.delivery_method == 'email':
+        email_sent = email_service.send_document_email(
+            user_email=doc_request.requester.email,
+            user_name=doc_request.requester.get_full_name(),
+            document_request=doc_request,
+            document_path=filepath
+        )
+        if not email_sent:
+            raise RuntimeError(f"Failed to send document email to {doc_request.requester.email}")
+        print(f"Document email sent successfully to {doc_request.requester.email}")
+        result['email_sent'] = True
     
-    # Footer line
-    footer_line = Table([['']], colWidths=[6*inch])
-    footer_line.setStyle(TableStyle([
-        ('LINEABOVE', (0, 0), (-1, -1), 1, primary_color),
-    ]))
-    story.append(footer_line)
-    story.append(Spacer(1, 15))
+    return result
+
+DOCUMENT_FILENAME = re.compile(r'^document_(\d+)_([0-9a-f-]{36})\.pdf$')
+
+def serve_document_file(filename):
+    """Send an issued document's PDF, rendering it on the first download.
     
-    # Footer content
-    footer_data = [
-        Paragraph("Generated by <b>BarangayLink</b>", small_style),
-        Paragraph(f"Document generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", small_style),
-        Paragraph("This is an official document issued by the Barangay Office", small_style)
-    ]
+    Files written before PDFs were rendered on demand are still served
+    from uploads/documents as they are.
+    """
+    uploads_dir = os.path.join(current_app.root_path, 'uploads', 'documents')
+    if os.path.isfile(os.path.join(uploads_dir, os.path.basename(filename))):
+        return send_from_directory(uploads_dir, filename)
     
-    for footer_item in footer_data:
-        story.append(footer_item)
+    match = DOCUMENT_FILENAME.match(filename)
+    if not match:
+        return jsonify({'success': False, 'message': 'Document not found'}), 404
     
-    # Build PDF
-    doc.build(story)
-    buffer.seek(0)
+    doc_request = DocumentRequest.query.options(
+        joinedload(DocumentRequest.document_type),
+        joinedload(DocumentRequest.requester),
+        joinedload(DocumentRequest.barangay)
+    ).filter_by(id=int(match.group(1)), verification_code=match.group(2)).first()
+    if doc_request is None or doc_request.status not in ('ready', 'completed'):
+        return jsonify({'success': False, 'message': 'Document not found'}), 404
+    if doc_request.is_document_expired():
+        return jsonify({'success': False, 'message': 'Document has expired and is no longer available'}), 410
     
-    return buffer
+    key, path = document_artifacts.fetch(doc_request)
+    return send_file(path, mimetype='application/pdf', download_name=filename, etag=key, max_age=0)
 
 @documents_bp.route('/types', methods=['GET'])
+@cached_response(ttl=600, tables=('document_types',))
 def get_document_types():
     """Get all available document types"""
     try:
@@ -339,7 +202,7 @@ def create_document_type():
         db.session.commit()
         
         # Log activity
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity = ActivityLog(
             barangay_id=user.barangay_id,
             user_id=int(get_jwt_identity()),
@@ -391,7 +254,7 @@ def update_document_type(type_id):
         db.session.commit()
         
         # Log activity
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity = ActivityLog(
             barangay_id=user.barangay_id,
             user_id=int(get_jwt_identity()),
@@ -475,6 +338,8 @@ def delete_document_type(type_id):
                         if os.path.exists(file_path):
                             os.remove(file_path)
                             deleted_files.append(req.document_url)
+                        elif document_artifacts.discard(req):
+                            deleted_files.append(req.document_url)
                     except Exception as e:
                         print(f"Failed to delete file {req.document_url}: {str(e)}")
                 
@@ -487,7 +352,7 @@ def delete_document_type(type_id):
         db.session.commit()
         
         # Log activity with more details
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity_description = f"Deleted document type: {doc_type.name}"
         if deletion_reason:
             activity_description += f" (Reason: {deletion_reason})"
@@ -541,7 +406,7 @@ def deactivate_document_type(type_id):
         db.session.commit()
         
         # Log activity
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity_description = f"Deactivated document type: {doc_type.name}"
         if deactivation_reason:
             activity_description += f" (Reason: {deactivation_reason})"
@@ -584,7 +449,7 @@ def reactivate_document_type(type_id):
         db.session.commit()
         
         # Log activity
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity = ActivityLog(
             barangay_id=user.barangay_id,
             user_id=int(get_jwt_identity()),
@@ -624,7 +489,7 @@ def bulk_delete_document_types():
             return jsonify({'success': False, 'message': 'No document types specified'}), 400
         
         results = []
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         
         for type_id in type_ids:
             try:
@@ -658,6 +523,8 @@ def bulk_delete_document_types():
                                 file_path = os.path.join(current_app.root_path, 'uploads', req.document_url.lstrip('/'))
                                 if os.path.exists(file_path):
                                     os.remove(file_path)
+                                else:
+                                    document_artifacts.discard(req)
                             except Exception as e:
                                 print(f"Failed to delete file {req.document_url}: {str(e)}")
                         req.status = 'cancelled'
@@ -754,7 +621,7 @@ def create_document_request():
             return jsonify({'success': False, 'message': 'Document type is required'}), 400
         
         # Get user and barangay info
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         if not user:
             return jsonify({'success': False, 'message': 'User not found'}), 404
         
@@ -839,8 +706,7 @@ def get_document_request_files(request_id):
     """Get all files for a document request"""
     try:
         claims = get_jwt()
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'success': False, 'message': 'User not found'}), 404
@@ -874,7 +740,7 @@ def delete_document_request_file(request_id, file_id):
     try:
         claims = get_jwt()
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'success': False, 'message': 'User not found'}), 404
@@ -932,8 +798,7 @@ def download_file(file_id):
         from models.uploaded_file import UploadedFile
         
         claims = get_jwt()
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'success': False, 'message': 'User not found'}), 404
@@ -978,8 +843,7 @@ def get_file_info(file_id):
         from models.uploaded_file import UploadedFile
         
         claims = get_jwt()
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({'success': False, 'message': 'User not found'}), 404
@@ -1010,29 +874,91 @@ def get_file_info(file_id):
 @documents_bp.route('/requests', methods=['GET'])
 @jwt_required()
 def get_my_document_requests():
-    """Get user's document requests"""
+    """Get user's document requests, newest first, one page at a time"""
     try:
         claims = get_jwt()
         user_id = int(get_jwt_identity())
         
+        query = DocumentRequest.query.options(
+            selectinload(DocumentRequest.requester),
+            selectinload(DocumentRequest.document_type)
+        )
+        
         # Get requests based on user role
         if claims.get('role') == 'admin':
             # Admin sees all requests in their barangay
-            user = User.query.get(user_id)
+            user = get_current_user()
             if not user:
                 return jsonify({'success': False, 'message': 'User not found'}), 404
             
             # Since DocumentRequest.barangay_id references barangays.id but User.barangay_id references locations.id,
             # we need to find the corresponding barangay record
             # For now, let's get all document requests since there's only one barangay
-            requests = DocumentRequest.query.all()
         else:
             # Resident sees only their requests
-            requests = DocumentRequest.query.filter_by(requester_id=user_id).all()
+            query = query.filter(DocumentRequest.requester_id == user_id)
+        
+        # Filters
+        status = request.args.get('status')
+        if status:
+            query = query.filter(DocumentRequest.status == status)
+        
+        document_type_id = request.args.get('document_type_id', type=int)
+        if document_type_id:
+            query = query.filter(DocumentRequest.document_type_id == document_type_id)
+        
+        try:
+            date_from = request.args.get('date_from')
+            if date_from:
+                query = query.filter(DocumentRequest.created_at >= datetime.strptime(date_from, '%Y-%m-%d'))
+            date_to = request.args.get('date_to')
+            if date_to:
+                query = query.filter(DocumentRequest.created_at < datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1))
+        except ValueError:
+            return jsonify({'success': False, 'message': 'date_from and date_to must be YYYY-MM-DD'}), 400
+        
+        limit = page_size(request.args.get('limit', type=int))
+        try:
+            requests, next_cursor = keyset_page(
+                query, DocumentRequest.created_at, DocumentRequest.id,
+                cursor=request.args.get('cursor'), limit=limit
+            )
+        except InvalidCursor as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        
+        # Requirement files for the whole page in one query
+        requirement_files = DocumentRequest.load_requirement_files(requests)
         
         return jsonify({
             'success': True,
-            'data': [req.to_dict() for req in requests]
+            'data': [req.to_dict(requirement_files=requirement_files[req.id]) for req in requests],
+            'pagination': {
+                'limit': limit,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@documents_bp.route('/requests/stats', methods=['GET'])
+@jwt_required()
+def get_document_request_stats():
+    """Count the user's document requests by status (all requests for admins) in one grouped query"""
+    try:
+        claims = get_jwt()
+        query = db.session.query(DocumentRequest.status, db.func.count(DocumentRequest.id))
+        if claims.get('role') != 'admin':
+            query = query.filter(DocumentRequest.requester_id == int(get_jwt_identity()))
+        
+        by_status = {status: count for status, count in query.group_by(DocumentRequest.status)}
+        return jsonify({
+            'success': True,
+            'data': {
+                'total': sum(by_status.values()),
+                'by_status': by_status
+            }
         }), 200
         
     except Exception as e:
@@ -1056,124 +982,284 @@ def get_document_request(request_id):
             'success': True,
             'data': doc_request.to_dict()
         }), 200
-        
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@documents_bp.route('/requests/<int:request_id>/qr-code', methods=['GET'])
+@jwt_required()
+def get_document_qr_code(request_id):
+    """Get a PNG preview of a document's verification QR code"""
+    try:
+        claims = get_jwt()
+        user_id = int(get_jwt_identity())
+
+        doc_request = DocumentRequest.query.get_or_404(request_id)
+
+        # Check access permissions
+        if claims.get('role') == 'resident' and doc_request.requester_id != user_id:
+            return jsonify({'success': False, 'message': 'Access denied'}), 403
+
+        if not doc_request.qr_code:
+            return jsonify({'success': False, 'message': 'Document has not been issued yet'}), 404
+
+        response = current_app.response_class(qr_png(doc_request.qr_code), mimetype='image/png')
+        response.cache_control.private = True
+        response.cache_control.max_age = 3600
+        return response
+
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @documents_bp.route('/requests/<int:request_id>/approve', methods=['POST'])
 @jwt_required()
 def approve_document_request(request_id):
-    """Approve document request and generate document (admin only)"""
+    """Approve document request; its PDF is rendered on first download (admin only)"""
     try:
         claims = get_jwt()
         if claims.get('role') != 'admin':
             return jsonify({'success': False, 'message': 'Admin access required'}), 403
         
         doc_request = DocumentRequest.query.get_or_404(request_id)
-        data = request.get_json()
-        
-        # Update request status
-        doc_request.status = 'approved'
-        doc_request.processed_by = int(get_jwt_identity())
-        doc_request.processed_at = datetime.now(timezone.utc).replace(tzinfo=None)
-        doc_request.processing_notes = data.get('processing_notes', '')
-        
-        # Generate verification code
-        verification_code = str(uuid.uuid4())
-        
-        # Generate QR code data
-        qr_data = {
-            'request_id': doc_request.id,
-            'document_type': doc_request.document_type.name,
-            'requester': doc_request.requester.get_full_name(),
-            'barangay': doc_request.barangay.name,
-            'issued_date': datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-            'verification_code': verification_code
-        }
-        
-        # Generate QR code with URL that directs to verification page
-        # Use the frontend URL with the verification code as a parameter
-        frontend_url = current_app.config.get('FRONTEND_URL', 'http://localhost:3000')
-        verification_url = f"{frontend_url}/verify-document/{verification_code}"
-        qr_code = generate_qr_code(verification_url)
-        
-        # Update request with QR code and mark as ready
-        doc_request.status = 'ready'
-        doc_request.qr_code = qr_code
-        doc_request.qr_code_data = json.dumps(qr_data)
-        
-        # Set expiration date based on document type validity period
-        if doc_request.document_type.validity_days:
-            from datetime import timedelta
-            doc_request.expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=doc_request.document_type.validity_days)
-        
-        # Generate PDF document
-        pdf_buffer = generate_document_pdf(doc_request)
-        
-        # Save PDF to uploads directory
-        uploads_dir = os.path.join(current_app.root_path, 'uploads', 'documents')
-        os.makedirs(uploads_dir, exist_ok=True)
-        
-        filename = f"document_{doc_request.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = os.path.join(uploads_dir, filename)
-        
-        with open(filepath, 'wb') as f:
-            f.write(pdf_buffer.getvalue())
-        
-        doc_request.document_url = f"/uploads/documents/{filename}"
+        data = request.get_json() or {}
         
-        db.session.commit()
+        # A repeated approval while the document is still being emailed is a no-op
+        job = job_queue.get_active(render_job_key(doc_request.id))
+        if job:
+            return jsonify({
+                'success': True,
+                'message': 'Document is already being emailed',
+                'data': doc_request.to_dict(),
+                'job': job.to_dict()
+            }), 202
         
-        # Send email if delivery method is email
-        email_sent = False
-        if doc_request.delivery_method == 'email':
-            try:
-                email_sent = email_service.send_document_email(
-                    user_email=doc_request.requester.email,
-                    user_name=doc_request.requester.get_full_name(),
-                    document_request=doc_request,
-                    document_path=filepath
-                )
-                if email_sent:
-                    print(f"Document email sent successfully to {doc_request.requester.email}")
-                else:
-                    print(f"Failed to send document email to {doc_request.requester.email}")
-            except Exception as email_error:
-                print(f"Error sending document email: {str(email_error)}")
-                # Don't fail the entire request if email fails
+        doc_request.processing_notes = data.get('processing_notes', '')
+        job = issue_document(doc_request, int(get_jwt_identity()))
         
         # Log activity
-        activity_details = f"Approved and completed document request: {doc_request.document_type.name}"
-        if doc_request.delivery_method == 'email':
-            activity_details += f" (Email {'sent' if email_sent else 'failed'})"
-        
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity = ActivityLog(
             barangay_id=user.barangay_id,
             user_id=int(get_jwt_identity()),
             action='approve_document_request',
             entity_type='document_request',
             entity_id=doc_request.id,
-            description=activity_details
+            description=f"Approved document request: {doc_request.document_type.name}"
         )
         db.session.add(activity)
         db.session.commit()
         
-        response_message = 'Document request approved and completed successfully'
-        if doc_request.delivery_method == 'email':
-            response_message += f" and {'email sent' if email_sent else 'email delivery failed'}"
+        if job is None:
+            return jsonify({
+                'success': True,
+                'message': 'Document request approved; the document is ready',
+                'data': doc_request.to_dict(),
+                'job': None
+            }), 200
         
+        job_queue.wake()
         return jsonify({
             'success': True,
-            'message': response_message,
+            'message': 'Document request approved; the document is being emailed',
             'data': doc_request.to_dict(),
-            'email_sent': email_sent if doc_request.delivery_method == 'email' else None
+            'job': job.to_dict()
+        }), 202
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@documents_bp.route('/requests/bulk-approve', methods=['POST'])
+@jwt_required()
+def bulk_approve_document_requests():
+    """Approve many document requests in one transaction (admin only)"""
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'success': False, 'message': 'Admin access required'}), 403
+        
+        data = request.get_json() or {}
+        request_ids = data.get('request_ids')
+        if not isinstance(request_ids, list) or not request_ids:
+            return jsonify({'success': False, 'message': 'request_ids must be a non-empty list'}), 400
+        try:
+            request_ids = list(dict.fromkeys(int(request_id) for request_id in request_ids))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'message': 'request_ids must be integers'}), 400
+        if len(request_ids) > BULK_APPROVE_LIMIT:
+            return jsonify({'success': False, 'message': f'At most {BULK_APPROVE_LIMIT} requests can be approved at once'}), 400
+        
+        processed_by = int(get_jwt_identity())
+        user = get_current_user()
+        
+        # Validate every id with one query for the requests and one for jobs still delivering them
+        doc_requests = {
+            doc_request.id: doc_request
+            for doc_request in DocumentRequest.query.options(
+                joinedload(DocumentRequest.document_type),
+                joinedload(DocumentRequest.requester),
+                joinedload(DocumentRequest.barangay)
+            ).filter(DocumentRequest.id.in_(request_ids)).all()
+        }
+        active_jobs = job_queue.get_active_many([render_job_key(request_id) for request_id in request_ids])
+        
+        results = {}
+        approved = []
+        for request_id in request_ids:
+            doc_request = doc_requests.get(request_id)
+            active_job = active_jobs.get(render_job_key(request_id))
+            if doc_request is None:
+                results[request_id] = {'id': request_id, 'success': False, 'message': 'Document request not found'}
+            elif active_job:
+                results[request_id] = {'id': request_id, 'success': False, 'message': 'Document is already being emailed', 'job_id': active_job.id}
+            else:
+                doc_request.processing_notes = data.get('processing_notes', '')
+                stamp_document(doc_request, processed_by)
+                approved.append(doc_request)
+        
+        # Stamping is all approval does; PDFs are rendered when first downloaded or emailed
+        delivery_jobs = {}
+        for doc_request in approved:
+            if doc_request.delivery_method == 'email':
+                delivery_jobs[doc_request.id] = job_queue.enqueue('render_document', {'request_id': doc_request.id}, idempotency_key=render_job_key(doc_request.id))
+            
+            db.session.add(ActivityLog(
+                barangay_id=user.barangay_id,
+                user_id=processed_by,
+                action='approve_document_request',
+                entity_type='document_request',
+                entity_id=doc_request.id,
+                description=f"Approved document request: {doc_request.document_type.name} (bulk)"
+            ))
+        
+        db.session.commit()
+        if delivery_jobs:
+            job_queue.wake()
+        
+        for doc_request in approved:
+            job = delivery_jobs.get(doc_request.id)
+            results[doc_request.id] = {
+                'id': doc_request.id,
+                'success': True,
+                'status': doc_request.status,
+                'document_url': doc_request.document_url,
+                'job_id': job.id if job else None
+            }
+        
+        return jsonify({
+            'success': True,
+            'message': f'{len(approved)} of {len(request_ids)} document requests approved',
+            'approved': len(approved),
+            'failed': len(request_ids) - len(approved),
+            'data': [results[request_id] for request_id in request_ids]
         }), 200
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@documents_bp.route('/print-batch', methods=['GET'])
+@jwt_required()
+def print_batch():
+    """Stream ready pickup documents as one merged PDF with a page index (admin only)"""
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'success': False, 'message': 'Admin access required'}), 403
+        
+        status = request.args.get('status', 'ready')
+        if status not in ('ready', 'completed'):
+            return jsonify({'success': False, 'message': "status must be 'ready' or 'completed'"}), 400
+        
+        # Since DocumentRequest.barangay_id references barangays.id but User.barangay_id references locations.id,
+        # we need to use the first barangay record (there's only one), as create_document_request does
+        barangay = Barangay.query.first()
+        if not barangay:
+            return jsonify({'success': False, 'message': 'No barangay found'}), 404
+        
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        query = db.session.query(DocumentRequest.id).filter(
+            DocumentRequest.barangay_id == barangay.id,
+            DocumentRequest.delivery_method == 'pickup',
+            DocumentRequest.status == status,
+            DocumentRequest.verification_code != None,
+            DocumentRequest.is_expired == False,
+            db.or_(DocumentRequest.expires_at == None, DocumentRequest.expires_at > now)
+        )
+        
+        document_type_id = request.args.get('document_type_id', type=int)
+        if document_type_id:
+            query = query.filter(DocumentRequest.document_type_id == document_type_id)
+        
+        batch_date = request.args.get('date')
+        if batch_date:
+            try:
+                day = datetime.strptime(batch_date, '%Y-%m-%d')
+            except ValueError:
+                return jsonify({'success': False, 'message': 'date must be YYYY-MM-DD'}), 400
+            query = query.filter(DocumentRequest.processed_at >= day, DocumentRequest.processed_at < day + timedelta(days=1))
+        
+        request_ids = [request_id for (request_id,) in query.order_by(
+            DocumentRequest.document_type_id, DocumentRequest.processed_at, DocumentRequest.id
+        ).limit(PRINT_BATCH_LIMIT + 1)]
+        if not request_ids:
+            return jsonify({'success': False, 'message': 'No documents match this print batch'}), 404
+        if len(request_ids) > PRINT_BATCH_LIMIT:
+            return jsonify({'success': False, 'message': f'More than {PRINT_BATCH_LIMIT} documents match; narrow the batch by date or document type'}), 400
+        
+        title = f"Print batch {batch_date or now.strftime('%Y-%m-%d')}"
+        
+        def generate():
+            writer = StreamingPdfWriter()
+            yield writer.header()
+            
+            # Documents are loaded a chunk at a time and each PDF is streamed out before the next is read
+            entries = []
+            for start in range(0, len(request_ids), PRINT_BATCH_CHUNK):
+                chunk_ids = request_ids[start:start + PRINT_BATCH_CHUNK]
+                doc_requests = {
+                    doc_request.id: doc_request
+                    for doc_request in DocumentRequest.query.options(
+                        joinedload(DocumentRequest.document_type),
+                        joinedload(DocumentRequest.requester),
+                        joinedload(DocumentRequest.barangay)
+                    ).filter(DocumentRequest.id.in_(chunk_ids)).all()
+                }
+                for request_id in chunk_ids:
+                    doc_request = doc_requests.get(request_id)
+                    if doc_request is None:
+                        continue
+                    key, path = document_artifacts.fetch(doc_request)
+                    pages = yield from writer.add_pdf(path)
+                    entries.append({
+                        'id': doc_request.id,
+                        'document_type_name': doc_request.document_type.name,
+                        'requester_name': doc_request.requester.get_full_name(),
+                        'pages': pages
+                    })
+                db.session.expunge_all()
+            
+            # The index goes first, so document page numbers start after it
+            page_number = print_index_page_count(entries) + 1
+            for entry in entries:
+                entry['first_page'] = page_number
+                page_number += len(entry['pages'])
+            index_pages = yield from writer.add_pdf(io.BytesIO(render_print_index(entries, title)))
+            
+            bookmarks = [('Index', index_pages[0])] + [
+                (f"#{str(entry['id']).zfill(6)} {entry['document_type_name']} - {entry['requester_name']}", entry['pages'][0])
+                for entry in entries
+            ]
+            page_order = index_pages + [page for entry in entries for page in entry['pages']]
+            yield from writer.finish(page_order=page_order, bookmarks=bookmarks)
+        
+        response = current_app.response_class(stream_with_context(generate()), mimetype='application/pdf')
+        response.headers['Content-Disposition'] = f'inline; filename="print-batch-{batch_date or now.strftime("%Y-%m-%d")}.pdf"'
+        return response
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @documents_bp.route('/requests/<int:request_id>/reject', methods=['POST'])
 @jwt_required()
 def reject_document_request(request_id):
@@ -1198,7 +1284,7 @@ def reject_document_request(request_id):
         db.session.commit()
         
         # Log activity
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity = ActivityLog(
             barangay_id=user.barangay_id,
             user_id=int(get_jwt_identity()),
@@ -1223,7 +1309,7 @@ def reject_document_request(request_id):
 @documents_bp.route('/requests/<int:request_id>/complete', methods=['POST'])
 @jwt_required()
 def complete_document_request(request_id):
-    """Complete document request and generate QR code (admin only)"""
+    """Complete document request; its PDF is rendered on first download (admin only)"""
     try:
         claims = get_jwt()
         if claims.get('role') != 'admin':
@@ -1231,102 +1317,48 @@ def complete_document_request(request_id):
         
         doc_request = DocumentRequest.query.get_or_404(request_id)
         
+        job = job_queue.get_active(render_job_key(doc_request.id))
+        if job:
+            return jsonify({
+                'success': True,
+                'message': 'Document is already being emailed',
+                'data': doc_request.to_dict(),
+                'job': job.to_dict()
+            }), 202
+        
         if doc_request.status != 'approved':
             return jsonify({'success': False, 'message': 'Request must be approved first'}), 400
         
-        # Generate verification code
-        verification_code = str(uuid.uuid4())
-        
-        # Generate QR code data
-        qr_data = {
-            'request_id': doc_request.id,
-            'document_type': doc_request.document_type.name,
-            'requester': doc_request.requester.get_full_name(),
-            'barangay': doc_request.barangay.name,
-            'issued_date': datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-            'verification_code': verification_code
-        }
-        
-        # Generate QR code with URL that directs to verification page
-        # Use the frontend URL with the verification code as a parameter
-        frontend_url = current_app.config.get('FRONTEND_URL', 'http://localhost:3000')
-        verification_url = f"{frontend_url}/verify-document/{verification_code}"
-        qr_code = generate_qr_code(verification_url)
-        
-        # Update request with QR code and mark as ready
-        doc_request.status = 'ready'
-        doc_request.qr_code = qr_code
-        doc_request.qr_code_data = json.dumps(qr_data)
-        doc_request.processed_by = int(get_jwt_identity())
-        doc_request.processed_at = datetime.now(timezone.utc).replace(tzinfo=None)
-        
-        # Set expiration date based on document type validity period
-        if doc_request.document_type.validity_days:
-            from datetime import timedelta
-            doc_request.expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=doc_request.document_type.validity_days)
-        
-        # Generate PDF document
-        pdf_buffer = generate_document_pdf(doc_request)
-        
-        # Save PDF to uploads directory
-        uploads_dir = os.path.join(current_app.root_path, 'uploads', 'documents')
-        os.makedirs(uploads_dir, exist_ok=True)
-        
-        filename = f"document_{doc_request.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = os.path.join(uploads_dir, filename)
-        
-        with open(filepath, 'wb') as f:
-            f.write(pdf_buffer.getvalue())
-        
-        doc_request.document_url = f"/uploads/documents/{filename}"
-        
-        db.session.commit()
-        
-        # Send email if delivery method is email
-        email_sent = False
-        if doc_request.delivery_method == 'email':
-            try:
-                email_sent = email_service.send_document_email(
-                    user_email=doc_request.requester.email,
-                    user_name=doc_request.requester.get_full_name(),
-                    document_request=doc_request,
-                    document_path=filepath
-                )
-                if email_sent:
-                    print(f"Document email sent successfully to {doc_request.requester.email}")
-                else:
-                    print(f"Failed to send document email to {doc_request.requester.email}")
-            except Exception as email_error:
-                print(f"Error sending document email: {str(email_error)}")
-                # Don't fail the entire request if email fails
+        job = issue_document(doc_request, int(get_jwt_identity()))
         
         # Log activity
-        activity_details = f"Completed document request: {doc_request.document_type.name}"
-        if doc_request.delivery_method == 'email':
-            activity_details += f" (Email {'sent' if email_sent else 'failed'})"
-        
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity = ActivityLog(
             barangay_id=user.barangay_id,
             user_id=int(get_jwt_identity()),
             action='complete_document_request',
             entity_type='document_request',
             entity_id=doc_request.id,
-            description=activity_details
+            description=f"Completed document request: {doc_request.document_type.name}"
         )
         db.session.add(activity)
         db.session.commit()
         
-        response_message = 'Document request completed successfully'
-        if doc_request.delivery_method == 'email':
-            response_message += f" and {'email sent' if email_sent else 'email delivery failed'}"
+        if job is None:
+            return jsonify({
+                'success': True,
+                'message': 'Document request completed; the document is ready',
+                'data': doc_request.to_dict(),
+                'job': None
+            }), 200
         
+        job_queue.wake()
         return jsonify({
             'success': True,
-            'message': response_message,
+            'message': 'Document request completed; the document is being emailed',
             'data': doc_request.to_dict(),
-            'email_sent': email_sent if doc_request.delivery_method == 'email' else None
-        }), 200
+            'job': job.to_dict()
+        }), 202
         
     except Exception as e:
         db.session.rollback()
@@ -1336,22 +1368,37 @@ def complete_document_request(request_id):
 def verify_document(verification_code):
     """Verify document using QR code data"""
     try:
-        # Find document request by verification code
-        doc_requests = DocumentRequest.query.filter(
-            DocumentRequest.qr_code_data.contains(verification_code)
-        ).all()
+        not_found = {
+            'success': False,
+            'message': 'Document not found or invalid verification code'
+        }
         
-        if not doc_requests:
-            return jsonify({
-                'success': False,
-                'message': 'Document not found or invalid verification code'
-            }), 404
+        # Codes are UUIDs; anything else cannot match and never reaches the database
+        try:
+            verification_code = str(uuid.UUID(verification_code))
+        except ValueError:
+            return jsonify(not_found), 404
+        
+        cached = verification_cache.get(verification_code)
+        if cached:
+            return jsonify(cached[1]), cached[0]
+        if verification_cache.is_missing(verification_code):
+            return jsonify(not_found), 404
+        
+        # Find document request by verification code
+        doc_request = DocumentRequest.query.options(
+            joinedload(DocumentRequest.document_type),
+            joinedload(DocumentRequest.requester),
+            joinedload(DocumentRequest.barangay)
+        ).filter_by(verification_code=verification_code).first()
         
-        doc_request = doc_requests[0]
+        if not doc_request:
+            verification_cache.put_missing(verification_code)
+            return jsonify(not_found), 404
         
         # Check if document is expired
         if doc_request.is_document_expired():
-            return jsonify({
+            body = {
                 'success': False,
                 'message': 'Document has expired and is no longer valid',
                 'data': {
@@ -1360,12 +1407,14 @@ def verify_document(verification_code):
                     'expires_at': doc_request.expires_at.isoformat() if doc_request.expires_at else None,
                     'is_expired': True
                 }
-            }), 410  # Gone status code for expired resources
+            }
+            verification_cache.put(verification_code, doc_request.id, 410, body)
+            return jsonify(body), 410  # Gone status code for expired resources
         
         # Parse QR code data
         qr_data = json.loads(doc_request.qr_code_data)
         
-        return jsonify({
+        body = {
             'success': True,
             'message': 'Document verified successfully',
             'data': {
@@ -1379,11 +1428,99 @@ def verify_document(verification_code):
                 'status': doc_request.status,
                 'verification_code': verification_code
             }
+        }
+        
+        # A cached success must not outlive the document
+        valid_for = None
+        if doc_request.expires_at:
+            valid_for = (doc_request.expires_at - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
+        verification_cache.put(verification_code, doc_request.id, 200, body, valid_for=valid_for)
+        return jsonify(body), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@documents_bp.route('/verify-signed', methods=['GET'])
+def verify_signed_document():
+    """Verify a signed QR payload (token=<sig> or the scanned URL) without a database lookup"""
+    try:
+        token = request.args.get('token', '').strip()
+        
+        # Accept the whole scanned URL as well as the bare token
+        if '?' in token:
+            token = parse_qs(urlsplit(token).query).get('sig', [''])[0]
+        if not token:
+            return jsonify({'success': False, 'message': 'token is required'}), 400
+        if not document_signer.enabled:
+            return jsonify({'success': False, 'message': 'Signed document verification is not configured on this server'}), 503
+        
+        try:
+            claims = document_signer.verify(token, revocation_list.codes())
+        except InvalidDocumentToken as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        
+        data = {
+            'request_id': claims['request_id'],
+            'barangay_id': claims['barangay_id'],
+            'document_type': claims['document_type'],
+            'requester': claims['requester'],
+            'issued_date': claims['issued_date'].isoformat() if claims['issued_date'] else None,
+            'expires_at': claims['expires_at'].isoformat() if claims['expires_at'] else None,
+            'verification_code': claims['verification_code'],
+            'is_expired': claims['is_expired'],
+            'is_revoked': claims['is_revoked']
+        }
+        
+        if claims['is_revoked']:
+            return jsonify({'success': False, 'message': 'Document has been revoked and is no longer valid', 'data': data}), 410
+        if claims['is_expired']:
+            return jsonify({'success': False, 'message': 'Document has expired and is no longer valid', 'data': data}), 410
+        
+        return jsonify({
+            'success': True,
+            'message': 'Document signature verified successfully',
+            'data': data
         }), 200
         
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@documents_bp.route('/signing-keys', methods=['GET'])
+@cached_response(ttl=3600, tables=('barangays',))
+def get_signing_keys():
+    """Get the Ed25519 public keys that sign document QR payloads, by barangay id"""
+    try:
+        if not document_signer.enabled:
+            return jsonify({'success': False, 'message': 'Document signing is not configured on this server'}), 503
+        
+        barangay_ids = [barangay_id for (barangay_id,) in db.session.query(Barangay.id).filter(Barangay.is_active == True)]
+        return jsonify({
+            'success': True,
+            'data': {
+                'algorithm': 'Ed25519',
+                'keys': {str(barangay_id): document_signer.public_key(barangay_id) for barangay_id in barangay_ids}
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@documents_bp.route('/revocations', methods=['GET'])
+@cached_response(ttl=60, tables=('document_revocations',))
+def get_revocations():
+    """Get the revocation list for offline verifiers: unexpired revoked codes as base64url 16-byte UUIDs, concatenated"""
+    try:
+        codes = revocation_list.codes()
+        return jsonify({
+            'success': True,
+            'data': {
+                'count': len(codes),
+                'revoked': revocation_list.compact(),
+                'generated_at': datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @documents_bp.route('/cleanup/expired', methods=['POST'])
 @jwt_required()
 def cleanup_expired_documents_endpoint():
@@ -1395,9 +1532,11 @@ def cleanup_expired_documents_endpoint():
         
         # Run cleanup
         result = cleanup_expired_documents()
+        if result.get('in_progress'):
+            return jsonify({'success': False, 'message': 'A cleanup of expired documents is already running'}), 409
         
         # Log activity
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity = ActivityLog(
             barangay_id=user.barangay_id,
             user_id=int(get_jwt_identity()),
@@ -1434,9 +1573,11 @@ def cleanup_expired_documents_by_type_endpoint(document_type_id):
         
         # Run cleanup
         result = cleanup_expired_documents_by_type(document_type_id)
+        if result.get('in_progress'):
+            return jsonify({'success': False, 'message': 'A cleanup of expired documents is already running'}), 409
         
         # Log activity
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         activity = ActivityLog(
             barangay_id=user.barangay_id,
             user_id=int(get_jwt_identity()),
@@ -1457,6 +1598,29 @@ def cleanup_expired_documents_by_type_endpoint(document_type_id):
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@documents_bp.route('/cleanup/status', methods=['GET'])
+@jwt_required()
+def cleanup_status():
+    """Expired document sweeper schedule, lease and metrics (admin only)"""
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'success': False, 'message': 'Admin access required'}), 403
+        
+        lease = db.session.get(Lease, SWEEP_LEASE_NAME)
+        return jsonify({
+            'success': True,
+            'data': {
+                'interval_seconds': document_sweeper.interval_seconds,
+                'batch_size': document_sweeper.batch_size,
+                'lease': lease.to_dict() if lease else None,
+                'metrics': document_sweeper.metrics()
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @documents_bp.route('/expired', methods=['GET'])
 @jwt_required()
 def get_expired_documents():
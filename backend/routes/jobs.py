@@ -0,0 +1,26 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+from models.job import Job
+
+jobs_bp = Blueprint('jobs', __name__)
+
+@jobs_bp.route('/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_job_status(job_id):
+    """Get the status of a background job (admin only)"""
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'success': False, 'message': 'Admin access required'}), 403
+        
+        job = Job.query.get(job_id)
+        if not job:
+            return jsonify({'success': False, 'message': 'Job not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'data': job.to_dict()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
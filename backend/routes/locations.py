@@ -1,17 +1,19 @@
 from flask import Blueprint, request, jsonify
-from database import db
-from models.location import Location
+from utils.location_tree import location_tree, CITY_MUN_LEVELS
+from utils.location_search import location_search
+from utils.response_cache import cached_response
 
 locations_bp = Blueprint('locations', __name__)
 
 @locations_bp.route('/provinces', methods=['GET'])
+@cached_response(ttl=3600, tables=('locations',))
 def get_provinces():
     """Get all provinces"""
     try:
-        provinces = Location.get_provinces()
+        provinces = location_tree.get_by_level('Prov')
         
         return jsonify({
-            'provinces': [province.to_dict() for province in provinces]
+            'provinces': provinces
         }), 200
         
     except Exception as e:
@@ -27,15 +29,15 @@ def get_municipalities():
             return jsonify({'error': 'province_id parameter is required'}), 400
         
         # Verify province exists
-        province = Location.query.get(province_id)
-        if not province or province.geographic_level != 'Prov':
+        province = location_tree.get(province_id)
+        if not province or province['geographic_level'] != 'Prov':
             return jsonify({'error': 'Invalid province'}), 400
         
-        municipalities = Location.get_municipalities_by_province(province_id)
+        municipalities = location_tree.get_children(province_id, levels=CITY_MUN_LEVELS)
         
         return jsonify({
-            'province': province.to_dict(),
-            'municipalities': [municipality.to_dict() for municipality in municipalities]
+            'province': province,
+            'municipalities': municipalities
         }), 200
         
     except Exception as e:
@@ -51,15 +53,15 @@ def get_barangays():
             return jsonify({'error': 'municipality_id parameter is required'}), 400
         
         # Verify municipality exists
-        municipality = Location.query.get(municipality_id)
-        if not municipality or municipality.geographic_level not in ['City', 'Mun']:
+        municipality = location_tree.get(municipality_id)
+        if not municipality or municipality['geographic_level'] not in CITY_MUN_LEVELS:
             return jsonify({'error': 'Invalid municipality/city'}), 400
         
-        barangays = Location.get_barangays_by_municipality(municipality_id)
+        barangays = location_tree.get_children(municipality_id, levels=('Bgy',))
         
         return jsonify({
-            'municipality': municipality.to_dict(),
-            'barangays': [barangay.to_dict() for barangay in barangays]
+            'municipality': municipality,
+            'barangays': barangays
         }), 200
         
     except Exception as e:
@@ -71,29 +73,21 @@ def search_locations():
     try:
         query = request.args.get('q', '').strip()
         level = request.args.get('level', '').strip()  # Optional: Reg, Prov, City, Mun, Bgy
+        parent_id = request.args.get('parent_id', type=int)  # Optional: only search inside this location
         
         if not query:
             return jsonify({'error': 'Search query is required'}), 400
         
-        # Build search query
-        search_query = Location.query.filter(
-            Location.name.ilike(f'%{query}%')
-        )
-        
-        # Filter by level if specified
-        if level:
-            search_query = search_query.filter(Location.geographic_level == level)
-        
         # Limit results
-        limit = request.args.get('limit', 50, type=int)
-        search_query = search_query.limit(limit)
+        limit = min(request.args.get('limit', 50, type=int), 200)
         
-        locations = search_query.all()
+        locations = location_search.search(query, level=level or None, parent_id=parent_id, limit=limit)
         
         return jsonify({
             'query': query,
             'level': level,
-            'locations': [location.to_dict() for location in locations]
+            'parent_id': parent_id,
+            'locations': locations
         }), 200
         
     except Exception as e:
@@ -103,21 +97,15 @@ def search_locations():
 def get_location_hierarchy(location_id):
     """Get full location hierarchy for a given location"""
     try:
-        location = Location.query.get(location_id)
+        location = location_tree.get(location_id)
         
         if not location:
             return jsonify({'error': 'Location not found'}), 404
         
-        hierarchy = []
-        current = location
-        
-        # Build hierarchy from bottom to top
-        while current:
-            hierarchy.insert(0, current.to_dict())
-            current = current.parent
+        hierarchy = location_tree.get_ancestry(location_id)
         
         return jsonify({
-            'location': location.to_dict(),
+            'location': location,
             'hierarchy': hierarchy
         }), 200
         
@@ -125,17 +113,11 @@ def get_location_hierarchy(location_id):
         return jsonify({'error': str(e)}), 500
 
 @locations_bp.route('/stats', methods=['GET'])
+@cached_response(ttl=3600, tables=('locations',))
 def get_location_stats():
     """Get location statistics"""
     try:
-        stats = {
-            'total_locations': Location.query.count(),
-            'regions': Location.query.filter_by(geographic_level='Reg').count(),
-            'provinces': Location.query.filter_by(geographic_level='Prov').count(),
-            'cities': Location.query.filter_by(geographic_level='City').count(),
-            'municipalities': Location.query.filter_by(geographic_level='Mun').count(),
-            'barangays': Location.query.filter_by(geographic_level='Bgy').count()
-        }
+        stats = location_tree.get_stats()
         
         return jsonify(stats), 200
         
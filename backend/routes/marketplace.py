@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from database import db
 from models.user import User
 from models.item import Item
@@ -16,8 +16,7 @@ def admin_required(f):
     from functools import wraps
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         return f(*args, **kwargs)
@@ -84,7 +83,7 @@ def create_item():
     """Create a new item for sharing"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -156,7 +155,7 @@ def update_item(item_id):
     """Update item details (owner only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -219,7 +218,7 @@ def delete_item(item_id):
     """Delete item (owner only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -266,7 +265,7 @@ def get_my_items():
     """Get current user's items"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -286,7 +285,7 @@ def request_item(item_id):
     """Request to borrow an item"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -363,7 +362,7 @@ def get_my_requests():
     """Get current user's item requests"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -383,7 +382,7 @@ def approve_request(request_id):
     """Approve an item request (item owner only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -444,7 +443,7 @@ def reject_request(request_id):
     """Reject an item request (item owner only)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -498,8 +497,7 @@ def reject_request(request_id):
 def get_pending_items():
     """Get pending items for admin approval"""
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         barangay_id = user.barangay_id
         
@@ -542,7 +540,7 @@ def admin_approve_item(item_id):
     """Admin approve item"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         item = Item.query.get(item_id)
         
@@ -589,7 +587,7 @@ def admin_reject_item(item_id):
     """Admin reject item"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         item = Item.query.get(item_id)
         
@@ -639,7 +637,7 @@ def admin_reject_item(item_id):
 @jwt_required()
 def cancel_item_request(request_id):
     """Cancel an item request (requester only)"""
-    current_user_id = get_jwt_identity()
+    current_user = get_current_user()
     
     try:
         request = ItemRequest.query.filter_by(id=request_id, barangay_id=current_user.barangay_id).first()
@@ -647,7 +645,7 @@ def cancel_item_request(request_id):
             return {'message': 'Request not found'}, 404
         
         # Check if current user is the requester
-        if request.requester_id != current_user_id:
+        if request.requester_id != current_user.id:
             return {'message': 'Only the requester can cancel requests'}, 403
         
         if request.status not in ['pending']:
@@ -670,7 +668,7 @@ def upload_item_images(item_id):
     """Upload images for an item"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -739,7 +737,7 @@ def delete_item_images_endpoint(item_id):
     """Delete all images for an item"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
@@ -784,7 +782,7 @@ def delete_single_item_image(item_id, image_index):
     """Delete a specific image from an item"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user or user.role != 'resident':
             return jsonify({'error': 'Resident access required'}), 403
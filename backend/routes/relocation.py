@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, get_current_user
 from models.relocation_request import RelocationRequest
 from models.user import User
 from models.barangay import Barangay
@@ -27,7 +27,7 @@ def create_relocation_request():
                 return jsonify({'success': False, 'message': f'{field} is required'}), 400
         
         # Get user and barangay info
-        user = User.query.get(claims.get('user_id'))
+        user = get_current_user()
         if not user:
             return jsonify({'success': False, 'message': 'User not found'}), 404
         
@@ -84,7 +84,7 @@ def get_relocation_requests():
         # Get requests based on user role
         if claims.get('role') == 'admin':
             # Admin sees all requests in their barangay
-            user = User.query.get(int(user_id))
+            user = get_current_user()
             if not user:
                 return jsonify({'success': False, 'message': 'User not found'}), 404
             requests = RelocationRequest.query.filter(
@@ -138,7 +138,7 @@ def approve_relocation_request(request_id):
         data = request.get_json()
         
         # Get admin user and barangay
-        admin_user = User.query.get(int(get_jwt_identity()))
+        admin_user = get_current_user()
         if not admin_user:
             return jsonify({'success': False, 'message': 'Admin user not found'}), 404
         
@@ -201,7 +201,7 @@ def reject_relocation_request(request_id):
             return jsonify({'success': False, 'message': 'Rejection reason is required'}), 400
         
         # Get admin user and barangay
-        admin_user = User.query.get(int(get_jwt_identity()))
+        admin_user = get_current_user()
         if not admin_user:
             return jsonify({'success': False, 'message': 'Admin user not found'}), 404
         
@@ -259,7 +259,7 @@ def complete_relocation_request(request_id):
             return jsonify({'success': False, 'message': 'Request must be approved by both barangays first'}), 400
         
         # Get admin user and barangay
-        admin_user = User.query.get(int(get_jwt_identity()))
+        admin_user = get_current_user()
         if not admin_user:
             return jsonify({'success': False, 'message': 'Admin user not found'}), 404
         
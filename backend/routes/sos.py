@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, get_current_user
 from models.sos_request import SOSRequest
 from models.user import User
 from models.activity_log import ActivityLog
@@ -26,7 +26,7 @@ def create_sos_request():
                 return jsonify({'success': False, 'message': f'{field} is required'}), 400
         
         # Get user and barangay info
-        user = User.query.get(int(get_jwt_identity()))
+        user = get_current_user()
         if not user:
             return jsonify({'success': False, 'message': 'User not found'}), 404
         
@@ -79,7 +79,7 @@ def get_sos_requests():
         # Get requests based on user role
         if claims.get('role') == 'admin':
             # Admin sees all requests in their barangay
-            user = User.query.get(int(user_id))
+            user = get_current_user()
             if not user:
                 return jsonify({'success': False, 'message': 'User not found'}), 404
             requests = SOSRequest.query.filter_by(barangay_id=user.barangay_id).order_by(SOSRequest.created_at.desc()).all()
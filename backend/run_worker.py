@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Run background jobs (document rendering, email delivery) and scheduled maintenance tasks in a separate process
+Use this when the web process is started with JOB_WORKERS=0
+"""
+
+import os
+import sys
+import time
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+from utils.job_queue import job_queue
+from utils.scheduler import scheduler
+
+if __name__ == "__main__":
+    workers = int(os.getenv('JOB_WORKERS', '2')) or 1
+    print(f"🧵 Starting {workers} job worker(s)...")
+    job_queue.start(app, workers=workers)
+    scheduler.start(app)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        print("Stopping workers after their current jobs...")
+        job_queue.stop()
+        scheduler.stop()
@@ -0,0 +1,98 @@
+"""
+Current user loading for JWT-authenticated requests
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from database import db
+
+class CurrentUserCache:
+    """Loads the user behind a request's JWT, usually without a query.
+
+    Registered as flask-jwt-extended's user_lookup_loader in app.py, so it
+    runs once per authenticated request and the result is kept on `g` for
+    get_current_user(). Between requests the user's column values are kept
+    for CURRENT_USER_CACHE_TTL seconds and merged into the request's session
+    without a SELECT. Any committed write to a user row evicts it here at
+    once (see the session hooks below); a change committed by another process
+    shows up within the TTL.
+    """
+
+    def __init__(self):
+        self.ttl = int(os.getenv('CURRENT_USER_CACHE_TTL', '30'))
+        self.max_entries = int(os.getenv('CURRENT_USER_CACHE_SIZE', '10000'))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user id -> (expires, column values)
+
+    def _get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def _put(self, user):
+        if self.ttl <= 0:
+            return
+        values = {column.key: getattr(user, column.key) for column in db.inspect(type(user)).column_attrs}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def load(self, user_id):
+        """The User with this id, attached to the current session; None if it does not exist"""
+        from models.user import User
+
+        values = self._get(user_id)
+        if values is not None:
+            user = User(**values)
+            make_transient_to_detached(user)
+            # load=False attaches the cached state as-is instead of selecting the row again
+            return db.session.merge(user, load=False)
+
+        user = db.session.get(User, user_id)
+        if user is not None:
+            self._put(user)
+        return user
+
+    def evict(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Global current user cache instance
+current_users = CurrentUserCache()
+
+@event.listens_for(Session, 'after_flush')
+def _collect_written_users(session, flush_context):
+    user_ids = session.info.setdefault('current_user_ids', set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if getattr(instance, '__tablename__', None) == 'users':
+            # Read loaded state only; a deleted row cannot be refreshed
+            user_id = vars(instance).get('id')
+            if user_id is not None:
+                user_ids.add(user_id)
+
+@event.listens_for(Session, 'after_commit')
+def _evict_written_users(session):
+    user_ids = session.info.pop('current_user_ids', None)
+    if user_ids:
+        current_users.evict(user_ids)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_written_users(session):
+    session.info.pop('current_user_ids', None)
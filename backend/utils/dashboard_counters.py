@@ -0,0 +1,204 @@
+"""
+Per-barangay counters behind the admin dashboard
+"""
+
+import os
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from database import db
+from utils.scheduler import scheduler
+
+# Counter column -> (source table, column values a row needs to be counted)
+COUNTERS = {
+    'total_residents': ('users', {'role': 'resident'}),
+    'pending_residents': ('users', {'role': 'resident', 'status': 'pending'}),
+    'approved_residents': ('users', {'role': 'resident', 'status': 'approved'}),
+    'pending_documents': ('document_requests', {'status': 'pending'}),
+    'active_sos': ('sos_requests', {'status': 'active'})
+}
+
+# Counters are keyed by the admin's barangay_id (a locations.id), which users and
+# sos_requests store. document_requests.barangay_id is a barangays.id instead, so
+# those rows are counted under their requester's barangay_id: table -> users.id column
+KEYED_THROUGH_USER = {'document_requests': 'requester_id'}
+
+# Columns of each source table that decide which counters a row is in
+TRACKED_COLUMNS = {}
+for _table_name, _conditions in COUNTERS.values():
+    TRACKED_COLUMNS.setdefault(_table_name, {KEYED_THROUGH_USER.get(_table_name, 'barangay_id')}).update(_conditions)
+
+RECONCILE_INTERVAL_SECONDS = int(os.getenv('DASHBOARD_RECONCILE_SECONDS', '86400'))
+
+def _table(name):
+    return db.metadata.tables[name]
+
+def _matching(table_name, values):
+    """Counters a row with these column values is counted in"""
+    return [
+        counter for counter, (source, conditions) in COUNTERS.items()
+        if source == table_name and all(values.get(column) == value for column, value in conditions.items())
+    ]
+
+def count(connection, barangay_id=None):
+    """{barangay_id: {counter: value}} counted from the source tables, for one barangay or all of them"""
+    counts = {}
+    for table_name in TRACKED_COLUMNS:
+        table = _table(table_name)
+        counters = [counter for counter, (source, _) in COUNTERS.items() if source == table_name]
+        sums = [
+            db.func.sum(db.case((db.and_(*(table.c[column] == value for column, value in COUNTERS[counter][1].items())), 1), else_=0))
+            for counter in counters
+        ]
+        key, source = table.c.barangay_id, table
+        if table_name in KEYED_THROUGH_USER:
+            users = _table('users')
+            key, source = users.c.barangay_id, table.join(users, users.c.id == table.c[KEYED_THROUGH_USER[table_name]])
+        query = db.select(key, *sums).select_from(source).group_by(key)
+        if barangay_id is not None:
+            query = query.where(key == barangay_id)
+        for row in connection.execute(query):
+            if row[0] is None:
+                continue
+            values = counts.setdefault(row[0], dict.fromkeys(COUNTERS, 0))
+            values.update({counter: int(value or 0) for counter, value in zip(counters, row[1:])})
+    return counts
+
+def recount(connection, barangay_id):
+    """Overwrite one barangay's counters with a fresh count"""
+    counters = _table('dashboard_counters')
+    values = count(connection, barangay_id).get(barangay_id, dict.fromkeys(COUNTERS, 0))
+    values['updated_at'] = datetime.now(timezone.utc).replace(tzinfo=None)
+    updated = connection.execute(
+        counters.update().where(counters.c.barangay_id == barangay_id).values(**values)
+    ).rowcount
+    if not updated:
+        connection.execute(counters.insert().values(barangay_id=barangay_id, **values))
+
+def apply_deltas(connection, deltas):
+    """Add {barangay_id: {counter: delta}} to the stored counters with atomic increments"""
+    counters = _table('dashboard_counters')
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for barangay_id, changes in deltas.items():
+        changes = {counter: delta for counter, delta in changes.items() if delta}
+        if not changes:
+            continue
+        updated = connection.execute(
+            counters.update().where(counters.c.barangay_id == barangay_id).values(
+                updated_at=now,
+                **{counter: counters.c[counter] + delta for counter, delta in changes.items()}
+            )
+        ).rowcount
+        if not updated:
+            # First write for this barangay: start from a full count, which already includes this flush
+            recount(connection, barangay_id)
+
+def get_counters(barangay_id):
+    """Dashboard counters of a barangay, created from a full count the first time it is asked for"""
+    from models.dashboard_counter import DashboardCounter
+
+    if barangay_id is None:
+        # An admin without a barangay has nothing to count; there is no row to key on
+        return DashboardCounter(barangay_id=None, **dict.fromkeys(COUNTERS, 0))
+
+    counter = db.session.get(DashboardCounter, barangay_id)
+    if counter is None:
+        recount(db.session.connection(), barangay_id)
+        db.session.commit()
+        counter = db.session.get(DashboardCounter, barangay_id)
+    return counter
+
+def reconcile():
+    """Recount every barangay and repair the rows that drifted; returns how many were checked and fixed"""
+    counters = _table('dashboard_counters')
+    repaired = 0
+    with db.engine.begin() as connection:
+        actual = count(connection)
+        stored = {row.barangay_id: row for row in connection.execute(db.select(counters))}
+        for barangay_id in set(actual) | set(stored):
+            values = actual.get(barangay_id, dict.fromkeys(COUNTERS, 0))
+            row = stored.get(barangay_id)
+            if row is not None and all(getattr(row, counter) == value for counter, value in values.items()):
+                continue
+            recount(connection, barangay_id)
+            repaired += 1
+    if repaired:
+        print(f"🔧 Repaired dashboard counters for {repaired} barangay(s)")
+    return {'barangays': len(set(actual) | set(stored)), 'repaired': repaired}
+
+scheduler.register('reconcile_dashboard_counters', RECONCILE_INTERVAL_SECONDS, reconcile)
+
+def _row_states(instance, columns):
+    """(old values, new values, whether the old values are known) of a flushed, modified row"""
+    attrs = db.inspect(instance).attrs
+    old, new, known = {}, {}, True
+    for column in columns:
+        history = getattr(attrs, column).history
+        if history.added:
+            new[column] = history.added[0]
+            if history.deleted:
+                old[column] = history.deleted[0]
+            else:
+                # Set without being loaded first, so the previous value was never seen
+                known = False
+        else:
+            old[column] = new[column] = getattr(instance, column)
+    return old, new, known
+
+@event.listens_for(Session, 'after_flush')
+def _count_changes(session, flush_context):
+    """Move the counters of written users, documents and SOS requests, inside the same transaction"""
+    deltas = {}
+    stale = set()
+    user_barangays = {}
+
+    def key_of(table_name, values):
+        user_column = KEYED_THROUGH_USER.get(table_name)
+        if user_column is None:
+            return values.get('barangay_id')
+        user_id = values.get(user_column)
+        if user_id is not None and user_id not in user_barangays:
+            users = _table('users')
+            user_barangays[user_id] = session.connection().execute(
+                db.select(users.c.barangay_id).where(users.c.id == user_id)
+            ).scalar()
+        return user_barangays.get(user_id)
+
+    def move(table_name, values, step):
+        barangay_id = key_of(table_name, values)
+        if barangay_id is None:
+            return
+        for counter in _matching(table_name, values):
+            changes = deltas.setdefault(barangay_id, {})
+            changes[counter] = changes.get(counter, 0) + step
+
+    for instance in session.new:
+        table_name = getattr(instance, '__tablename__', None)
+        if table_name in TRACKED_COLUMNS:
+            move(table_name, {column: getattr(instance, column) for column in TRACKED_COLUMNS[table_name]}, 1)
+    for instance in session.deleted:
+        table_name = getattr(instance, '__tablename__', None)
+        if table_name in TRACKED_COLUMNS:
+            move(table_name, {column: vars(instance).get(column) for column in TRACKED_COLUMNS[table_name]}, -1)
+    for instance in session.dirty:
+        table_name = getattr(instance, '__tablename__', None)
+        if table_name not in TRACKED_COLUMNS:
+            continue
+        old, new, known = _row_states(instance, TRACKED_COLUMNS[table_name])
+        if old == new:
+            continue
+        if table_name == 'users' and old.get('barangay_id') != new.get('barangay_id'):
+            # The user's document requests are counted under their barangay and move with them
+            stale.update(barangay_id for barangay_id in (old.get('barangay_id'), new.get('barangay_id')) if barangay_id is not None)
+        if known:
+            move(table_name, old, -1)
+            move(table_name, new, 1)
+        else:
+            stale.update(barangay_id for barangay_id in (key_of(table_name, old), key_of(table_name, new)) if barangay_id is not None)
+
+    if not (deltas or stale):
+        return
+    connection = session.connection()
+    apply_deltas(connection, {barangay_id: changes for barangay_id, changes in deltas.items() if barangay_id not in stale})
+    for barangay_id in stale:
+        recount(connection, barangay_id)
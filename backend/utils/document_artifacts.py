@@ -0,0 +1,111 @@
+"""
+Render-on-demand cache of issued document PDFs
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from flask import current_app
+from utils.document_pdf import document_pdf_context, document_render_pool
+
+# Bump when the PDF layout changes so cached artifacts are rendered again
+TEMPLATE_VERSION = 1
+
+class DocumentArtifactCache:
+    """PDFs rendered on first download and kept on disk under a hash of their inputs.
+
+    Approving a document only records its data; the PDF is rendered the
+    first time someone downloads it (or a delivery job needs it) and is
+    stored as uploads/documents/cache/<key>.pdf, where key is a SHA-256 of
+    the render inputs. The same inputs always map to the same file, so the
+    key doubles as a strong ETag. Every hit refreshes the file's mtime, and
+    when the directory grows past DOCUMENT_CACHE_MAX_MB the least recently
+    used files are deleted; they are rendered again if asked for.
+    """
+
+    def __init__(self):
+        self.max_bytes = int(os.getenv('DOCUMENT_CACHE_MAX_MB', '512')) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._rendering = {}
+
+    def directory(self):
+        path = os.path.join(current_app.root_path, 'uploads', 'documents', 'cache')
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def key(context):
+        """SHA-256 of the render inputs"""
+        canonical = json.dumps([TEMPLATE_VERSION, context], sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory(), f"{key}.pdf")
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._rendering.setdefault(key, threading.Lock())
+
+    def fetch(self, doc_request):
+        """(key, file path) of a document's PDF, rendering it if it is not cached"""
+        context = document_pdf_context(doc_request)
+        key = self.key(context)
+        path = self.path(key)
+
+        if os.path.exists(path):
+            os.utime(path)
+            return key, path
+
+        # Concurrent first downloads of the same document render it once
+        lock = self._key_lock(key)
+        with lock:
+            if not os.path.exists(path):
+                rendered = document_render_pool.render([context])[0]
+                partial = f"{path}.{uuid.uuid4().hex}.tmp"
+                with open(partial, 'wb') as f:
+                    f.write(rendered['pdf'])
+                os.replace(partial, path)
+                print(f"📄 Rendered document {doc_request.id} on demand ({len(rendered['pdf']):,} bytes)")
+                self.evict()
+        with self._lock:
+            self._rendering.pop(key, None)
+        return key, path
+
+    def discard(self, doc_request):
+        """Delete a document's cached PDF, e.g. once it has expired"""
+        try:
+            os.remove(self.path(self.key(document_pdf_context(doc_request))))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def evict(self):
+        """Delete least recently used PDFs until the cache fits in DOCUMENT_CACHE_MAX_MB"""
+        directory = self.directory()
+        entries = []
+        total = 0
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith('.pdf'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                evicted += 1
+            except FileNotFoundError:
+                pass
+        print(f"🧹 Evicted {evicted} cached document PDF(s)")
+        return evicted
+
+# Global document artifact cache instance
+document_artifacts = DocumentArtifactCache()
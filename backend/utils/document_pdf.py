@@ -0,0 +1,365 @@
+"""
+PDF rendering for issued documents
+"""
+
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import lru_cache
+from reportlab import rl_config
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_CENTER
+from reportlab.pdfgen import canvas
+from utils.qr_code import QRCodeFlowable
+
+PRINT_INDEX_ROWS_PER_PAGE = 40
+
+# Document colours
+PRIMARY_COLOR = colors.HexColor('#1e40af')  # Blue-800
+SECONDARY_COLOR = colors.HexColor('#64748b')  # Slate-500
+ACCENT_COLOR = colors.HexColor('#059669')  # Emerald-600
+LIGHT_GRAY = colors.HexColor('#f8fafc')  # Slate-50
+DARK_GRAY = colors.HexColor('#334155')  # Slate-700
+
+# Streams are written binary (zlib only); the pure-Python ASCII85 pass was the
+# single most expensive step of writing each PDF
+rl_config.useA85 = 0
+
+_STYLES = {}
+
+def _build_styles():
+    """Paragraph and table styles shared by every document"""
+    base = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle(
+            'ModernTitle', parent=base['Heading1'], fontSize=24, fontName='Helvetica-Bold',
+            textColor=PRIMARY_COLOR, spaceAfter=20, alignment=TA_CENTER, leading=28
+        ),
+        'subtitle': ParagraphStyle(
+            'ModernSubtitle', parent=base['Heading2'], fontSize=14, fontName='Helvetica',
+            textColor=SECONDARY_COLOR, spaceAfter=15, alignment=TA_CENTER, leading=18
+        ),
+        'section_header': ParagraphStyle(
+            'SectionHeader', parent=base['Heading2'], fontSize=14, fontName='Helvetica-Bold',
+            textColor=DARK_GRAY, spaceAfter=12, spaceBefore=20, leading=18
+        ),
+        'normal': ParagraphStyle(
+            'ModernNormal', parent=base['Normal'], fontSize=11, fontName='Helvetica',
+            textColor=DARK_GRAY, spaceAfter=8, leading=14
+        ),
+        'small': ParagraphStyle(
+            'ModernSmall', parent=base['Normal'], fontSize=9, fontName='Helvetica',
+            textColor=SECONDARY_COLOR, spaceAfter=4, leading=12
+        ),
+        'doc_type': ParagraphStyle(
+            'DocType', parent=base['Heading1'], fontSize=18, fontName='Helvetica-Bold',
+            textColor=colors.white, alignment=TA_CENTER
+        ),
+        'qr_header': ParagraphStyle(
+            'QRHeader', parent=base['Heading2'], fontSize=12, fontName='Helvetica-Bold',
+            textColor=colors.white, alignment=TA_CENTER
+        ),
+        'doc_type_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), PRIMARY_COLOR),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 18),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
+            ('TOPPADDING', (0, 0), (-1, -1), 15),
+            ('ROUNDEDCORNERS', (0, 0), (-1, -1), 8),
+        ]),
+        'details_table': TableStyle([
+            # Header row styling
+            ('BACKGROUND', (0, 0), (0, -1), LIGHT_GRAY),
+            ('TEXTCOLOR', (0, 0), (0, -1), DARK_GRAY),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (0, -1), 10),
+
+            # Data row styling
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (1, 0), (1, -1), 10),
+            ('TEXTCOLOR', (1, 0), (1, -1), DARK_GRAY),
+
+            # Alignment and spacing
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+
+            # Borders
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+            ('LINEBELOW', (0, 0), (-1, 0), 1, PRIMARY_COLOR),
+        ]),
+        'qr_header_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), ACCENT_COLOR),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('ROUNDEDCORNERS', (0, 0), (-1, -1), 4),
+        ]),
+        'qr_table': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ]),
+        'footer_line_table': TableStyle([
+            ('LINEABOVE', (0, 0), (-1, -1), 1, PRIMARY_COLOR),
+        ]),
+    }
+
+def get_styles():
+    """Shared document styles, built on first use in each process"""
+    if not _STYLES:
+        _STYLES.update(_build_styles())
+    return _STYLES
+
+class DocumentTemplate:
+    """The static layers of one document type's PDF.
+
+    The header, document type banner, section headings, QR section heading
+    and footer are the same for every request of a DocumentType in a
+    barangay, so they are built once and reused; render() only creates the
+    details table, the QR code and the generation date. ReportLab flowables
+    keep layout state while a PDF is built, so builds of the same template
+    take turns on a lock.
+    """
+
+    def __init__(self, document_type_name, barangay_name):
+        styles = get_styles()
+        self._lock = threading.Lock()
+
+        doc_type_box = Table([
+            [Paragraph(f"<b>{document_type_name.upper()}</b>", styles['doc_type'])]
+        ], colWidths=[6*inch])
+        doc_type_box.setStyle(styles['doc_type_table'])
+
+        self.header = [
+            Spacer(1, 20),
+            Paragraph(barangay_name.upper() if barangay_name else "BARANGAY OFFICE", styles['title']),
+            Paragraph("OFFICIAL DOCUMENT", styles['subtitle']),
+            Spacer(1, 30),
+            doc_type_box,
+            Spacer(1, 25),
+            Paragraph("DOCUMENT INFORMATION", styles['section_header']),
+        ]
+
+        qr_header = Table([
+            [Paragraph("DOCUMENT VERIFICATION", styles['qr_header'])]
+        ], colWidths=[6*inch])
+        qr_header.setStyle(styles['qr_header_table'])
+
+        self.qr_header = [
+            Spacer(1, 25),
+            qr_header,
+            Spacer(1, 15),
+            Paragraph(
+                "Scan the QR code below to verify the authenticity and validity of this document.",
+                styles['normal']
+            ),
+            Spacer(1, 15),
+        ]
+
+        footer_line = Table([['']], colWidths=[6*inch])
+        footer_line.setStyle(styles['footer_line_table'])
+
+        self.footer_top = [
+            Spacer(1, 40),
+            footer_line,
+            Spacer(1, 15),
+            Paragraph("Generated by <b>BarangayLink</b>", styles['small']),
+        ]
+        self.footer_bottom = [
+            Paragraph("This is an official document issued by the Barangay Office", styles['small'])
+        ]
+
+    def _details(self, context):
+        """Per-request document details table"""
+        data = [
+            ['Document ID:', f"#{str(context['id']).zfill(6)}"],
+            ['Date Issued:', context['processed_at'].strftime('%B %d, %Y') if context['processed_at'] else 'Pending'],
+            ['Valid Until:', context['expires_at'].strftime('%B %d, %Y') if context['expires_at'] else 'N/A'],
+            ['Requester Name:', context['requester_name']],
+            ['Purpose:', context['purpose'] or 'Not specified'],
+            ['Quantity:', str(context['quantity'])],
+            ['Status:', f"<b>{context['status'].title()}</b>"],
+        ]
+        table = Table(data, colWidths=[2.2*inch, 3.8*inch])
+        table.setStyle(get_styles()['details_table'])
+        return table
+
+    def _qr_code(self, context):
+        """Per-request QR code section, drawn as vector paths"""
+        styles = get_styles()
+        try:
+            qr_table = Table([[QRCodeFlowable(context['qr_payload'], 120)]], colWidths=[6*inch])
+            qr_table.setStyle(styles['qr_table'])
+            return self.qr_header + [qr_table]
+        except Exception as e:
+            # Fallback: show error message
+            return self.qr_header + [Paragraph(f"<i>QR Code generation failed: {str(e)}</i>", styles['small'])]
+
+    def render(self, context):
+        """Build the PDF for one document_pdf_context() dict into a BytesIO"""
+        story = list(self.header)
+        story.append(self._details(context))
+        if context['qr_payload']:
+            story.extend(self._qr_code(context))
+        story.extend(self.footer_top)
+        story.append(Paragraph(
+            f"Document generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}",
+            get_styles()['small']
+        ))
+        story.extend(self.footer_bottom)
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=letter,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=72
+        )
+        with self._lock:
+            doc.build(story)
+        buffer.seek(0)
+        return buffer
+
+@lru_cache(maxsize=128)
+def get_document_template(document_type_name, barangay_name):
+    """Cached DocumentTemplate for a document type in a barangay"""
+    return DocumentTemplate(document_type_name, barangay_name)
+
+def generate_document_pdf(context):
+    """Generate modern PDF document with professional styling from a document_pdf_context() dict"""
+    return get_document_template(context['document_type_name'], context['barangay_name']).render(context)
+
+
+def print_index_page_count(entries):
+    """Number of pages render_print_index() needs for this many entries"""
+    return max(1, -(-len(entries) // PRINT_INDEX_ROWS_PER_PAGE))
+
+def render_print_index(entries, title):
+    """Render the page index of a print batch.
+
+    entries are dicts with id, document_type_name, requester_name and
+    first_page (the page number in the merged file). Rows per page are
+    fixed, so the caller knows the index length before rendering it.
+    """
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    columns = ((72, 'Page'), (120, 'Document ID'), (200, 'Document Type'), (380, 'Requester'))
+    page_count = print_index_page_count(entries)
+
+    for page in range(page_count):
+        rows = entries[page * PRINT_INDEX_ROWS_PER_PAGE:(page + 1) * PRINT_INDEX_ROWS_PER_PAGE]
+        y = height - 72
+        pdf.setFillColor(PRIMARY_COLOR)
+        pdf.setFont('Helvetica-Bold', 16)
+        pdf.drawString(72, y, title)
+        pdf.setFillColor(SECONDARY_COLOR)
+        pdf.setFont('Helvetica', 9)
+        pdf.drawRightString(width - 72, y, f"{len(entries)} documents - index page {page + 1} of {page_count}")
+
+        y -= 28
+        pdf.setFillColor(DARK_GRAY)
+        pdf.setFont('Helvetica-Bold', 9)
+        for x, label in columns:
+            pdf.drawString(x, y, label)
+        pdf.setStrokeColor(PRIMARY_COLOR)
+        pdf.line(72, y - 4, width - 72, y - 4)
+
+        pdf.setFont('Helvetica', 9)
+        for entry in rows:
+            y -= 15
+            values = (
+                str(entry['first_page']),
+                f"#{str(entry['id']).zfill(6)}",
+                entry['document_type_name'][:34],
+                entry['requester_name'][:42]
+            )
+            for (x, _), value in zip(columns, values):
+                pdf.drawString(x, y, value)
+        pdf.showPage()
+
+    pdf.save()
+    return buffer.getvalue()
+
+def document_pdf_context(document_request):
+    """Snapshot everything the PDF needs from a DocumentRequest into a plain, picklable dict"""
+    return {
+        'id': document_request.id,
+        'barangay_name': document_request.barangay.name if document_request.barangay else None,
+        'document_type_name': document_request.document_type.name,
+        'processed_at': document_request.processed_at,
+        'expires_at': document_request.expires_at,
+        'requester_name': document_request.requester.get_full_name(),
+        'purpose': document_request.purpose,
+        'quantity': document_request.quantity,
+        'status': document_request.status,
+        'qr_payload': document_request.qr_code if document_request.qr_code_data else None
+    }
+
+def render_document(context):
+    """Render the PDF for one document.
+
+    Runs in a worker process, so it only touches its argument.
+    Returns {'id', 'pdf'} with the PDF as bytes.
+    """
+    return {
+        'id': context['id'],
+        'pdf': generate_document_pdf(context).getvalue()
+    }
+
+class DocumentRenderPool:
+    """Process pool for PDF rendering.
+
+    ReportLab is pure Python, so threads serialize on the GIL; separate
+    processes let renders use every core and keep the web threads
+    responsive. PDF_RENDER_PROCESSES sets the pool size (default: CPU
+    count); 0 renders in the calling thread. If the pool cannot be used
+    the documents are rendered in the calling thread instead.
+    """
+
+    def __init__(self):
+        self.processes = int(os.getenv('PDF_RENDER_PROCESSES', str(os.cpu_count() or 1)))
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            # forkserver/spawn children start clean instead of inheriting the web process's threads and locks
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context(method))
+        return self._executor
+
+    def render(self, contexts):
+        """Render many documents in parallel; results are in the same order as contexts"""
+        contexts = list(contexts)
+        if self.processes <= 0 or len(contexts) == 0:
+            return [render_document(context) for context in contexts]
+
+        try:
+            return list(self._get_executor().map(render_document, contexts))
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠️ PDF render pool unavailable ({str(e)}); rendering in-process")
+            self._executor = None
+            return [render_document(context) for context in contexts]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+# Global render pool instance
+document_render_pool = DocumentRenderPool()
@@ -0,0 +1,91 @@
+"""
+Revocation list for signed document QR payloads
+"""
+
+import os
+import threading
+import time
+import uuid
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from utils.document_signing import b64encode
+from utils.response_cache import response_cache
+
+# Statuses that withdraw an issued document
+REVOKING_STATUSES = ('rejected', 'cancelled')
+
+class RevocationList:
+    """Cached set of revoked verification codes.
+
+    Signed QR payloads verify without the database; the only thing they
+    cannot tell on their own is whether the barangay withdrew the document.
+    That is answered from this in-process set, reloaded after
+    REVOCATION_LIST_TTL seconds or as soon as this process commits a
+    revocation. Offline verifiers download the same list in compact form
+    from /api/documents/revocations.
+    """
+
+    def __init__(self):
+        self.ttl = int(os.getenv('REVOCATION_LIST_TTL', '60'))
+        self._lock = threading.Lock()
+        self._codes = frozenset()
+        self._loaded_at = None
+        self._version = None
+
+    def codes(self):
+        """Revoked verification codes of documents that have not expired yet"""
+        from models.document_revocation import DocumentRevocation
+
+        version = response_cache.table_version('document_revocations')
+        if self._loaded_at is None or self._version != version or time.monotonic() - self._loaded_at > self.ttl:
+            with self._lock:
+                self._codes = frozenset(DocumentRevocation.get_active_codes())
+                self._loaded_at = time.monotonic()
+                self._version = version
+        return self._codes
+
+    def compact(self):
+        """The list as base64url of the sorted 16-byte codes, concatenated"""
+        return b64encode(b''.join(sorted(uuid.UUID(code).bytes for code in self.codes())))
+
+# Global revocation list instance
+revocation_list = RevocationList()
+
+@event.listens_for(Session, 'before_flush')
+def _record_revocations(session, flush_context, instances):
+    """Revoke a document's verification code when it is reissued, withdrawn or deleted"""
+    from database import db
+    from models.document_request import DocumentRequest
+    from models.document_revocation import DocumentRevocation
+
+    revoked = {}
+    for instance in session.dirty:
+        if not isinstance(instance, DocumentRequest):
+            continue
+        attrs = db.inspect(instance).attrs
+        expires_at = attrs.expires_at.history.deleted[0] if attrs.expires_at.history.deleted else instance.expires_at
+
+        old_codes = [code for code in attrs.verification_code.history.deleted if code]
+        for code in old_codes:
+            revoked[code] = (instance.id, 'reissued', expires_at)
+        if instance.verification_code:
+            if attrs.status.history.added and instance.status in REVOKING_STATUSES:
+                revoked[instance.verification_code] = (instance.id, instance.status, instance.expires_at)
+            elif attrs.is_expired.history.added and instance.is_expired:
+                revoked[instance.verification_code] = (instance.id, 'expired', instance.expires_at)
+
+    for instance in session.deleted:
+        if isinstance(instance, DocumentRequest) and instance.verification_code:
+            revoked[instance.verification_code] = (instance.id, 'deleted', instance.expires_at)
+
+    if not revoked:
+        return
+    with session.no_autoflush:
+        existing = {
+            code for (code,) in session.query(DocumentRevocation.verification_code).filter(
+                DocumentRevocation.verification_code.in_(list(revoked))
+            )
+        }
+    for code, (request_id, reason, expires_at) in revoked.items():
+        if code not in existing:
+            session.add(DocumentRevocation(verification_code=code, request_id=request_id, reason=reason, expires_at=expires_at))
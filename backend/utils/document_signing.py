@@ -0,0 +1,239 @@
+"""
+Signed, offline-verifiable document payloads for QR codes
+"""
+
+import base64
+import os
+import struct
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+TOKEN_VERSION = 1
+
+class InvalidDocumentToken(Exception):
+    """A signed document token that is malformed, forged or signed with an unknown key"""
+
+# Minimal CBOR (RFC 8949) for the payload: unsigned/negative ints, byte and
+# text strings, arrays and null, always in the shortest encoding
+
+def _cbor_head(major, value):
+    if value < 24:
+        return bytes([major << 5 | value])
+    for info, fmt in ((24, '>B'), (25, '>H'), (26, '>I'), (27, '>Q')):
+        if value < 1 << (8 * struct.calcsize(fmt)):
+            return bytes([major << 5 | info]) + struct.pack(fmt, value)
+    raise ValueError('Integer too large for CBOR')
+
+def cbor_encode(value):
+    """Encode ints, bytes, str, lists/tuples and None as CBOR"""
+    if value is None:
+        return b'\xf6'
+    if isinstance(value, bool):
+        raise TypeError('Booleans are not used in document payloads')
+    if isinstance(value, int):
+        return _cbor_head(0, value) if value >= 0 else _cbor_head(1, -1 - value)
+    if isinstance(value, bytes):
+        return _cbor_head(2, len(value)) + value
+    if isinstance(value, str):
+        encoded = value.encode('utf-8')
+        return _cbor_head(3, len(encoded)) + encoded
+    if isinstance(value, (list, tuple)):
+        return _cbor_head(4, len(value)) + b''.join(cbor_encode(item) for item in value)
+    raise TypeError(f'Cannot CBOR-encode {type(value).__name__}')
+
+def _cbor_decode_at(data, offset, depth):
+    if depth > 4 or offset >= len(data):
+        raise ValueError('Malformed CBOR')
+    initial = data[offset]
+    major, info = initial >> 5, initial & 0x1f
+    offset += 1
+
+    if initial == 0xf6:
+        return None, offset
+    if info < 24:
+        value = info
+    elif info <= 27:
+        size = 1 << (info - 24)
+        if offset + size > len(data):
+            raise ValueError('Truncated CBOR')
+        value = int.from_bytes(data[offset:offset + size], 'big')
+        offset += size
+    else:
+        raise ValueError('Unsupported CBOR item')
+
+    if major == 0:
+        return value, offset
+    if major == 1:
+        return -1 - value, offset
+    if major in (2, 3):
+        if offset + value > len(data):
+            raise ValueError('Truncated CBOR')
+        chunk = data[offset:offset + value]
+        return (bytes(chunk) if major == 2 else chunk.decode('utf-8')), offset + value
+    if major == 4:
+        items = []
+        for _ in range(value):
+            item, offset = _cbor_decode_at(data, offset, depth + 1)
+            items.append(item)
+        return items, offset
+    raise ValueError('Unsupported CBOR item')
+
+def cbor_decode(data):
+    """Decode one CBOR item produced by cbor_encode(); trailing bytes are an error"""
+    value, offset = _cbor_decode_at(data, 0, 0)
+    if offset != len(data):
+        raise ValueError('Trailing bytes after CBOR item')
+    return value
+
+def b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+def b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+def _epoch(value):
+    return int(value.replace(tzinfo=timezone.utc).timestamp()) if value else None
+
+def _from_epoch(value):
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None) if value is not None else None
+
+def load_public_key(public_key):
+    """Ed25519 public key from the base64url form published by /api/documents/signing-keys"""
+    return Ed25519PublicKey.from_public_bytes(b64decode(public_key))
+
+def verify_token(token, public_keys, revoked=(), now=None):
+    """Check a signed document token offline.
+
+    public_keys maps barangay id to an Ed25519PublicKey (see
+    load_public_key); revoked is a set of revoked verification codes.
+    Raises InvalidDocumentToken for anything not signed by a known key.
+    Returns the claims with 'is_expired' and 'is_revoked' filled in.
+    """
+    try:
+        envelope = cbor_decode(b64decode(token))
+        payload, signature = envelope
+        fields = cbor_decode(payload)
+        version, barangay_id, request_id, code, document_type, holder, issued, expires = fields
+        if not (isinstance(payload, bytes) and isinstance(signature, bytes) and isinstance(code, bytes) and len(code) == 16):
+            raise ValueError('Malformed document token')
+        if not all(isinstance(value, int) for value in (version, barangay_id, request_id, issued)):
+            raise ValueError('Malformed document token')
+        if not (isinstance(document_type, str) and isinstance(holder, str) and (expires is None or isinstance(expires, int))):
+            raise ValueError('Malformed document token')
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidDocumentToken('Malformed document token')
+
+    if version != TOKEN_VERSION:
+        raise InvalidDocumentToken('Unsupported document token version')
+    public_key = public_keys.get(barangay_id)
+    if public_key is None:
+        raise InvalidDocumentToken('Document token signed with an unknown key')
+    try:
+        public_key.verify(signature, payload)
+    except InvalidSignature:
+        raise InvalidDocumentToken('Document token signature is invalid')
+
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    verification_code = str(uuid.UUID(bytes=code))
+    expires_at = _from_epoch(expires)
+    return {
+        'barangay_id': barangay_id,
+        'request_id': request_id,
+        'verification_code': verification_code,
+        'document_type': document_type,
+        'requester': holder,
+        'issued_date': _from_epoch(issued),
+        'expires_at': expires_at,
+        'is_expired': expires_at is not None and expires_at < now,
+        'is_revoked': verification_code in revoked
+    }
+
+class DocumentSigningDisabled(Exception):
+    """DOCUMENT_SIGNING_SECRET is missing or still a placeholder, so nothing is signed"""
+
+# Values copied from app.py / env.example that must never seed a signing key
+PLACEHOLDER_SECRETS = {
+    'dev-secret-key-change-in-production',
+    'your-secret-key-here',
+    'your-document-signing-secret-here'
+}
+
+class DocumentSigner:
+    """Signs document payloads with a per-barangay Ed25519 key.
+
+    Each barangay's key is derived with HKDF from DOCUMENT_SIGNING_SECRET,
+    so no private keys are stored and every process derives the same keys.
+    Changing the secret rotates every key and invalidates the signatures on
+    documents already issued. Without a real secret there is no fallback:
+    documents are issued with an unsigned QR code (verified against the
+    database) and no keys are published.
+    """
+
+    def _secret(self):
+        secret = os.getenv('DOCUMENT_SIGNING_SECRET', '').strip()
+        if not secret or secret in PLACEHOLDER_SECRETS:
+            return None
+        return secret.encode('utf-8')
+
+    @property
+    def enabled(self):
+        return self._secret() is not None
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _derive(secret, barangay_id):
+        seed = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=b'barangaylink-document-signing',
+            info=f'barangay:{barangay_id}'.encode('ascii')
+        ).derive(secret)
+        return Ed25519PrivateKey.from_private_bytes(seed)
+
+    def private_key(self, barangay_id):
+        secret = self._secret()
+        if secret is None:
+            raise DocumentSigningDisabled('DOCUMENT_SIGNING_SECRET is not set')
+        return self._derive(secret, barangay_id)
+
+    def public_key(self, barangay_id):
+        """Base64url raw Ed25519 public key of a barangay"""
+        return b64encode(self.private_key(barangay_id).public_key().public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        ))
+
+    def sign(self, doc_request):
+        """Signed token for a stamped document request, or None when signing is disabled"""
+        if not self.enabled:
+            return None
+        payload = cbor_encode([
+            TOKEN_VERSION,
+            doc_request.barangay_id,
+            doc_request.id,
+            uuid.UUID(doc_request.verification_code).bytes,
+            doc_request.document_type.name,
+            doc_request.requester.get_full_name(),
+            _epoch(doc_request.processed_at),
+            _epoch(doc_request.expires_at)
+        ])
+        signature = self.private_key(doc_request.barangay_id).sign(payload)
+        return b64encode(cbor_encode([payload, signature]))
+
+    def verify(self, token, revoked=()):
+        """verify_token() against this server's own keys (raises DocumentSigningDisabled without them)"""
+        try:
+            barangay_id = cbor_decode(cbor_decode(b64decode(token))[0])[1]
+        except (ValueError, TypeError, IndexError, UnicodeDecodeError):
+            raise InvalidDocumentToken('Malformed document token')
+        if not isinstance(barangay_id, int) or barangay_id <= 0:
+            raise InvalidDocumentToken('Document token signed with an unknown key')
+        public_key = self.private_key(barangay_id).public_key()
+        return verify_token(token, {barangay_id: public_key}, revoked)
+
+# Global document signer instance
+document_signer = DocumentSigner()
@@ -0,0 +1,230 @@
+"""
+Scheduled sweeper for expired documents
+"""
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from database import db
+from utils.scheduler import scheduler
+
+LEASE_NAME = 'sweep_expired_documents'
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _remove_file(path):
+    """Delete a file; returns (bytes reclaimed or None if it was not there, OSError or None)"""
+    try:
+        size = os.stat(path).st_size
+        os.remove(path)
+        return size, None
+    except FileNotFoundError:
+        return None, None
+    except OSError as e:
+        return None, e
+
+class ExpiredDocumentSweeper:
+    """Marks expired ready documents as expired and deletes their PDFs.
+
+    Runs every SWEEP_INTERVAL_SECONDS through utils/scheduler.py (0
+    disables the schedule) and on demand from the admin cleanup
+    endpoints. Only the process holding the 'sweep_expired_documents'
+    lease sweeps, and within it only one thread at a time (the lease is
+    per process), so a manual run never overlaps a scheduled one. Rows
+    are walked in keyset order over the (expires_at, status) index,
+    SWEEP_BATCH_SIZE at a time; each batch's files are deleted on a small
+    thread pool and the batch is committed before the next one is read.
+    Revocation rows for documents that have since expired are pruned
+    along the way.
+    """
+
+    def __init__(self):
+        self.interval_seconds = int(os.getenv('SWEEP_INTERVAL_SECONDS', '3600'))
+        self.batch_size = int(os.getenv('SWEEP_BATCH_SIZE', '200'))
+        self.file_workers = int(os.getenv('SWEEP_FILE_WORKERS', '4'))
+        self.lease_seconds = int(os.getenv('SWEEP_LEASE_SECONDS', '600'))
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self._sweep_lock = threading.Lock()  # The lease holder is per process; this keeps its threads apart
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'runs': 0,
+            'skipped_runs': 0,  # Another process held the lease
+            'rows_expired': 0,
+            'files_deleted': 0,
+            'bytes_reclaimed': 0,
+            'revocations_pruned': 0,
+            'failures': 0,
+            'last_run': None
+        }
+
+    def metrics(self):
+        """Counters for this process since it started"""
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    def _record(self, **counts):
+        with self._metrics_lock:
+            for name, value in counts.items():
+                self._metrics[name] += value
+
+    def _document_paths(self, doc):
+        """Files that may hold a document's PDF: the legacy pre-rendered file and the cached artifact"""
+        from utils.document_artifacts import document_artifacts
+        from utils.document_pdf import document_pdf_context
+
+        paths = []
+        if doc.document_url:
+            paths.append(os.path.join(current_app.root_path, 'uploads', doc.document_url.lstrip('/')))
+        paths.append(document_artifacts.path(document_artifacts.key(document_pdf_context(doc))))
+        return paths
+
+    def _batch_query(self, now, document_type_id, after):
+        from sqlalchemy.orm import joinedload
+        from models.document_request import DocumentRequest
+        from models.document_type import DocumentType
+
+        query = DocumentRequest.query.options(
+            joinedload(DocumentRequest.document_type),
+            joinedload(DocumentRequest.requester),
+            joinedload(DocumentRequest.barangay)
+        ).filter(
+            DocumentRequest.expires_at < now,
+            DocumentRequest.status == 'ready',
+            DocumentRequest.is_expired == False
+        )
+        if document_type_id is not None:
+            query = query.filter(DocumentRequest.document_type_id == document_type_id)
+        else:
+            # The schedule only removes types that opted in to auto-deletion
+            query = query.join(DocumentType, DocumentRequest.document_type_id == DocumentType.id).filter(
+                DocumentType.auto_delete_expired == True
+            )
+        if after is not None:
+            last_expires_at, last_id = after
+            query = query.filter(db.or_(
+                DocumentRequest.expires_at > last_expires_at,
+                db.and_(DocumentRequest.expires_at == last_expires_at, DocumentRequest.id > last_id)
+            ))
+        return query.order_by(DocumentRequest.expires_at, DocumentRequest.id).limit(self.batch_size)
+
+    def _prune_revocations(self, now):
+        """Delete revocation rows whose documents have expired; they no longer verify anyway"""
+        from models.document_revocation import DocumentRevocation
+
+        pruned = DocumentRevocation.query.filter(
+            DocumentRevocation.expires_at < now - timedelta(days=1)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return pruned
+
+    def sweep(self, document_type_id=None, collect_files=False):
+        """Expire every due document; returns a summary, or None if another process is sweeping.
+
+        With document_type_id only that type is swept, whether or not it
+        auto-deletes. collect_files adds the URLs of deleted files to the
+        summary (used by the manual cleanup endpoints).
+        """
+        if not self._sweep_lock.acquire(blocking=False):
+            self._record(skipped_runs=1)
+            return None
+        try:
+            return self._sweep(document_type_id, collect_files)
+        finally:
+            self._sweep_lock.release()
+
+    def _sweep(self, document_type_id, collect_files):
+        from models.lease import Lease
+
+        if not Lease.acquire(LEASE_NAME, self.holder, self.lease_seconds):
+            self._record(skipped_runs=1)
+            return None
+
+        started = time.perf_counter()
+        now = _utcnow()
+        summary = {'deleted_count': 0, 'files_deleted': 0, 'bytes_reclaimed': 0, 'revocations_pruned': 0, 'failures': 0}
+        deleted_files = []
+        try:
+            after = None
+            with ThreadPoolExecutor(max_workers=max(self.file_workers, 1), thread_name_prefix='document-sweeper') as pool:
+                while True:
+                    batch = self._batch_query(now, document_type_id, after).all()
+                    if not batch:
+                        break
+                    after = (batch[-1].expires_at, batch[-1].id)
+
+                    targets = []
+                    for doc in batch:
+                        try:
+                            targets.append((doc, self._document_paths(doc)))
+                        except Exception as e:
+                            summary['failures'] += 1
+                            print(f"Failed to cleanup document {doc.id}: {str(e)}")
+
+                    # File deletion is I/O bound, so the batch's files are removed in parallel
+                    paths = [path for _, doc_paths in targets for path in doc_paths]
+                    results = dict(zip(paths, pool.map(_remove_file, paths)))
+
+                    for doc, doc_paths in targets:
+                        errors = [results[path][1] for path in doc_paths if results[path][1] is not None]
+                        removed = [results[path][0] for path in doc_paths if results[path][0] is not None]
+                        if removed:
+                            summary['files_deleted'] += len(removed)
+                            summary['bytes_reclaimed'] += sum(removed)
+                        if errors:
+                            # Left unexpired so the next sweep retries the files it could not delete
+                            summary['failures'] += 1
+                            print(f"Failed to cleanup document {doc.id}: {str(errors[0])}")
+                            continue
+                        if removed and collect_files:
+                            deleted_files.append(doc.document_url)
+                        doc.is_expired = True
+                        doc.status = 'expired'
+                        summary['deleted_count'] += 1
+
+                    db.session.commit()
+                    db.session.expunge_all()
+                    # Renew the lease so a long sweep is not taken over halfway through
+                    Lease.acquire(LEASE_NAME, self.holder, self.lease_seconds)
+
+            summary['revocations_pruned'] = self._prune_revocations(now)
+        except Exception:
+            db.session.rollback()
+            self._record(failures=1)
+            raise
+        finally:
+            try:
+                Lease.release(LEASE_NAME, self.holder)
+            except Exception:
+                db.session.rollback()
+
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        self._record(
+            runs=1,
+            rows_expired=summary['deleted_count'],
+            files_deleted=summary['files_deleted'],
+            bytes_reclaimed=summary['bytes_reclaimed'],
+            revocations_pruned=summary['revocations_pruned'],
+            failures=summary['failures']
+        )
+        with self._metrics_lock:
+            self._metrics['last_run'] = {
+                'started_at': now.isoformat(),
+                'duration_ms': duration_ms,
+                'document_type_id': document_type_id,
+                **summary
+            }
+        if summary['deleted_count']:
+            print(f"🧹 Expired {summary['deleted_count']} document(s), reclaimed {summary['bytes_reclaimed']:,} bytes in {duration_ms}ms")
+
+        if collect_files:
+            summary['deleted_files'] = deleted_files
+        return summary
+
+# Global expired document sweeper instance
+document_sweeper = ExpiredDocumentSweeper()
+scheduler.register(LEASE_NAME, document_sweeper.interval_seconds, document_sweeper.sweep)
@@ -8,7 +8,6 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from flask import current_app, url_for
 import os
-import json
 
 class EmailService:
     def __init__(self):
@@ -279,9 +278,7 @@ class EmailService:
     def send_document_email(self, user_email, user_name, document_request, document_path=None):
         """Send document via email with PDF attachment"""
         try:
-            # Parse QR code data for verification info
-            qr_data = json.loads(document_request.qr_code_data) if document_request.qr_code_data else {}
-            verification_code = qr_data.get('verification_code', 'N/A')
+            verification_code = document_request.verification_code or 'N/A'
             
             # Create verification URL
             verification_url = f"{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/verify-document/{verification_code}"
@@ -378,47 +378,12 @@ def update_user_file_paths(user_id, file_mappings):
 def cleanup_expired_documents():
     """Clean up expired documents and their files"""
     try:
-        from models.document_request import DocumentRequest
-        from models.document_type import DocumentType
-        from database import db
-        from datetime import datetime
-        
-        # Find expired documents that should be auto-deleted
-        expired_docs = DocumentRequest.query.join(DocumentType).filter(
-            DocumentRequest.expires_at < datetime.now(timezone.utc).replace(tzinfo=None),
-            DocumentRequest.is_expired == False,
-            DocumentType.auto_delete_expired == True,
-            DocumentRequest.status == 'ready'
-        ).all()
-        
-        deleted_count = 0
-        deleted_files = []
-        
-        for doc in expired_docs:
-            try:
-                # Delete PDF file if it exists
-                if doc.document_url:
-                    file_path = os.path.join(current_app.root_path, 'uploads', doc.document_url.lstrip('/'))
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                        deleted_files.append(doc.document_url)
-                
-                # Mark document as expired
-                doc.is_expired = True
-                doc.status = 'expired'
-                
-                deleted_count += 1
-                
-            except Exception as e:
-                print(f"Failed to cleanup document {doc.id}: {str(e)}")
-        
-        if deleted_count > 0:
-            db.session.commit()
+        from utils.document_sweeper import document_sweeper
         
-        return {
-            'deleted_count': deleted_count,
-            'deleted_files': deleted_files
-        }
+        result = document_sweeper.sweep(collect_files=True)
+        if result is None:
+            return {'deleted_count': 0, 'deleted_files': [], 'in_progress': True}
+        return result
         
     except Exception as e:
         print(f"Failed to cleanup expired documents: {str(e)}")
@@ -427,47 +392,12 @@ def cleanup_expired_documents():
 def cleanup_expired_documents_by_type(document_type_id):
     """Clean up expired documents for a specific document type"""
     try:
-        from models.document_request import DocumentRequest
-        from models.document_type import DocumentType
-        from database import db
-        from datetime import datetime
-        
-        # Find expired documents for specific type
-        expired_docs = DocumentRequest.query.filter(
-            DocumentRequest.document_type_id == document_type_id,
-            DocumentRequest.expires_at < datetime.now(timezone.utc).replace(tzinfo=None),
-            DocumentRequest.is_expired == False,
-            DocumentRequest.status == 'ready'
-        ).all()
-        
-        deleted_count = 0
-        deleted_files = []
-        
-        for doc in expired_docs:
-            try:
-                # Delete PDF file if it exists
-                if doc.document_url:
-                    file_path = os.path.join(current_app.root_path, 'uploads', doc.document_url.lstrip('/'))
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                        deleted_files.append(doc.document_url)
-                
-                # Mark document as expired
-                doc.is_expired = True
-                doc.status = 'expired'
-                
-                deleted_count += 1
-                
-            except Exception as e:
-                print(f"Failed to cleanup document {doc.id}: {str(e)}")
-        
-        if deleted_count > 0:
-            db.session.commit()
+        from utils.document_sweeper import document_sweeper
         
-        return {
-            'deleted_count': deleted_count,
-            'deleted_files': deleted_files
-        }
+        result = document_sweeper.sweep(document_type_id=document_type_id, collect_files=True)
+        if result is None:
+            return {'deleted_count': 0, 'deleted_files': [], 'in_progress': True}
+        return result
         
     except Exception as e:
         print(f"Failed to cleanup expired documents for type {document_type_id}: {str(e)}")
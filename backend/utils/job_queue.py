@@ -0,0 +1,226 @@
+"""
+Database-backed background job queue
+"""
+
+import json
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta, timezone
+from database import db
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class JobQueue:
+    """Runs slow work (PDF rendering, SMTP) outside the HTTP request.
+
+    Jobs live in the jobs table, so they survive restarts and any process
+    sharing the database can run them: the worker threads started from
+    app.py, or a separate `python run_worker.py`. A worker claims a job with
+    a conditional UPDATE, so two workers never run the same job; a job whose
+    worker died is picked up again once its lease (JOB_LEASE_SECONDS) runs
+    out. Failed attempts are retried with exponential backoff up to the
+    job's max_attempts.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.poll_seconds = float(os.getenv('JOB_POLL_SECONDS', '2'))
+        self.lease_seconds = int(os.getenv('JOB_LEASE_SECONDS', '300'))
+        self.backoff_seconds = int(os.getenv('JOB_BACKOFF_SECONDS', '10'))
+        self.max_backoff_seconds = int(os.getenv('JOB_MAX_BACKOFF_SECONDS', '3600'))
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def register(self, job_type):
+        """Decorator registering handler(job) -> result dict for a job type"""
+        def decorator(handler):
+            self.handlers[job_type] = handler
+            return handler
+        return decorator
+
+    def get_active(self, idempotency_key):
+        """Get the queued or running job with this idempotency key, if any"""
+        from models.job import Job
+
+        return Job.query.filter(
+            Job.idempotency_key == idempotency_key,
+            Job.status.in_(ACTIVE_STATUSES)
+        ).first()
+
+    def get_active_many(self, idempotency_keys):
+        """Get {idempotency_key: job} for the keys that have a queued or running job"""
+        from models.job import Job
+
+        if not idempotency_keys:
+            return {}
+        jobs = Job.query.filter(
+            Job.idempotency_key.in_(idempotency_keys),
+            Job.status.in_(ACTIVE_STATUSES)
+        ).all()
+        return {job.idempotency_key: job for job in jobs}
+
+    def enqueue(self, job_type, payload=None, idempotency_key=None, max_attempts=5):
+        """Add a job to the current session; the caller commits, then calls wake().
+
+        If a job with the same idempotency_key is still queued or running it
+        is returned unchanged, so repeated submissions do the work once. A
+        finished job with that key is reset and queued again.
+        """
+        from models.job import Job
+
+        job = None
+        if idempotency_key:
+            job = Job.query.filter_by(idempotency_key=idempotency_key).first()
+            if job and job.status in ACTIVE_STATUSES:
+                return job
+
+        if job is None:
+            job = Job(job_type=job_type, idempotency_key=idempotency_key)
+            db.session.add(job)
+
+        job.job_type = job_type
+        job.payload = json.dumps(payload or {})
+        job.result = None
+        job.status = 'queued'
+        job.attempts = 0
+        job.max_attempts = max_attempts
+        job.run_at = _utcnow()
+        job.last_error = None
+        job.locked_by = None
+        job.locked_at = None
+        job.finished_at = None
+        return job
+
+    def wake(self):
+        """Tell idle in-process workers to look for work now instead of at the next poll"""
+        self._wakeup.set()
+
+    def _claimable(self, now):
+        from models.job import Job
+
+        return db.or_(
+            db.and_(Job.status == 'queued', Job.run_at <= now),
+            db.and_(Job.status == 'running', Job.locked_at < now - timedelta(seconds=self.lease_seconds))
+        )
+
+    def claim(self, worker_id):
+        """Lease the next due job to worker_id, or return None"""
+        from models.job import Job
+
+        while True:
+            now = _utcnow()
+            job_id = db.session.scalar(
+                db.select(Job.id).where(self._claimable(now)).order_by(Job.run_at, Job.id).limit(1)
+            )
+            if job_id is None:
+                db.session.commit()
+                return None
+
+            claimed = db.session.execute(
+                db.update(Job).where(Job.id == job_id, self._claimable(now)).values(
+                    status='running',
+                    locked_by=worker_id,
+                    locked_at=now,
+                    attempts=Job.attempts + 1
+                )
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.get(Job, job_id)
+            # Another worker got there first; try the next one
+
+    def run(self, job):
+        """Run a claimed job and record its outcome"""
+        from models.job import Job
+
+        job_id = job.id
+        try:
+            handler = self.handlers.get(job.job_type)
+            if handler is None:
+                raise ValueError(f"No handler registered for job type '{job.job_type}'")
+
+            result = handler(job)
+
+            job.status = 'succeeded'
+            job.result = json.dumps(result) if result is not None else job.result
+            job.finished_at = _utcnow()
+            job.locked_by = None
+            job.locked_at = None
+            db.session.commit()
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Job {job_id} ({job.job_type}) attempt failed: {str(e)}")
+            traceback.print_exc()
+
+            job = db.session.get(Job, job_id)
+            job.last_error = str(e)
+            job.locked_by = None
+            job.locked_at = None
+            if job.attempts >= job.max_attempts:
+                job.status = 'failed'
+                job.finished_at = _utcnow()
+            else:
+                delay = min(self.backoff_seconds * 2 ** (job.attempts - 1), self.max_backoff_seconds)
+                job.status = 'queued'
+                job.run_at = _utcnow() + timedelta(seconds=delay)
+            db.session.commit()
+            return False
+
+    def run_pending(self, worker_id=None, limit=None):
+        """Run due jobs in the calling thread until none are left; returns how many ran"""
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:inline"
+        count = 0
+        while limit is None or count < limit:
+            job = self.claim(worker_id)
+            if job is None:
+                break
+            self.run(job)
+            count += 1
+        return count
+
+    def _worker_loop(self, app, worker_id):
+        while not self._stopping.is_set():
+            ran = False
+            try:
+                # A fresh app context per job gives every job a fresh session
+                with app.app_context():
+                    job = self.claim(worker_id)
+                    if job is not None:
+                        self.run(job)
+                        ran = True
+            except Exception as e:
+                print(f"❌ Job worker {worker_id} error: {str(e)}")
+
+            if not ran:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    def start(self, app, workers=None):
+        """Start background worker threads (JOB_WORKERS, default 2; 0 disables them)"""
+        workers = int(os.getenv('JOB_WORKERS', '2')) if workers is None else workers
+        for n in range(workers):
+            worker_id = f"{socket.gethostname()}:{os.getpid()}:{n}"
+            thread = threading.Thread(target=self._worker_loop, args=(app, worker_id), name=f'job-worker-{n}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return workers
+
+    def stop(self, timeout=None):
+        """Ask worker threads to exit after their current job"""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+# Global job queue instance
+job_queue = JobQueue()
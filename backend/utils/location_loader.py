@@ -0,0 +1,536 @@
+"""
+Bulk loader for the PH_LOC.json location hierarchy
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from datetime import datetime, timezone
+from database import db
+from utils.location_search import normalize_name
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LOCATION_JSON_PATHS = [
+    'PH_LOC.json',
+    '../PH_LOC.json',
+    '/app/PH_LOC.json'  # Railway path
+]
+
+# Municipalities that are cities even though "City" is not part of their name
+CITY_NAMES = {
+    "Manila", "Quezon City", "Caloocan", "Las Piñas", "Makati",
+    "Malabon", "Mandaluyong", "Marikina", "Muntinlupa", "Navotas",
+    "Parañaque", "Pasay", "Pasig", "San Juan", "Taguig", "Valenzuela"
+}
+
+LOCATION_COLUMNS = (
+    'id', 'psgc_code', 'name', 'search_name', 'geographic_level', 'level', 'parent_id', 'path',
+    'population_2020', 'urban_rural', 'is_active', 'created_at', 'updated_at'
+)
+
+DEFAULT_BATCH_SIZE = 2000
+
+def find_location_file():
+    """Return the first existing PH_LOC.json path, or None"""
+    for path in LOCATION_JSON_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+class _JSONStream:
+    """Minimal pull parser over a text file, reading it in fixed-size chunks"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer stays around one chunk in size
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of JSON input')
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found '{self.buffer[self.pos]}'")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value (string, array, object) at the cursor"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                self.pos = end
+                return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def members(self):
+        """Iterate over the keys of the object at the cursor, leaving each value unread"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' at offset {self.pos - 1}")
+
+def iter_location_file(path=None, chunk_size=64 * 1024):
+    """Stream PH_LOC.json as (province, municipality, [barangays]) tuples.
+
+    Only one municipality's barangay list is held in memory at a time. A
+    province without municipalities is yielded as (province, None, []).
+    """
+    path = path or find_location_file()
+    if not path:
+        raise FileNotFoundError('PH_LOC.json not found')
+
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f, chunk_size)
+        for province_name in stream.members():
+            empty = True
+            for municipality_name in stream.members():
+                empty = False
+                yield province_name, municipality_name, stream.value()
+            if empty:
+                yield province_name, None, []
+
+def iter_location_data(location_data):
+    """Adapt an already loaded {province: {municipality: [barangays]}} dict"""
+    for province_name, municipalities in location_data.items():
+        if not municipalities:
+            yield province_name, None, []
+        for municipality_name, barangays in municipalities.items():
+            yield province_name, municipality_name, barangays
+
+def memory_high_water_mark_mb():
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    divisor = 1024 * 1024 if os.uname().sysname == 'Darwin' else 1024
+    return round(peak / divisor, 1)
+
+def generate_psgc_code(level, parent_code="", index=0):
+    """Generate a simple PSGC code for locations without official codes"""
+    if level == 1:  # Region
+        return f"R{index:02d}"
+    elif level == 2:  # Province
+        return f"{parent_code}P{index:02d}"
+    elif level == 3:  # Municipality/City
+        return f"{parent_code}M{index:02d}"
+    elif level == 4:  # Barangay
+        return f"{parent_code}B{index:03d}"
+    return f"LOC{index:06d}"
+
+def is_city(municipality_name):
+    """Heuristic used by every loader to tell cities from municipalities"""
+    return "City" in municipality_name or municipality_name in CITY_NAMES
+
+def location_path(parent_path, location_id):
+    """Materialized path of a location: its ancestors' ids and its own, root first"""
+    return f"{parent_path}/{location_id}" if parent_path else str(location_id)
+
+def generate_location_rows(entries, start_id=1):
+    """Yield insert-ready row dicts with ids and parent ids precomputed.
+
+    entries is an iterable of (province, municipality, [barangays]) tuples
+    as produced by iter_location_file() or iter_location_data(). Barangays
+    are plain names, or dicts with a name and optional psgc_code,
+    population_2020 and urban_rural from a full PSGC export.
+
+    Ids are assigned sequentially from start_id in file order, so loading the
+    same file into an empty table always produces the same ids.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    next_id = start_id
+
+    def make_row(psgc_code, name, geographic_level, level, parent, attributes=None):
+        nonlocal next_id
+        attributes = attributes or {}
+        row = {
+            'id': next_id,
+            'psgc_code': attributes.get('psgc_code') or psgc_code,
+            'name': name,
+            'search_name': normalize_name(name),
+            'geographic_level': geographic_level,
+            'level': level,
+            'parent_id': parent['id'] if parent else None,
+            'path': location_path(parent['path'] if parent else None, next_id),
+            'population_2020': attributes.get('population_2020'),
+            'urban_rural': attributes.get('urban_rural'),
+            'is_active': True,
+            'created_at': now,
+            'updated_at': now
+        }
+        next_id += 1
+        return row
+
+    region = make_row(generate_psgc_code(1, "", 1), "Philippines", "Reg", 1, None)
+    yield region
+
+    province_index = 1
+    municipality_index = 1
+    barangay_index = 1
+    province = None
+
+    for province_name, municipality_name, barangays in entries:
+        if province is None or province['name'] != province_name:
+            province = make_row(
+                generate_psgc_code(2, region['psgc_code'], province_index),
+                province_name, "Prov", 2, region
+            )
+            province_index += 1
+            yield province
+
+        if municipality_name is None:
+            continue
+
+        municipality = make_row(
+            generate_psgc_code(3, province['psgc_code'], municipality_index),
+            municipality_name, "City" if is_city(municipality_name) else "Mun", 3, province
+        )
+        municipality_index += 1
+        yield municipality
+
+        for barangay in barangays:
+            attributes = barangay if isinstance(barangay, dict) else None
+            yield make_row(
+                generate_psgc_code(4, municipality['psgc_code'], barangay_index),
+                attributes['name'] if attributes else barangay, "Bgy", 4, municipality, attributes
+            )
+            barangay_index += 1
+
+def _batched(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _rows_to_csv(batch):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([
+            '' if row[column] is None else row[column]
+            for column in LOCATION_COLUMNS
+        ])
+    buffer.seek(0)
+    return buffer
+
+def _resolve_method(method):
+    if method != 'auto':
+        return method
+    engine = db.session.get_bind()
+    if engine.dialect.name == 'postgresql' and engine.dialect.driver == 'psycopg2':
+        return 'copy'
+    return 'insert'
+
+def _write_batch(batch, method):
+    from models.location import Location
+
+    if method == 'copy':
+        cursor = db.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY locations ({', '.join(LOCATION_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                _rows_to_csv(batch)
+            )
+        finally:
+            cursor.close()
+    else:
+        db.session.execute(Location.__table__.insert(), batch)
+
+def _reset_id_sequence():
+    """Move the PostgreSQL id sequence past the explicitly inserted ids"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        db.session.execute(db.text(
+            "SELECT setval(pg_get_serial_sequence('locations', 'id'), "
+            "COALESCE((SELECT MAX(id) FROM locations), 1))"
+        ))
+
+def bulk_load_locations(entries, batch_size=DEFAULT_BATCH_SIZE, method='auto', progress=None, dry_run=False):
+    """Replace the locations table with the given location entries.
+
+    entries is an iterable of (province, municipality, [barangays]) tuples,
+    normally the streaming iter_location_file() reader, so memory stays
+    bounded by one batch plus one municipality regardless of file size.
+
+    Rows are streamed in batches through Core executemany inserts or, on
+    PostgreSQL/psycopg2, COPY FROM STDIN. The delete and all inserts run in
+    one transaction. With dry_run=True the rows are generated and encoded
+    but nothing is written, which times the Python side of the load.
+
+    progress, if given, is called as progress(rows_written) after each batch.
+    Returns per-level statistics plus the elapsed time and the process
+    memory high-water mark.
+    """
+    from models.location import Location
+
+    started = time.perf_counter()
+    method = _resolve_method(method)
+    counts = {'Reg': 0, 'Prov': 0, 'City': 0, 'Mun': 0, 'Bgy': 0}
+    written = 0
+
+    try:
+        if not dry_run:
+            Location.query.delete()
+
+        for batch in _batched(generate_location_rows(entries), batch_size):
+            for row in batch:
+                counts[row['geographic_level']] += 1
+
+            if dry_run:
+                if method == 'copy':
+                    _rows_to_csv(batch)
+            else:
+                _write_batch(batch, method)
+
+            written += len(batch)
+            if progress:
+                progress(written)
+
+        if not dry_run:
+            _reset_id_sequence()
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {
+        'total_locations': written,
+        'regions': counts['Reg'],
+        'provinces': counts['Prov'],
+        'municipalities': counts['Mun'],
+        'cities': counts['City'],
+        'barangays': counts['Bgy'],
+        'method': method,
+        'dry_run': dry_run,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'peak_memory_mb': memory_high_water_mark_mb()
+    }
+
+def _path_keys(rows, parent_of, name_of):
+    """Map row ids to hierarchical (province, municipality, barangay) keys.
+
+    rows must list parents before children. Repeated names under the same
+    parent get an occurrence suffix so every key stays unique.
+    """
+    keys = {}
+    seen = {}
+    for row_id in rows:
+        parent_id = parent_of(row_id)
+        base = (keys[parent_id] if parent_id in keys else ()) + (name_of(row_id),)
+        occurrence = seen.get(base, 0) + 1
+        seen[base] = occurrence
+        keys[row_id] = base if occurrence == 1 else base + (f'#{occurrence}',)
+    return keys
+
+def sync_locations(entries, batch_size=DEFAULT_BATCH_SIZE, progress=None, dry_run=False):
+    """Bring the locations table in line with entries without rewriting it.
+
+    Existing rows are matched to the source by official psgc_code when the
+    source provides one, otherwise by their (province, municipality,
+    barangay) name path. Matched rows keep their primary key, so foreign keys
+    such as User.province_id/municipality_id/barangay_id stay valid. Only
+    the differences are written, in batched statements:
+
+    - inserts for new locations
+    - updates for moved, reclassified or re-activated locations, and for
+      renamed ones matched by official code
+    - soft deletes (is_active = False) for locations missing from the source
+
+    Renames are only recognised through numeric official PSGC codes that
+    stay the same between datasets. A location with a generated code (no
+    official code in the source) that is renamed, or one whose official
+    code changes, no longer matches: it is soft-deleted and inserted again
+    under a new id, and rows referencing the old id keep pointing at the
+    inactive location.
+
+    Re-running an unchanged dataset costs one scan of the table and no writes.
+    progress, if given, is called as progress(source_rows_compared) per batch.
+    Returns the counts for each kind of change.
+    """
+    from models.location import Location
+
+    started = time.perf_counter()
+    table = Location.__table__
+
+    existing = {}
+    order = []
+    by_code = {}
+    for row in db.session.execute(db.select(
+        table.c.id, table.c.psgc_code, table.c.name, table.c.geographic_level,
+        table.c.parent_id, table.c.path, table.c.is_active
+    ).order_by(table.c.level, table.c.id)):
+        existing[row.id] = row
+        order.append(row.id)
+        by_code[row.psgc_code] = row.id
+
+    existing_keys = _path_keys(
+        order,
+        lambda row_id: existing[row_id].parent_id,
+        lambda row_id: existing[row_id].name
+    )
+    by_path = {key: row_id for row_id, key in existing_keys.items()}
+    used_codes = set(by_code)
+    next_id = max(existing, default=0) + 1
+
+    source_to_db = {}
+    db_paths = {}
+    source_keys = {}
+    source_seen = {}
+    matched = set()
+    inserts = []
+    updates = []
+    compared = 0
+    counts = {'inserted': 0, 'updated': 0, 'reactivated': 0, 'deleted': 0, 'unchanged': 0}
+
+    def flush():
+        if dry_run:
+            return
+        if inserts:
+            db.session.execute(table.insert(), inserts)
+        if updates:
+            db.session.execute(
+                table.update().where(table.c.id == db.bindparam('_id')).values(
+                    name=db.bindparam('_name'),
+                    search_name=db.bindparam('_search_name'),
+                    geographic_level=db.bindparam('_geographic_level'),
+                    parent_id=db.bindparam('_parent_id'),
+                    path=db.bindparam('_path'),
+                    is_active=True,
+                    updated_at=db.bindparam('_updated_at')
+                ),
+                updates
+            )
+        inserts.clear()
+        updates.clear()
+
+    try:
+        for source in generate_location_rows(entries):
+            compared += 1
+            parent_id = source_to_db.get(source['parent_id'])
+
+            base = (source_keys.get(source['parent_id'], ())) + (source['name'],)
+            occurrence = source_seen.get(base, 0) + 1
+            source_seen[base] = occurrence
+            key = base if occurrence == 1 else base + (f'#{occurrence}',)
+            source_keys[source['id']] = key
+
+            # Official PSGC codes are numeric and survive renames; generated ones (R01P..) do not
+            if source['psgc_code'].isdigit() and source['psgc_code'] in by_code:
+                row_id = by_code[source['psgc_code']]
+            else:
+                row_id = by_path.get(key)
+
+            if row_id is None or row_id in matched:
+                row_id = next_id
+                next_id += 1
+                psgc_code = source['psgc_code']
+                if psgc_code in used_codes:
+                    psgc_code = generate_psgc_code(None, index=row_id)
+                used_codes.add(psgc_code)
+                path = location_path(db_paths.get(parent_id), row_id)
+                inserts.append(dict(source, id=row_id, psgc_code=psgc_code, parent_id=parent_id, path=path))
+                counts['inserted'] += 1
+            else:
+                current = existing[row_id]
+                path = location_path(db_paths.get(parent_id), row_id)
+                changed = (current.name, current.geographic_level, current.parent_id, current.path) != \
+                    (source['name'], source['geographic_level'], parent_id, path)
+                if current.is_active is False:
+                    counts['reactivated'] += 1
+                elif changed:
+                    counts['updated'] += 1
+                else:
+                    counts['unchanged'] += 1
+
+                if changed or current.is_active is False:
+                    updates.append({
+                        '_id': row_id,
+                        '_name': source['name'],
+                        '_search_name': source['search_name'],
+                        '_geographic_level': source['geographic_level'],
+                        '_parent_id': parent_id,
+                        '_path': path,
+                        '_updated_at': source['updated_at']
+                    })
+
+            matched.add(row_id)
+            source_to_db[source['id']] = row_id
+            db_paths[row_id] = path
+
+            if len(inserts) + len(updates) >= batch_size:
+                flush()
+            if progress and compared % batch_size == 0:
+                progress(compared)
+
+        flush()
+
+        stale = [row_id for row_id, row in existing.items() if row_id not in matched and row.is_active is not False]
+        counts['deleted'] = len(stale)
+        if not dry_run:
+            for start in range(0, len(stale), batch_size):
+                db.session.execute(
+                    table.update().where(table.c.id.in_(stale[start:start + batch_size])).values(
+                        is_active=False,
+                        updated_at=datetime.now(timezone.utc).replace(tzinfo=None)
+                    )
+                )
+            if counts['inserted']:
+                _reset_id_sequence()
+            db.session.commit()
+        if progress:
+            progress(compared)
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return dict(
+        counts,
+        total_compared=compared,
+        dry_run=dry_run,
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+        peak_memory_mb=memory_high_water_mark_mb()
+    )
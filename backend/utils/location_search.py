@@ -0,0 +1,237 @@
+"""
+Location name search for the address autocomplete
+"""
+
+import bisect
+import heapq
+import os
+import threading
+import unicodedata
+from database import db
+from utils.location_tree import location_tree
+
+NGRAM_SIZE = 3
+
+# Rank classes, best first (the SQL ordering uses the same values)
+EXACT_MATCH = 0
+PREFIX_MATCH = 1
+WORD_PREFIX_MATCH = 2
+INFIX_MATCH = 3
+
+def normalize_name(name):
+    """Casefold and strip accents so 'Peñarrubia' and 'PENARRUBIA' compare equal"""
+    if not name:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+def _ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+class _NgramIndex:
+    """Trigram posting lists plus sorted name/word lists for prefix lookups"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.normalized = {}
+        self.postings = {}
+        names = []
+        words = []
+
+        for level_ids in snapshot.by_level.values():
+            for node_id in level_ids:
+                normalized = normalize_name(snapshot.nodes[node_id]['name'])
+                self.normalized[node_id] = normalized
+                names.append((normalized, node_id))
+                for word in set(normalized.split(' ')[1:]):
+                    words.append((word, node_id))
+                for gram in _ngrams(normalized):
+                    self.postings.setdefault(gram, []).append(node_id)
+
+        names.sort()
+        words.sort()
+        self.names = names
+        self.words = words
+
+        # Tie-break inside a rank class: higher levels first, then shorter names
+        ordered = sorted(self.normalized, key=lambda node_id: (
+            snapshot.nodes[node_id]['level'], len(self.normalized[node_id]), self.normalized[node_id]
+        ))
+        self.order = {node_id: position for position, node_id in enumerate(ordered)}
+
+    @staticmethod
+    def _prefix_range(entries, prefix):
+        start = bisect.bisect_left(entries, (prefix,))
+        for i in range(start, len(entries)):
+            if not entries[i][0].startswith(prefix):
+                break
+            yield entries[i][1]
+
+    def _infix(self, query):
+        """Ids whose normalized name contains query (query is at least NGRAM_SIZE long)"""
+        postings = []
+        for gram in _ngrams(query):
+            posting = self.postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+
+        found = set(postings[0])
+        for posting in postings[1:]:
+            found.intersection_update(posting)
+            if not found:
+                return found
+        return {node_id for node_id in found if query in self.normalized[node_id]}
+
+    def search(self, query, accept, limit):
+        """Best `limit` accepted ids: exact, then name prefix, word prefix, infix"""
+        order = self.order
+        exact_bonus = len(order)
+
+        def prefix_key(node_id):
+            return order[node_id] - (exact_bonus if self.normalized[node_id] == query else 0)
+
+        results = []
+        seen = set()
+
+        def take(ids, key):
+            ids = [node_id for node_id in ids if node_id not in seen and accept(node_id)]
+            seen.update(ids)
+            results.extend(heapq.nsmallest(limit - len(results), ids, key=key))
+            return len(results) >= limit
+
+        if take(self._prefix_range(self.names, query), prefix_key):
+            return results
+        if take(self._prefix_range(self.words, query), order.get):
+            return results
+        # Infix matches are only worth computing when the prefix tiers came up short
+        if len(query) >= NGRAM_SIZE:
+            take(self._infix(query), order.get)
+        return results
+
+class LocationSearch:
+    """Accent-insensitive location search ranked prefix-first.
+
+    On PostgreSQL with pg_trgm the matching rows come from a GIN trigram
+    index on locations.search_name (see migrations/add_location_search_index.py);
+    everywhere else they come from an in-memory trigram index built from the
+    location tree. Either way the hierarchy path is filled in from the tree.
+    Set LOCATION_SEARCH_BACKEND to 'memory' to force the in-memory index.
+    """
+
+    def __init__(self):
+        self.backend = os.getenv('LOCATION_SEARCH_BACKEND', 'auto')
+        self._lock = threading.Lock()
+        self._index = None
+        self._use_postgres = None
+
+    def _get_index(self, snapshot):
+        index = self._index
+        if index is None or index.snapshot is not snapshot:
+            with self._lock:
+                if self._index is None or self._index.snapshot is not snapshot:
+                    self._index = _NgramIndex(snapshot)
+                index = self._index
+        return index
+
+    def _postgres_available(self):
+        if self._use_postgres is None:
+            if self.backend == 'memory' or db.session.get_bind().dialect.name != 'postgresql':
+                self._use_postgres = False
+            else:
+                installed = db.session.execute(db.text(
+                    "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+                )).first()
+                self._use_postgres = installed is not None
+        return self._use_postgres
+
+    @staticmethod
+    def _in_scope(snapshot, node, scope_id):
+        current = node
+        while current:
+            if current['parent_id'] == scope_id:
+                return True
+            current = snapshot.nodes.get(current['parent_id'])
+        return False
+
+    @staticmethod
+    def _scope_parent_ids(snapshot, scope_id):
+        """scope_id and every descendant that has children of its own"""
+        parent_ids = [scope_id]
+        for parent_id in parent_ids:
+            parent_ids.extend(
+                child_id for child_id in snapshot.children.get(parent_id, [])
+                if child_id in snapshot.children
+            )
+        return parent_ids
+
+    def _search_postgres(self, snapshot, query, level, scope_id, limit):
+        from models.location import Location
+
+        search_name = Location.search_name
+        pattern = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        rank = db.case(
+            (search_name == query, EXACT_MATCH),
+            (search_name.like(f'{pattern}%', escape='\\'), PREFIX_MATCH),
+            (search_name.like(f'% {pattern}%', escape='\\'), WORD_PREFIX_MATCH),
+            else_=INFIX_MATCH
+        )
+        statement = db.select(Location.id).where(
+            search_name.like(f'%{pattern}%', escape='\\'),
+            Location.is_active != False
+        )
+        if level:
+            statement = statement.where(Location.geographic_level == level)
+        if scope_id is not None:
+            statement = statement.where(Location.parent_id.in_(self._scope_parent_ids(snapshot, scope_id)))
+        statement = statement.order_by(rank, Location.level, db.func.length(search_name), search_name).limit(limit)
+
+        return [snapshot.nodes[row_id] for row_id in db.session.scalars(statement) if row_id in snapshot.nodes]
+
+    def _search_memory(self, snapshot, query, level, scope_id, limit):
+        index = self._get_index(snapshot)
+
+        def accept(node_id):
+            node = snapshot.nodes[node_id]
+            if level and node['geographic_level'] != level:
+                return False
+            return scope_id is None or self._in_scope(snapshot, node, scope_id)
+
+        return [snapshot.nodes[node_id] for node_id in index.search(query, accept, limit)]
+
+    def search(self, query, level=None, parent_id=None, limit=50):
+        """Search active locations by name.
+
+        Returns serialized locations, best match first, each extended with
+        'hierarchy_path' (names from province down to the location) and
+        'full_name' ('Barangay, City, Province').
+        """
+        normalized = normalize_name(query)
+        if not normalized or limit <= 0:
+            return []
+
+        snapshot = location_tree.snapshot()
+        if self._postgres_available():
+            nodes = self._search_postgres(snapshot, normalized, level, parent_id, limit)
+        else:
+            nodes = self._search_memory(snapshot, normalized, level, parent_id, limit)
+
+        results = []
+        for node in nodes:
+            path = []
+            current = node
+            while current and current['geographic_level'] != 'Reg':
+                path.insert(0, current['name'])
+                current = snapshot.nodes.get(current['parent_id'])
+            results.append(dict(node, hierarchy_path=path, full_name=', '.join(reversed(path))))
+        return results
+
+    def warm(self):
+        """Build the in-memory index ahead of the first request"""
+        if not self._postgres_available():
+            self._get_index(location_tree.snapshot())
+
+# Global location search instance
+location_search = LocationSearch()
@@ -0,0 +1,178 @@
+"""
+In-memory PSGC location tree for the cascading address dropdowns
+"""
+
+import os
+import threading
+import time
+from database import db
+from utils.response_cache import response_cache
+
+CITY_MUN_LEVELS = ('City', 'Mun')
+
+# Location.level of each part of a user's address
+ADDRESS_LEVELS = {2: 'province', 3: 'municipality', 4: 'barangay'}
+
+def _serialize_row(row):
+    """Serialize a locations row the same way Location.to_dict() does"""
+    return {
+        'id': row.id,
+        'psgc_code': row.psgc_code,
+        'name': row.name,
+        'correspondence_code': row.correspondence_code,
+        'geographic_level': row.geographic_level,
+        'old_names': row.old_names,
+        'city_class': row.city_class,
+        'income_classification': row.income_classification,
+        'urban_rural': row.urban_rural,
+        'population_2020': row.population_2020,
+        'status': row.status,
+        'is_active': row.is_active,
+        'parent_id': row.parent_id,
+        'level': row.level,
+        'path': row.path,
+        'created_at': row.created_at.isoformat() if row.created_at else None,
+        'updated_at': row.updated_at.isoformat() if row.updated_at else None
+    }
+
+def address_names(ancestry):
+    """{'province': name, 'municipality': name, 'barangay': name} from an ancestry; missing levels are left out"""
+    return {ADDRESS_LEVELS[node['level']]: node['name'] for node in ancestry if node['level'] in ADDRESS_LEVELS}
+
+class _Snapshot:
+    """Immutable view of the whole table, swapped in atomically on reload"""
+
+    def __init__(self, nodes, children, by_level, fingerprint):
+        self.nodes = nodes              # id -> serialized node
+        self.children = children        # parent id -> [child ids]
+        self.by_level = by_level        # geographic_level -> [ids]
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+
+class LocationTree:
+    """Process-wide, read-only copy of the locations hierarchy.
+
+    The table is loaded once and every lookup is answered from memory.
+    Writers call invalidate() after rewriting the table; other processes
+    (e.g. populate_locations.py run from a shell) are picked up by a cheap
+    fingerprint check at most once every LOCATION_TREE_REFRESH_SECONDS.
+    """
+
+    def __init__(self):
+        self.refresh_seconds = int(os.getenv('LOCATION_TREE_REFRESH_SECONDS', '300'))
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def _fingerprint(self):
+        from models.location import Location
+
+        count, last_updated = db.session.query(
+            db.func.count(Location.id),
+            db.func.max(Location.updated_at)
+        ).one()
+        return (count, last_updated)
+
+    def load(self):
+        """(Re)build the tree from the locations table"""
+        from models.location import Location
+
+        with self._lock:
+            fingerprint = self._fingerprint()
+            rows = db.session.execute(
+                db.select(Location.__table__).order_by(Location.id)
+            )
+
+            nodes = {}
+            children = {}
+            by_level = {}
+            for row in rows:
+                nodes[row.id] = _serialize_row(row)
+                # Soft-deleted locations stay resolvable by id but drop out of listings
+                if row.is_active is False:
+                    continue
+                children.setdefault(row.parent_id, []).append(row.id)
+                by_level.setdefault(row.geographic_level, []).append(row.id)
+
+            previous = self._snapshot
+            self._snapshot = _Snapshot(nodes, children, by_level, fingerprint)
+            if previous is not None and previous.fingerprint != fingerprint:
+                # Changed by another process; invalidate() already covered our own writes
+                response_cache.invalidate_tables('locations')
+            return self._snapshot
+
+    def invalidate(self):
+        """Drop the cached tree; the next lookup reloads it"""
+        self._snapshot = None
+        response_cache.invalidate_tables('locations')
+
+    def _get(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.load()
+
+        if time.monotonic() - snapshot.checked_at >= self.refresh_seconds:
+            if self._fingerprint() != snapshot.fingerprint:
+                return self.load()
+            snapshot.checked_at = time.monotonic()
+
+        return snapshot
+
+    def snapshot(self):
+        """Get the current snapshot, reloading it first if it is stale"""
+        return self._get()
+
+    def get(self, location_id):
+        """Get a single serialized location by id"""
+        return self._get().nodes.get(location_id)
+
+    def get_children(self, parent_id, levels=None):
+        """Get serialized children of a location, optionally filtered by level"""
+        snapshot = self._get()
+        nodes = [snapshot.nodes[child_id] for child_id in snapshot.children.get(parent_id, [])]
+        if levels:
+            nodes = [node for node in nodes if node['geographic_level'] in levels]
+        return nodes
+
+    def get_by_level(self, geographic_level):
+        """Get every serialized location at a geographic level"""
+        snapshot = self._get()
+        return [snapshot.nodes[node_id] for node_id in snapshot.by_level.get(geographic_level, [])]
+
+    @staticmethod
+    def _ancestry(snapshot, location_id):
+        node = snapshot.nodes.get(location_id)
+        if not node:
+            return []
+        if node['path']:
+            return [snapshot.nodes[int(part)] for part in node['path'].split('/') if int(part) in snapshot.nodes]
+
+        # Rows loaded before the path column existed
+        hierarchy = []
+        while node:
+            hierarchy.insert(0, node)
+            node = snapshot.nodes.get(node['parent_id'])
+        return hierarchy
+
+    def get_ancestry(self, location_id):
+        """Get the chain of serialized locations from the root down to location_id"""
+        return self._ancestry(self._get(), location_id)
+
+    def get_ancestries(self, location_ids):
+        """Get {location_id: ancestry} for many locations against one snapshot"""
+        snapshot = self._get()
+        return {location_id: self._ancestry(snapshot, location_id) for location_id in set(location_ids)}
+
+    def get_stats(self):
+        """Get location counts per geographic level"""
+        snapshot = self._get()
+        return {
+            'total_locations': sum(len(ids) for ids in snapshot.by_level.values()),
+            'regions': len(snapshot.by_level.get('Reg', [])),
+            'provinces': len(snapshot.by_level.get('Prov', [])),
+            'cities': len(snapshot.by_level.get('City', [])),
+            'municipalities': len(snapshot.by_level.get('Mun', [])),
+            'barangays': len(snapshot.by_level.get('Bgy', []))
+        }
+
+# Global location tree instance
+location_tree = LocationTree()
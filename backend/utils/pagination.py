@@ -0,0 +1,66 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from database import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that was not produced by encode_cursor()"""
+
+def encode_cursor(*values):
+    """Opaque cursor pointing just past the row with these sort key values"""
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).rstrip(b'=').decode('ascii')
+
+def decode_cursor(cursor, *types):
+    """Sort key values from a cursor, converted to types (datetime or int); raises InvalidCursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError('Cursor does not match this listing')
+        decoded = []
+        for value, value_type in zip(values, types):
+            if value_type is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif isinstance(value, value_type) and not isinstance(value, bool):
+                decoded.append(value)
+            else:
+                raise ValueError('Cursor value has the wrong type')
+        return tuple(decoded)
+    except (ValueError, TypeError, UnicodeDecodeError, binascii.Error):
+        raise InvalidCursor('Invalid pagination cursor')
+
+def page_size(value):
+    """Requested page size clamped to 1..MAX_PAGE_SIZE"""
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(value, MAX_PAGE_SIZE))
+
+def keyset_page(query, created_at_column, id_column, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """One page of query, newest first, ordered by (created_at, id).
+
+    Returns (rows, next_cursor); next_cursor is None on the last page. The
+    page is found by seeking past the cursor rather than by OFFSET, so every
+    page costs the same however deep into the listing it is.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, datetime, int)
+        query = query.filter(db.or_(
+            created_at_column < created_at,
+            db.and_(created_at_column == created_at, id_column < row_id)
+        ))
+
+    rows = query.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_at_column.key), getattr(last, id_column.key))
@@ -0,0 +1,121 @@
+"""
+Bounded bcrypt hashing for logins and registrations
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+
+MIN_ROUNDS = 12  # bcrypt.gensalt()'s default, which every existing hash was made with; never calibrate below it
+MAX_ROUNDS = 15
+
+class PasswordHasherBusy(Exception):
+    """Every hashing slot and queue place is taken; retry after retry_after seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__('Too many password checks in progress')
+        self.retry_after = retry_after
+
+class PasswordHasher:
+    """Runs bcrypt on a small pool so a login storm cannot take every worker.
+
+    At most PASSWORD_HASH_WORKERS hashes run at once (one per core by
+    default; bcrypt releases the GIL, so they run in parallel) and at most
+    PASSWORD_HASH_QUEUE more wait for a slot. Past that, hash() and verify()
+    raise PasswordHasherBusy at once instead of queueing, and the routes
+    answer 503 with Retry-After; requests that do not hash passwords keep
+    their workers.
+
+    The cost is BCRYPT_ROUNDS if set, otherwise calibrated on first use so
+    one hash takes about BCRYPT_TARGET_MS on this machine, but never below
+    12 rounds. Hashes made with another cost still verify, and
+    needs_rehash() tells the login route to store a stronger one.
+    """
+
+    def __init__(self):
+        self.workers = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 2)))
+        self.queue_size = int(os.getenv('PASSWORD_HASH_QUEUE', str(self.workers * 4)))
+        self.target_ms = int(os.getenv('BCRYPT_TARGET_MS', '250'))
+        self._configured_rounds = int(os.getenv('BCRYPT_ROUNDS')) if os.getenv('BCRYPT_ROUNDS') else None
+        self._rounds = self._configured_rounds
+        self._hash_ms = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._pool = None
+        self._stats = {'hashes': 0, 'verifications': 0, 'rejected': 0, 'rehashes': 0}
+
+    def calibrate(self, target_ms=None):
+        """Highest cost whose hash takes at most target_ms here; returns (rounds, measured ms at that cost)"""
+        target_ms = target_ms or self.target_ms
+        started = time.perf_counter()
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(MIN_ROUNDS))
+        base_ms = (time.perf_counter() - started) * 1000
+        # Each extra round doubles the work, so one timing is enough to extrapolate
+        extra = math.floor(math.log2(target_ms / base_ms)) if base_ms < target_ms else 0
+        rounds = min(max(MIN_ROUNDS + extra, MIN_ROUNDS), MAX_ROUNDS)
+        return rounds, base_ms * 2 ** (rounds - MIN_ROUNDS)
+
+    @property
+    def rounds(self):
+        if self._rounds is None:
+            with self._lock:
+                if self._rounds is None:
+                    self._rounds, self._hash_ms = self.calibrate()
+                    print(f"🔐 bcrypt cost calibrated to {self._rounds} rounds (~{self._hash_ms:.0f}ms per hash)")
+        return self._rounds
+
+    def _submit(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise PasswordHasherBusy(self.retry_after())
+        try:
+            if self._pool is None:
+                with self._lock:
+                    if self._pool is None:
+                        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hasher')
+            return self._pool.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def retry_after(self):
+        """Seconds until a full queue has likely drained"""
+        hash_seconds = (self._hash_ms or self.target_ms) / 1000
+        return max(1, math.ceil(hash_seconds * (self.workers + self.queue_size) / self.workers))
+
+    def hash(self, password):
+        """bcrypt hash of password at the current cost"""
+        salt = bcrypt.gensalt(self.rounds)
+        hashed = self._submit(bcrypt.hashpw, password.encode('utf-8'), salt)
+        with self._lock:
+            self._stats['hashes'] += 1
+        return hashed.decode('utf-8')
+
+    def verify(self, password, password_hash):
+        """True if password matches password_hash, whatever cost it was made with"""
+        matches = self._submit(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+        with self._lock:
+            self._stats['verifications'] += 1
+        return matches
+
+    def needs_rehash(self, password_hash):
+        """True if password_hash was made with a lower cost than the current one"""
+        try:
+            return int(password_hash.split('$')[2]) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def record_rehash(self):
+        with self._lock:
+            self._stats['rehashes'] += 1
+
+    def stats(self):
+        """Counters and settings for this process"""
+        with self._lock:
+            return dict(self._stats, rounds=self._rounds, hash_ms=self._hash_ms, workers=self.workers, queue_size=self.queue_size)
+
+# Global password hasher instance
+password_hasher = PasswordHasher()
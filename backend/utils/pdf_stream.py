@@ -0,0 +1,168 @@
+"""
+Streaming PDF writer for merging many documents into one download
+"""
+
+import io
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject,
+    StreamObject, TextStringObject
+)
+
+class StreamingPdfWriter:
+    """Concatenates PDFs into one file that is produced as a series of byte chunks.
+
+    Each source PDF is parsed on its own, its pages and everything they
+    reference are renumbered and written out immediately, and the source
+    is dropped; only object offsets and page numbers are kept until the
+    end, where the page tree, bookmarks and cross-reference table are
+    written. Memory therefore stays bounded by the largest single source
+    document, however many documents are merged.
+    """
+
+    def __init__(self):
+        self._offsets = {}
+        self._position = 0
+        self._next_number = 1
+        self._pages_number = self._reserve()
+        self._catalog_number = self._reserve()
+        self.pages = []  # Object numbers of the page dictionaries, in page order
+
+    def _reserve(self):
+        number = self._next_number
+        self._next_number += 1
+        return number
+
+    def _emit(self, data):
+        self._position += len(data)
+        return data
+
+    def header(self):
+        """First chunk: the PDF header"""
+        return self._emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def _write_object(self, number, obj):
+        buffer = io.BytesIO()
+        buffer.write(f'{number} 0 obj\n'.encode('ascii'))
+        if isinstance(obj, StreamObject):
+            # Copy the still-encoded stream bytes; decoding and re-encoding would only cost time
+            data = obj._data
+            entries = DictionaryObject(obj)
+            entries[NameObject('/Length')] = NumberObject(len(data))
+            entries.write_to_stream(buffer)
+            buffer.write(b'\nstream\n')
+            buffer.write(data)
+            buffer.write(b'\nendstream')
+        else:
+            obj.write_to_stream(buffer)
+        buffer.write(b'\nendobj\n')
+        self._offsets[number] = self._position
+        return self._emit(buffer.getvalue())
+
+    def _renumber(self, obj, numbers, pending):
+        """Copy obj with every indirect reference pointing at this file's object numbers"""
+        if isinstance(obj, IndirectObject):
+            if obj.idnum not in numbers:
+                target = obj.get_object()
+                if isinstance(target, DictionaryObject) and target.get('/Type') == '/Pages':
+                    # The source's page tree is replaced by this file's
+                    return IndirectObject(self._pages_number, 0, None)
+                numbers[obj.idnum] = self._reserve()
+                pending.append(obj)
+            return IndirectObject(numbers[obj.idnum], 0, None)
+        if isinstance(obj, StreamObject):
+            clone = StreamObject()
+            clone._data = obj._data
+            for key, value in obj.items():
+                if key != '/Length':
+                    clone[NameObject(key)] = self._renumber(value, numbers, pending)
+            return clone
+        if isinstance(obj, DictionaryObject):
+            return DictionaryObject({
+                NameObject(key): self._renumber(value, numbers, pending) for key, value in obj.items()
+            })
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._renumber(value, numbers, pending) for value in obj)
+        return obj
+
+    def add_pdf(self, source):
+        """Append every page of a PDF (path or file object); yields byte chunks.
+
+        Returns (via StopIteration) the object numbers of the appended pages.
+        """
+        reader = PdfReader(source)
+        # Number the pages up front so references between them stay pages
+        numbers = {page.indirect_reference.idnum: self._reserve() for page in reader.pages}
+        added = []
+        for page in reader.pages:
+            pending = []
+            page_number = numbers[page.indirect_reference.idnum]
+            clone = DictionaryObject({
+                NameObject(key): self._renumber(value, numbers, pending)
+                for key, value in page.items() if key != '/Parent'
+            })
+            clone[NameObject('/Parent')] = IndirectObject(self._pages_number, 0, None)
+            yield self._write_object(page_number, clone)
+
+            # Resources, content streams and fonts the page refers to, each written once per source
+            while pending:
+                reference = pending.pop()
+                target = self._renumber(reference.get_object(), numbers, pending)
+                yield self._write_object(numbers[reference.idnum], target)
+
+            added.append(page_number)
+        self.pages.extend(added)
+        return added
+
+    def finish(self, page_order=None, bookmarks=()):
+        """Write the page tree, bookmarks, cross-reference table and trailer; yields byte chunks.
+
+        page_order overrides the order of self.pages; bookmarks is a list of
+        (title, page object number) pairs shown as the PDF outline.
+        """
+        kids = page_order if page_order is not None else self.pages
+
+        catalog = DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): IndirectObject(self._pages_number, 0, None)
+        })
+
+        bookmarks = list(bookmarks)
+        if bookmarks:
+            outline_number = self._reserve()
+            item_numbers = [self._reserve() for _ in bookmarks]
+            for i, (title, page_number) in enumerate(bookmarks):
+                item = DictionaryObject({
+                    NameObject('/Title'): TextStringObject(title),
+                    NameObject('/Parent'): IndirectObject(outline_number, 0, None),
+                    NameObject('/Dest'): ArrayObject([IndirectObject(page_number, 0, None), NameObject('/Fit')])
+                })
+                if i > 0:
+                    item[NameObject('/Prev')] = IndirectObject(item_numbers[i - 1], 0, None)
+                if i < len(bookmarks) - 1:
+                    item[NameObject('/Next')] = IndirectObject(item_numbers[i + 1], 0, None)
+                yield self._write_object(item_numbers[i], item)
+            yield self._write_object(outline_number, DictionaryObject({
+                NameObject('/Type'): NameObject('/Outlines'),
+                NameObject('/First'): IndirectObject(item_numbers[0], 0, None),
+                NameObject('/Last'): IndirectObject(item_numbers[-1], 0, None),
+                NameObject('/Count'): NumberObject(len(bookmarks))
+            }))
+            catalog[NameObject('/Outlines')] = IndirectObject(outline_number, 0, None)
+            catalog[NameObject('/PageMode')] = NameObject('/UseOutlines')
+
+        yield self._write_object(self._pages_number, DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): ArrayObject(IndirectObject(number, 0, None) for number in kids),
+            NameObject('/Count'): NumberObject(len(kids))
+        }))
+        yield self._write_object(self._catalog_number, catalog)
+
+        xref_offset = self._position
+        size = self._next_number
+        lines = [f'xref\n0 {size}\n', '0000000000 65535 f \n']
+        for number in range(1, size):
+            offset = self._offsets.get(number)
+            lines.append(f'{offset:010d} 00000 n \n' if offset is not None else '0000000000 65535 f \n')
+        lines.append(f'trailer\n<< /Size {size} /Root {self._catalog_number} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n')
+        yield self._emit(''.join(lines).encode('ascii'))
@@ -0,0 +1,70 @@
+"""
+QR codes for document verification
+"""
+
+import io
+from functools import lru_cache
+import qrcode
+from reportlab.platypus import Flowable
+
+QR_BORDER = 5  # Quiet zone, in modules
+
+def _make_qr(data):
+    qr = qrcode.QRCode(version=1, box_size=10, border=QR_BORDER)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+@lru_cache(maxsize=1024)
+def qr_runs(data):
+    """Dark modules of the QR code for data as (row, first column, run length) tuples.
+
+    Neighbouring dark modules in a row are merged into one run, so a code
+    draws as a few hundred rectangles rather than one per module. The
+    matrix includes the quiet zone; returns (size, runs).
+    """
+    matrix = _make_qr(data).get_matrix()
+    runs = []
+    for row, modules in enumerate(matrix):
+        start = None
+        for column, dark in enumerate(modules + [False]):
+            if dark and start is None:
+                start = column
+            elif not dark and start is not None:
+                runs.append((row, start, column - start))
+                start = None
+    return len(matrix), tuple(runs)
+
+@lru_cache(maxsize=256)
+def qr_png(data):
+    """PNG bytes of the QR code for data (previews only; PDFs draw the vector form)"""
+    img = _make_qr(data).make_image(fill_color="black", back_color="white")
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+class QRCodeFlowable(Flowable):
+    """QR code drawn as filled vector rectangles on the ReportLab canvas"""
+
+    def __init__(self, data, size):
+        Flowable.__init__(self)
+        self.data = data
+        self.size = size
+        self.modules, self.runs = qr_runs(data)
+
+    def wrap(self, availWidth, availHeight):
+        return self.size, self.size
+
+    def draw(self):
+        canv = self.canv
+        module = self.size / self.modules
+        top = self.size
+
+        path = canv.beginPath()
+        for row, column, length in self.runs:
+            path.rect(column * module, top - (row + 1) * module, length * module, module)
+
+        canv.saveState()
+        canv.setFillColorRGB(0, 0, 0)
+        canv.drawPath(path, stroke=0, fill=1)
+        canv.restoreState()
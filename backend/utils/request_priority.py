@@ -0,0 +1,112 @@
+"""
+Priority scoring for the admin request queue
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+# Queue order: urgent first
+PRIORITY_RANKS = {'urgent': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+# Score thresholds for each level, highest first
+PRIORITY_LEVELS = ((80, 'urgent'), (60, 'high'), (30, 'medium'))
+
+# Base score by request type
+TYPE_SCORES = {
+    'sos': 50,  # SOS requests are always high priority
+    'document': 20,
+    'relocation': 15,  # Relocation requests are usually medium priority
+    'item': 10  # Item requests are usually low-medium priority
+}
+
+# Older requests get higher priority: (minimum days old, bonus), oldest first
+AGE_BONUSES = ((7, 20), (3, 10), (1, 5))
+
+def _tiers(*tiers):
+    """Freeze (bonus, keywords) tiers into lowercased keyword tuples, built once at import.
+
+    Plain substring tests on a tuple beat both a regex alternation and a
+    single combined regex here: CPython's `in` is a fast C search, and the
+    scan stops at the first keyword found.
+    """
+    return tuple((bonus, tuple(keyword.lower() for keyword in keywords)) for bonus, keywords in tiers)
+
+EMERGENCY_TIERS = _tiers(
+    (30, ['medical', 'fire', 'police', 'accident', 'crime'])
+)
+DOCUMENT_TYPE_TIERS = _tiers(
+    (30, ['medical', 'emergency', 'death', 'funeral', 'hospital', 'accident']),
+    (15, ['employment', 'business', 'scholarship', 'education']),
+    (5, ['indigency', 'clearance', 'certificate', 'residency'])
+)
+PURPOSE_TIERS = _tiers(
+    (40, ['emergency', 'urgent', 'asap', 'immediately', 'hospital', 'medical', 'death', 'funeral', 'accident']),
+    (25, ['employment', 'job', 'work', 'business', 'scholarship', 'education', 'deadline']),
+    (10, ['government', 'official', 'requirement', 'application'])
+)
+
+def _tier_bonus(tiers, text):
+    """Bonus of the first tier with a keyword in text"""
+    if not text:
+        return 0
+    text = text.lower()
+    for bonus, keywords in tiers:
+        for keyword in keywords:
+            if keyword in text:
+                return bonus
+    return 0
+
+@lru_cache(maxsize=1024)
+def _cached_tier_bonus(tiers, text):
+    # Document type names and emergency types repeat, so their bonuses are memoized
+    return _tier_bonus(tiers, text)
+
+def base_score(request_type, document_type_name=None, purpose=None, emergency_type=None):
+    """Priority score from the request's content alone; it only changes when the request is edited"""
+    score = TYPE_SCORES.get(request_type, 0)
+    if request_type == 'sos':
+        score += _cached_tier_bonus(EMERGENCY_TIERS, emergency_type)
+    elif request_type == 'document':
+        score += _cached_tier_bonus(DOCUMENT_TYPE_TIERS, document_type_name)
+        score += _tier_bonus(PURPOSE_TIERS, purpose)
+    return score
+
+def age_bonus(created_at, now=None):
+    """Extra score for a request's age"""
+    if not created_at:
+        return 0
+    if isinstance(created_at, str):
+        try:
+            created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+        except ValueError:
+            return 0  # If date parsing fails, continue without time bonus
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    age = now - created_at.replace(tzinfo=None)
+    for days, bonus in AGE_BONUSES:
+        if age >= timedelta(days=days):
+            return bonus
+    return 0
+
+def priority_score(request_type, document_type_name=None, purpose=None, emergency_type=None, created_at=None, now=None):
+    """Numeric priority of a request; higher is more pressing"""
+    return base_score(request_type, document_type_name, purpose, emergency_type) + age_bonus(created_at, now)
+
+def priority_level(score):
+    """Convert a priority score to 'low', 'medium', 'high' or 'urgent'"""
+    for threshold, level in PRIORITY_LEVELS:
+        if score >= threshold:
+            return level
+    return 'low'
+
+def determine_priority(request_type, request_data=None, document_type_name=None, purpose=None, emergency_type=None, created_at=None):
+    """
+    Determine request priority based on various factors
+    Returns: 'low', 'medium', 'high', 'urgent'
+    """
+    return priority_level(priority_score(
+        request_type,
+        document_type_name=document_type_name,
+        purpose=purpose,
+        emergency_type=emergency_type,
+        created_at=created_at
+    ))
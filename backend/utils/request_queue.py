@@ -0,0 +1,245 @@
+"""
+Read model behind the unified admin request queue
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from database import db
+from utils.request_priority import AGE_BONUSES, PRIORITY_LEVELS, PRIORITY_RANKS, age_bonus, base_score, priority_level
+from utils.scheduler import scheduler
+
+# Request tables that feed the queue, by the queue's request_type
+QUEUE_TABLES = {
+    'document': 'document_requests',
+    'sos': 'sos_requests',
+    'relocation': 'relocation_requests',
+    'item': 'item_requests'
+}
+REQUEST_TYPES = {table: request_type for request_type, table in QUEUE_TABLES.items()}
+
+REBUILD_BATCH_SIZE = 1000
+PRIORITY_AGING_SECONDS = int(os.getenv('PRIORITY_AGING_SECONDS', '3600'))
+
+def _table(name):
+    return db.metadata.tables[name]
+
+def _lookup(connection, table_name, ids, *columns):
+    """{id: row} for the given ids of a table, selecting only the named columns"""
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    table = _table(table_name)
+    rows = connection.execute(
+        db.select(table.c.id, *(table.c[column] for column in columns)).where(table.c.id.in_(ids))
+    )
+    return {row.id: row for row in rows}
+
+def build_entries(connection, request_type, rows):
+    """request_queue values for request rows (ORM instances or Core rows of one request table)"""
+    rows = list(rows)
+    requesters = _lookup(connection, 'users', [row.requester_id for row in rows], 'first_name', 'last_name', 'barangay_id')
+
+    if request_type == 'document':
+        document_types = _lookup(connection, 'document_types', [row.document_type_id for row in rows], 'name')
+    elif request_type == 'relocation':
+        barangays = _lookup(
+            connection, 'barangays',
+            [row.from_barangay_id for row in rows] + [row.to_barangay_id for row in rows], 'name'
+        )
+    elif request_type == 'item':
+        items = _lookup(connection, 'items', [row.item_id for row in rows], 'title')
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    entries = []
+    for row in rows:
+        requester = requesters.get(row.requester_id)
+        if request_type == 'document':
+            document_type = document_types.get(row.document_type_id)
+            doc_type_name = document_type.name if document_type else 'Unknown'
+            score = base_score('document', document_type_name=doc_type_name, purpose=row.purpose)
+            description = f"Document request: {doc_type_name}"
+            processed_at = row.processed_at
+        elif request_type == 'sos':
+            score = base_score('sos', emergency_type=row.emergency_type)
+            description = f"SOS Request: {row.emergency_type} - {row.description}"
+            processed_at = row.response_time
+        elif request_type == 'relocation':
+            from_barangay = barangays.get(row.from_barangay_id)
+            to_barangay = barangays.get(row.to_barangay_id)
+            score = base_score('relocation')
+            description = f"Relocation Request: {from_barangay.name if from_barangay else 'Unknown'} to {to_barangay.name if to_barangay else 'Unknown'}"
+            processed_at = row.to_barangay_approved_at or row.from_barangay_approved_at
+        else:
+            item = items.get(row.item_id)
+            score = base_score('item')
+            description = f"Item Request: {item.title if item else 'Unknown Item'}"
+            processed_at = row.approved_at
+
+        aged_score = score + age_bonus(row.created_at, now)
+        level = priority_level(aged_score)
+        entries.append({
+            'request_type': request_type,
+            'request_id': row.id,
+            'status': row.status,
+            'requester_id': row.requester_id,
+            'requester_barangay_id': requester.barangay_id if requester else None,
+            'requester_name': f"{requester.first_name} {requester.last_name}" if requester else 'Unknown',
+            'description': description,
+            'base_score': score,
+            'priority_score': aged_score,
+            'priority': level,
+            'priority_rank': PRIORITY_RANKS[level],
+            'created_at': row.created_at,
+            'processed_at': processed_at,
+            'updated_at': datetime.now(timezone.utc).replace(tzinfo=None)
+        })
+    return entries
+
+def parse_request_key(key):
+    """(request_type, request_id) from a typed key such as 'sos-7'; None if it is not one"""
+    request_type, _, request_id = key.rpartition('-')
+    if request_type not in QUEUE_TABLES or not request_id.isdigit():
+        return None
+    return request_type, int(request_id)
+
+def find_request(request_id, request_type=None):
+    """Registry entry for a request, in one indexed lookup.
+
+    Without a type, a bare id that exists in several tables resolves in
+    the order document, SOS, relocation, item, as the admin endpoints
+    always have.
+    """
+    from models.request_queue import RequestQueueEntry
+
+    query = RequestQueueEntry.query.filter(RequestQueueEntry.request_id == request_id)
+    if request_type is not None:
+        return query.filter(RequestQueueEntry.request_type == request_type).first()
+    order = db.case(
+        *((RequestQueueEntry.request_type == name, position) for position, name in enumerate(QUEUE_TABLES)),
+        else_=len(QUEUE_TABLES)
+    )
+    return query.order_by(order).first()
+
+def upsert_entries(connection, entries):
+    """Insert or update queue rows, matched on (request_type, request_id)"""
+    queue = _table('request_queue')
+    for entry in entries:
+        updated = connection.execute(
+            queue.update().where(
+                queue.c.request_type == entry['request_type'],
+                queue.c.request_id == entry['request_id']
+            ).values(**entry)
+        ).rowcount
+        if not updated:
+            connection.execute(queue.insert().values(**entry))
+
+def reproject(connection, request_type, *criteria):
+    """Recompute the queue rows of every request of one type matching criteria"""
+    table = _table(QUEUE_TABLES[request_type])
+    rows = connection.execute(db.select(table).where(*criteria)).fetchall()
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        upsert_entries(connection, build_entries(connection, request_type, rows[start:start + REBUILD_BATCH_SIZE]))
+    return len(rows)
+
+def rebuild():
+    """Recreate the whole queue from the request tables; returns the number of rows"""
+    queue = _table('request_queue')
+    total = 0
+    with db.engine.begin() as connection:
+        connection.execute(queue.delete())
+        for request_type, table_name in QUEUE_TABLES.items():
+            table = _table(table_name)
+            last_id = 0
+            while True:
+                rows = connection.execute(
+                    db.select(table).where(table.c.id > last_id).order_by(table.c.id).limit(REBUILD_BATCH_SIZE)
+                ).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                connection.execute(queue.insert(), build_entries(connection, request_type, rows))
+                total += len(rows)
+    return total
+
+def age_priorities(now=None):
+    """Add the age bonus to every queue row whose score is behind, in one set-based UPDATE"""
+    queue = _table('request_queue')
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+
+    bonus = db.case(
+        *((queue.c.created_at <= now - timedelta(days=days), points) for days, points in AGE_BONUSES),
+        else_=0
+    )
+    score = queue.c.base_score + bonus
+    level = db.case(*((score >= threshold, name) for threshold, name in PRIORITY_LEVELS), else_='low')
+    rank = db.case(*((score >= threshold, PRIORITY_RANKS[name]) for threshold, name in PRIORITY_LEVELS), else_=PRIORITY_RANKS['low'])
+
+    with db.engine.begin() as connection:
+        aged = connection.execute(
+            queue.update().where(queue.c.priority_score != score).values(
+                priority_score=score,
+                priority=level,
+                priority_rank=rank
+            )
+        ).rowcount
+    if aged:
+        print(f"⏳ Aged the priority of {aged} queued request(s)")
+    return {'aged': aged}
+
+scheduler.register('age_request_priorities', PRIORITY_AGING_SECONDS, age_priorities)
+
+def _name_changed(instance, *attributes):
+    attrs = db.inspect(instance).attrs
+    return any(getattr(attrs, attribute).history.has_changes() for attribute in attributes)
+
+@event.listens_for(Session, 'before_flush')
+def _collect_renames(session, flush_context, instances):
+    """Note renamed (or moved) users, document types and items; their queue rows are refreshed after the flush"""
+    renames = session.info.setdefault('request_queue_renames', [])
+    for instance in session.dirty:
+        table_name = getattr(instance, '__tablename__', None)
+        if table_name == 'users' and _name_changed(instance, 'first_name', 'last_name', 'barangay_id'):
+            renames.append(('users', instance.id))
+        elif table_name == 'document_types' and _name_changed(instance, 'name'):
+            renames.append(('document_types', instance.id))
+        elif table_name == 'items' and _name_changed(instance, 'title'):
+            renames.append(('items', instance.id))
+
+@event.listens_for(Session, 'after_flush')
+def _project_requests(session, flush_context):
+    """Keep request_queue in step with the request tables, inside the same transaction"""
+    written = {}
+    deleted = []
+    for instance in list(session.new) + list(session.dirty):
+        request_type = REQUEST_TYPES.get(getattr(instance, '__tablename__', None))
+        if request_type:
+            written.setdefault(request_type, []).append(instance)
+    for instance in session.deleted:
+        request_type = REQUEST_TYPES.get(getattr(instance, '__tablename__', None))
+        if request_type:
+            deleted.append((request_type, vars(instance).get('id')))
+    renames = session.info.pop('request_queue_renames', [])
+    if not (written or deleted or renames):
+        return
+
+    connection = session.connection()
+    queue = _table('request_queue')
+    for request_type, instances in written.items():
+        upsert_entries(connection, build_entries(connection, request_type, instances))
+    for request_type, request_id in deleted:
+        connection.execute(queue.delete().where(queue.c.request_type == request_type, queue.c.request_id == request_id))
+
+    for table_name, row_id in renames:
+        if table_name == 'users':
+            for request_type, request_table in QUEUE_TABLES.items():
+                reproject(connection, request_type, _table(request_table).c.requester_id == row_id)
+        elif table_name == 'document_types':
+            reproject(connection, 'document', _table('document_requests').c.document_type_id == row_id)
+        else:
+            reproject(connection, 'item', _table('item_requests').c.item_id == row_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_renames(session):
+    session.info.pop('request_queue_renames', None)
@@ -0,0 +1,126 @@
+"""
+Response cache with conditional GET support for public reference endpoints
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from flask import request, make_response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+MAX_ENTRIES = 256
+
+# Changes with every process start, so ETags never outlive a deploy
+_BOOT_ID = os.urandom(4).hex()
+
+class ResponseCache:
+    """Per-process cache of rendered JSON responses.
+
+    Every cached response depends on a set of tables. Each table has a
+    version counter that is bumped whenever a committed ORM flush touched it
+    (see the session hooks at the bottom of this module) or when
+    invalidate_tables() is called explicitly, e.g. after Core bulk writes.
+    A cached response is served while its table versions are unchanged and
+    its TTL has not expired; the ETag is derived from those versions plus a
+    digest of the body, so clients can revalidate with If-None-Match and get
+    a 304 with no body.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._entries = OrderedDict()
+
+    def table_version(self, table):
+        return self._versions.get(table, 0)
+
+    def invalidate_tables(self, *tables):
+        """Bump the version of each table, invalidating every response built from it"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key, versions):
+        entry = self._entries.get(key)
+        if entry is None or entry['versions'] != versions or entry['expires_at'] <= time.monotonic():
+            return None
+        return entry
+
+    def put(self, key, versions, ttl, body, mimetype):
+        digest = hashlib.sha1(body).hexdigest()[:16]
+        entry = {
+            'versions': versions,
+            'expires_at': time.monotonic() + ttl,
+            'body': body,
+            'mimetype': mimetype,
+            'etag': f"{_BOOT_ID}-{'.'.join(str(version) for version in versions)}-{digest}",
+            'last_modified': datetime.now(timezone.utc)
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > MAX_ENTRIES:
+                self._entries.popitem(last=False)
+        return entry
+
+    def respond(self, entry):
+        """Build a (possibly 304) response for a cache entry"""
+        response = make_response(entry['body'], 200)
+        response.mimetype = entry['mimetype']
+        response.set_etag(entry['etag'])
+        response.last_modified = entry['last_modified']
+        # Clients may keep a copy but must revalidate it; revalidation is a cheap 304
+        response.cache_control.public = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def cached(self, ttl, tables):
+        """Decorator caching a GET view's 200 responses for up to ttl seconds"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method != 'GET':
+                    return view(*args, **kwargs)
+
+                key = request.full_path
+                versions = tuple(self.table_version(table) for table in tables)
+                entry = self.get(key, versions)
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    entry = self.put(key, versions, ttl, response.get_data(), response.mimetype)
+                return self.respond(entry)
+            return wrapper
+        return decorator
+
+# Global response cache instance
+response_cache = ResponseCache()
+cached_response = response_cache.cached
+
+@event.listens_for(Session, 'after_flush')
+def _collect_written_tables(session, flush_context):
+    tables = session.info.setdefault('response_cache_tables', set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(instance, '__tablename__', None)
+        if table:
+            tables.add(table)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_written_tables(session):
+    tables = session.info.pop('response_cache_tables', None)
+    if tables:
+        response_cache.invalidate_tables(*tables)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_written_tables(session):
+    session.info.pop('response_cache_tables', None)
@@ -0,0 +1,126 @@
+"""
+Periodic maintenance tasks run in the background of every process
+"""
+
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+
+class Scheduler:
+    """Runs registered tasks every N seconds on one background thread.
+
+    Every web and worker process starts the scheduler, so each task runs
+    while holding a lease row named 'schedule:<task>' (see models/lease.py):
+    when several processes find the same task due, one of them runs it and
+    the rest skip that round. A task with an interval of 0 is disabled.
+    """
+
+    def __init__(self):
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def register(self, name, interval_seconds, func, lease_seconds=600):
+        """Run func() every interval_seconds; its return value is kept as the task's last result"""
+        with self._lock:
+            self._tasks[name] = {
+                'func': func,
+                'interval_seconds': interval_seconds,
+                'lease_seconds': lease_seconds,
+                'next_run': time.monotonic() + interval_seconds,
+                'runs': 0,
+                'skipped_runs': 0,
+                'last_run_at': None,
+                'last_result': None,
+                'last_error': None
+            }
+
+    def every(self, name, interval_seconds, lease_seconds=600):
+        """Decorator form of register()"""
+        def decorator(func):
+            self.register(name, interval_seconds, func, lease_seconds)
+            return func
+        return decorator
+
+    def status(self):
+        """{task name: schedule and last outcome} for this process"""
+        with self._lock:
+            return {
+                name: {key: value for key, value in task.items() if key not in ('func', 'next_run')}
+                for name, task in self._tasks.items()
+            }
+
+    def run(self, name):
+        """Run one task now if its lease is free; returns (ran, result)"""
+        from models.lease import Lease
+
+        task = self._tasks[name]
+        lease_name = f"schedule:{name}"
+        if not Lease.acquire(lease_name, self.holder, task['lease_seconds']):
+            task['skipped_runs'] += 1
+            return False, None
+
+        task['last_run_at'] = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        try:
+            result = task['func']()
+            task['runs'] += 1
+            task['last_result'] = result
+            task['last_error'] = None
+            return True, result
+        except Exception as e:
+            task['last_error'] = str(e)
+            print(f"❌ Scheduled task {name} failed: {str(e)}")
+            traceback.print_exc()
+            return True, None
+        finally:
+            try:
+                Lease.release(lease_name, self.holder)
+            except Exception:
+                from database import db
+                db.session.rollback()
+
+    def _loop(self, app):
+        while not self._stopping.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [name for name, task in self._tasks.items() if task['interval_seconds'] > 0 and task['next_run'] <= now]
+                for name in due:
+                    self._tasks[name]['next_run'] = now + self._tasks[name]['interval_seconds']
+                upcoming = [task['next_run'] for task in self._tasks.values() if task['interval_seconds'] > 0]
+
+            for name in due:
+                if self._stopping.is_set():
+                    break
+                try:
+                    # A fresh app context per task gives every run a fresh session
+                    with app.app_context():
+                        self.run(name)
+                except Exception as e:
+                    print(f"❌ Scheduler error in {name}: {str(e)}")
+
+            wait = min(upcoming) - time.monotonic() if upcoming else 60
+            self._stopping.wait(min(max(wait, 1), 60))
+
+    def start(self, app):
+        """Start the scheduler thread; returns the names of the enabled tasks"""
+        enabled = [name for name, task in self._tasks.items() if task['interval_seconds'] > 0]
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, args=(app,), name='scheduler', daemon=True)
+            self._thread.start()
+        return enabled
+
+    def stop(self, timeout=None):
+        """Stop the scheduler thread after its current task"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self._stopping.clear()
+
+# Global scheduler instance
+scheduler = Scheduler()
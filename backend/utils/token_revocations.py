@@ -0,0 +1,137 @@
+"""
+Revocation check for JWTs, answered in process for tokens that were never revoked
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from database import db
+from utils.response_cache import response_cache
+from utils.scheduler import scheduler
+
+class BloomFilter:
+    """Fixed-size set of strings that can answer 'definitely not in the set'.
+
+    Sized for `capacity` items at the given false-positive rate; the
+    positions of an item come from slices of one blake2b digest.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=8 * self.hashes).digest()
+        for index in range(self.hashes):
+            yield int.from_bytes(digest[index * 8:(index + 1) * 8], 'little') % self.size
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class TokenRevocations:
+    """Answers check_if_token_revoked without a query for tokens nobody revoked.
+
+    Every unexpired jti in jwt_blacklist goes into a bloom filter. A jti the
+    filter has never seen is not revoked, and that is the answer for almost
+    every request. The few filter hits are confirmed against the table and
+    the answer is kept in a small LRU. The filter is rebuilt when the
+    revocation version changes: at once when this process commits a
+    revocation, and within JWT_REVOCATION_CHECK_SECONDS when another process
+    does. That version is the table's highest id, which only grows.
+    """
+
+    def __init__(self):
+        self.check_seconds = int(os.getenv('JWT_REVOCATION_CHECK_SECONDS', '5'))
+        self.lru_size = int(os.getenv('JWT_REVOCATION_LRU_SIZE', '10000'))
+        self.prune_seconds = int(os.getenv('JWT_PRUNE_SECONDS', '3600'))
+        self._lock = threading.Lock()
+        self._filter = None
+        self._version = None
+        self._local_version = None
+        self._checked_at = None
+        self._answers = OrderedDict()  # jti -> revoked?
+        self._stats = {'filter_misses': 0, 'cache_hits': 0, 'lookups': 0, 'reloads': 0}
+
+    def _current_version(self):
+        from models.jwt_blacklist import JWTBlacklist
+
+        return db.session.query(db.func.max(JWTBlacklist.id)).scalar() or 0
+
+    def _reload(self, version):
+        from models.jwt_blacklist import JWTBlacklist
+
+        jtis = JWTBlacklist.get_active_jtis()
+        # Headroom so revocations made before the next rebuild stay near the target error rate
+        bloom = BloomFilter(max(len(jtis) * 2, 1024))
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        self._version = version
+        self._answers.clear()
+        self._stats['reloads'] += 1
+
+    def _refresh(self):
+        local_version = response_cache.table_version('jwt_blacklist')
+        now = time.monotonic()
+        if self._filter is not None and local_version == self._local_version and now - self._checked_at < self.check_seconds:
+            return
+        with self._lock:
+            version = self._current_version()
+            if self._filter is None or version != self._version:
+                self._reload(version)
+            self._local_version = local_version
+            self._checked_at = now
+
+    def is_revoked(self, jti):
+        """True if the token with this jti was revoked"""
+        from models.jwt_blacklist import JWTBlacklist
+
+        self._refresh()
+        if jti not in self._filter:
+            self._stats['filter_misses'] += 1
+            return False
+
+        with self._lock:
+            if jti in self._answers:
+                self._answers.move_to_end(jti)
+                self._stats['cache_hits'] += 1
+                return self._answers[jti]
+
+        revoked = JWTBlacklist.is_blacklisted(jti)
+        with self._lock:
+            self._stats['lookups'] += 1
+            self._answers[jti] = revoked
+            while len(self._answers) > self.lru_size:
+                self._answers.popitem(last=False)
+        return revoked
+
+    def stats(self):
+        """Counters for this process since it started"""
+        with self._lock:
+            return dict(self._stats, version=self._version)
+
+    def prune(self):
+        """Delete revocations of tokens that have expired anyway"""
+        from models.jwt_blacklist import JWTBlacklist
+
+        pruned = JWTBlacklist.query.filter(
+            JWTBlacklist.expires_at < datetime.now(timezone.utc).replace(tzinfo=None)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        if pruned:
+            print(f"🧹 Pruned {pruned} expired token revocation(s)")
+        return {'pruned': pruned}
+
+# Global token revocation instance
+token_revocations = TokenRevocations()
+scheduler.register('prune_revoked_tokens', token_revocations.prune_seconds, token_revocations.prune)
@@ -0,0 +1,38 @@
+"""
+Batched loading for the admin resident and user listings
+"""
+
+from sqlalchemy.orm import selectinload
+from models.user import User
+from utils.location_tree import location_tree, address_names
+
+def paginate_users(query, page, per_page):
+    """Paginate a User query with every row's resident profile loaded in one extra query"""
+    return query.options(selectinload(User.resident_profile)).paginate(
+        page=page,
+        per_page=per_page,
+        error_out=False
+    )
+
+def serialize_users(users):
+    """User dicts with their profile and address names, without a query per row.
+
+    Profiles come from the selectinload in paginate_users and address
+    names from one batch ancestry lookup in the in-memory location tree,
+    so a page costs the same number of queries whatever its size.
+    """
+    deepest = {user.id: user.barangay_id or user.municipality_id or user.province_id for user in users}
+    ancestries = location_tree.get_ancestries(location_id for location_id in deepest.values() if location_id)
+
+    users_data = []
+    for user in users:
+        user_data = user.to_dict()
+        user_data['profile'] = user.resident_profile.to_dict() if user.resident_profile else None
+
+        # Add location relationship data for address construction
+        names = address_names(ancestries.get(deepest[user.id], []))
+        for part in ('province', 'municipality', 'barangay'):
+            user_data[part] = {'name': names[part]} if part in names else None
+
+        users_data.append(user_data)
+    return users_data
@@ -0,0 +1,124 @@
+"""
+Result cache for the public document verification endpoint
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+class VerificationCache:
+    """Per-process cache of verification responses keyed by verification code.
+
+    Found documents are cached for VERIFY_CACHE_TTL seconds, but never past
+    the moment the document expires, so a cached 200 cannot outlive the
+    document's validity. Unknown codes go to a separate, smaller LRU for
+    VERIFY_NEGATIVE_TTL seconds, so a flood of bogus codes is answered
+    without the database and cannot push valid documents out of the cache.
+    Entries are evicted when a committed ORM flush touches their document
+    request (see the session hooks at the bottom of this module).
+    """
+
+    def __init__(self):
+        self.ttl = int(os.getenv('VERIFY_CACHE_TTL', '300'))
+        self.negative_ttl = int(os.getenv('VERIFY_NEGATIVE_TTL', '60'))
+        self.max_entries = int(os.getenv('VERIFY_CACHE_SIZE', '10000'))
+        self.max_misses = int(os.getenv('VERIFY_NEGATIVE_CACHE_SIZE', '50000'))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # code -> (expires, request_id, status_code, body)
+        self._misses = OrderedDict()  # code -> expires
+        self._codes_by_request = {}
+
+    def get(self, code):
+        """Cached (status_code, body) for a code, or None"""
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(code)
+                return None
+            self._entries.move_to_end(code)
+            return entry[2], entry[3]
+
+    def is_missing(self, code):
+        """True if a recent lookup found no document with this code"""
+        with self._lock:
+            expires = self._misses.get(code)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._misses[code]
+                return False
+            return True
+
+    def put(self, code, request_id, status_code, body, valid_for=None):
+        """Cache a found document's response; valid_for caps the TTL (seconds until expiry)"""
+        ttl = self.ttl if valid_for is None else min(self.ttl, valid_for)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._remove(code)
+            self._entries[code] = (time.monotonic() + ttl, request_id, status_code, body)
+            self._codes_by_request[request_id] = code
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def put_missing(self, code):
+        """Remember that no document has this code"""
+        with self._lock:
+            self._misses[code] = time.monotonic() + self.negative_ttl
+            self._misses.move_to_end(code)
+            while len(self._misses) > self.max_misses:
+                self._misses.popitem(last=False)
+
+    def _remove(self, code):
+        entry = self._entries.pop(code, None)
+        if entry is not None and self._codes_by_request.get(entry[1]) == code:
+            del self._codes_by_request[entry[1]]
+
+    def evict(self, request_ids=(), codes=()):
+        """Drop cached results for these document requests and misses for these codes"""
+        with self._lock:
+            for request_id in request_ids:
+                code = self._codes_by_request.get(request_id)
+                if code is not None:
+                    self._remove(code)
+            for code in codes:
+                self._misses.pop(code, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._misses.clear()
+            self._codes_by_request.clear()
+
+# Global verification cache instance
+verification_cache = VerificationCache()
+
+@event.listens_for(Session, 'after_flush')
+def _collect_written_requests(session, flush_context):
+    request_ids = session.info.setdefault('verification_request_ids', set())
+    codes = session.info.setdefault('verification_codes', set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if getattr(instance, '__tablename__', None) == 'document_requests':
+            # Read loaded state only; a deleted row cannot be refreshed
+            state = vars(instance)
+            if state.get('id') is not None:
+                request_ids.add(state['id'])
+            if state.get('verification_code'):
+                codes.add(state['verification_code'])
+
+@event.listens_for(Session, 'after_commit')
+def _evict_written_requests(session):
+    request_ids = session.info.pop('verification_request_ids', None)
+    codes = session.info.pop('verification_codes', None)
+    if request_ids or codes:
+        verification_cache.evict(request_ids or (), codes or ())
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_written_requests(session):
+    session.info.pop('verification_request_ids', None)
+    session.info.pop('verification_codes', None)
@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useState, useEffect, ReactNode } from 'react'
-import { api } from '../services/api'
+import { api, authAPI } from '../services/api'
 import toast from 'react-hot-toast'
 
 interface User {
@@ -120,7 +120,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
         email: emailOrUsername,
         password 
       })
-      const { access_token, user: userData, barangay: barangayData } = response.data
+      const { access_token, refresh_token, user: userData, barangay: barangayData } = response.data
       
       console.log('Login response:', { userData, barangayData })
       console.log('User role:', userData.role)
@@ -141,6 +141,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
       setUser(userData)
       setBarangay(barangayData)
       localStorage.setItem('token', access_token)
+      localStorage.setItem('refresh_token', refresh_token)
       
       toast.success('Login successful!')
     } catch (error: any) {
@@ -178,10 +179,13 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   }
 
   const logout = () => {
+    // Revoke both tokens server-side; the local session ends either way
+    authAPI.logout().catch(() => {})
     setUser(null)
     setBarangay(null)
     setToken(null)
     localStorage.removeItem('token')
+    localStorage.removeItem('refresh_token')
     toast.success('Logged out successfully')
   }
 
@@ -0,0 +1,87 @@
+import { useRef, useState } from 'react'
+
+interface CursorPageResponse<T> {
+  data: {
+    success: boolean
+    data?: T[]
+    pagination?: { next_cursor: string | null }
+    message?: string
+    error?: string
+  }
+}
+
+type Filters = Record<string, string | number | undefined>
+
+// A cursor-paged listing: reload() fetches the first page for a set of filters,
+// loadMore() appends the page after the last one loaded
+export const useCursorList = <T>(
+  fetchPage: (params: Filters) => Promise<CursorPageResponse<T>>,
+  pageSize = 50
+) => {
+  const [items, setItems] = useState<T[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoading, setIsLoading] = useState(true) // Callers reload() on mount
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
+  const [error, setError] = useState<string | null>(null)
+  const filtersRef = useRef<Filters>({})
+  const generationRef = useRef(0) // Pages requested before the latest reload are dropped
+
+  const fetchInto = async (cursor: string | null) => {
+    const generation = generationRef.current
+    const params: Filters = { limit: pageSize }
+    Object.entries(filtersRef.current).forEach(([key, value]) => {
+      // 'all' and empty selects mean no filter
+      if (value !== undefined && value !== '' && value !== 'all') params[key] = value
+    })
+    if (cursor) params.cursor = cursor
+
+    const response = await fetchPage(params)
+    if (generation !== generationRef.current) return
+    if (!response.data.success) {
+      setError(response.data.message || response.data.error || 'Failed to load requests')
+      return
+    }
+    const page = response.data.data || []
+    setItems(prev => (cursor ? [...prev, ...page] : page))
+    setNextCursor(response.data.pagination?.next_cursor ?? null)
+  }
+
+  const reload = async (filters: Filters = filtersRef.current) => {
+    filtersRef.current = filters
+    generationRef.current += 1
+    setIsLoading(true)
+    setError(null)
+    try {
+      await fetchInto(null)
+    } catch (err: any) {
+      setError(err.response?.data?.message || err.response?.data?.error || 'Failed to load requests')
+      setItems([])
+      setNextCursor(null)
+    } finally {
+      setIsLoading(false)
+    }
+  }
+
+  const loadMore = async () => {
+    if (!nextCursor || isLoadingMore) return
+    setIsLoadingMore(true)
+    try {
+      await fetchInto(nextCursor)
+    } catch (err: any) {
+      setError(err.response?.data?.message || err.response?.data?.error || 'Failed to load more requests')
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
+
+  return {
+    items,
+    hasMore: nextCursor !== null,
+    isLoading,
+    isLoadingMore,
+    error,
+    setError,
+    reload,
+    loadMore
+  }
+}
@@ -42,17 +42,16 @@ export const AdminManagement: React.FC = () => {
       const usersResponse = await adminAPI.getAllUsers({ page: 1, per_page: 1000 })
       const allUsers = usersResponse.data.success ? usersResponse.data.data || [] : []
       
-      // Fetch pending requests
-      const requestsResponse = await adminAPI.getAllRequests({ page: 1, per_page: 1000 })
-      const allRequests = requestsResponse.data.success ? requestsResponse.data.data || [] : []
+      // The request queue is paged (200 rows at most), so only its total is read
+      const pendingResponse = await adminAPI.getAllRequests({ status: 'pending', per_page: 1 })
       
       // Calculate stats from real data
       const totalUsers = allUsers.length
       const totalResidents = allUsers.filter((user: any) => user.role === 'resident').length
       const totalAdmins = allUsers.filter((user: any) => user.role === 'admin').length
       const pendingVerifications = dashboardData.pending_residents || 0
-      const activeSOS = allRequests.filter((req: any) => req.type === 'sos' && req.status === 'active').length
-      const pendingRequests = allRequests.filter((req: any) => req.status === 'pending').length
+      const activeSOS = dashboardData.active_sos || 0
+      const pendingRequests = pendingResponse.data.success ? pendingResponse.data.total || 0 : 0
       
       const realStats: SystemStats = {
         totalUsers,
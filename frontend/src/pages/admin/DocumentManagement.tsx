@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { api, documentsAPI, adminAPI } from '../../services/api';
 import toast from 'react-hot-toast';
+import { useCursorList } from '../../hooks/useCursorList';
 import { StepForm } from '../../components/common/StepForm';
 import { 
   BasicInfoStep, 
@@ -43,8 +44,15 @@ interface DocumentRequest {
 
 const DocumentManagement: React.FC = () => {
   const [documentTypes, setDocumentTypes] = useState<DocumentType[]>([]);
-  const [requests, setRequests] = useState<DocumentRequest[]>([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    items: requests,
+    hasMore,
+    isLoading: loading,
+    isLoadingMore,
+    reload,
+    loadMore
+  } = useCursorList<DocumentRequest>(documentsAPI.getAllDocumentRequests);
+  const [requestFilters, setRequestFilters] = useState({ status: 'all', document_type_id: '', date_from: '', date_to: '' });
   const [activeTab, setActiveTab] = useState<'types' | 'requests'>('requests');
   const [showTypeForm, setShowTypeForm] = useState(false);
   const [editingType, setEditingType] = useState<DocumentType | null>(null);
@@ -84,9 +92,13 @@ const DocumentManagement: React.FC = () => {
 
   useEffect(() => {
     fetchDocumentTypes();
-    fetchRequests();
   }, []);
 
+  // Filters are applied by the server; changing one starts again from the first page
+  useEffect(() => {
+    fetchRequests();
+  }, [requestFilters]);
+
   const fetchDocumentTypes = async () => {
     try {
       const response = await api.get('/documents/types');
@@ -98,18 +110,7 @@ const DocumentManagement: React.FC = () => {
     }
   };
 
-  const fetchRequests = async () => {
-    try {
-      const response = await api.get('/documents/requests');
-      if (response.data.success) {
-        setRequests(response.data.data);
-      }
-    } catch (error) {
-      console.error('Error fetching requests:', error);
-    } finally {
-      setLoading(false);
-    }
-  };
+  const fetchRequests = () => reload(requestFilters);
 
   // Helper function to parse requirements
   const parseRequirements = (requirements: string) => {
@@ -414,7 +415,7 @@ const DocumentManagement: React.FC = () => {
 
   const getUploadedFiles = async (requestId: number) => {
     try {
-      const response = await adminAPI.getRequestDetails(requestId);
+      const response = await adminAPI.getRequestDetails(`document-${requestId}`);
       return response.data.uploaded_files || [];
     } catch (error) {
       console.error('Error fetching uploaded files:', error);
@@ -422,7 +423,7 @@ const DocumentManagement: React.FC = () => {
     }
   };
 
-  if (loading) {
+  if (loading && requests.length === 0) {
     return (
       <div className="flex justify-center items-center h-64">
         <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-blue-600"></div>
@@ -616,6 +617,42 @@ const DocumentManagement: React.FC = () => {
         <div className="bg-white rounded-lg shadow">
           <div className="p-6">
             <h2 className="text-lg font-semibold text-gray-900 mb-4">Document Requests</h2>
+            <div className="grid grid-cols-1 md:grid-cols-4 gap-4 mb-4">
+              <select
+                value={requestFilters.status}
+                onChange={(e) => setRequestFilters({ ...requestFilters, status: e.target.value })}
+                className="px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+              >
+                <option value="all">All Status</option>
+                <option value="pending">Pending</option>
+                <option value="approved">Approved</option>
+                <option value="rejected">Rejected</option>
+                <option value="ready">Ready</option>
+                <option value="completed">Completed</option>
+              </select>
+              <select
+                value={requestFilters.document_type_id}
+                onChange={(e) => setRequestFilters({ ...requestFilters, document_type_id: e.target.value })}
+                className="px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+              >
+                <option value="">All Document Types</option>
+                {documentTypes.map((type) => (
+                  <option key={type.id} value={type.id}>{type.name}</option>
+                ))}
+              </select>
+              <input
+                type="date"
+                value={requestFilters.date_from}
+                onChange={(e) => setRequestFilters({ ...requestFilters, date_from: e.target.value })}
+                className="px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+              />
+              <input
+                type="date"
+                value={requestFilters.date_to}
+                onChange={(e) => setRequestFilters({ ...requestFilters, date_to: e.target.value })}
+                className="px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+              />
+            </div>
             {requests.length === 0 ? (
               <p className="text-gray-500 text-center py-8">No document requests found.</p>
             ) : (
@@ -774,6 +811,17 @@ const DocumentManagement: React.FC = () => {
                     </div>
                   );
                 })}
+                {hasMore && (
+                  <div className="text-center">
+                    <button
+                      onClick={loadMore}
+                      disabled={isLoadingMore}
+                      className="px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50"
+                    >
+                      {isLoadingMore ? 'Loading...' : 'Load more'}
+                    </button>
+                  </div>
+                )}
               </div>
             )}
           </div>
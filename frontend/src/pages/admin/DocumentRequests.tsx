@@ -1,7 +1,8 @@
 import React, { useState, useEffect } from 'react'
 import { useAuth } from '../../contexts/AuthContext'
 import { Avatar } from '../../components/Avatar'
-import { api } from '../../services/api'
+import { api, documentsAPI } from '../../services/api'
+import { useCursorList } from '../../hooks/useCursorList'
 
 interface DocumentRequest {
   id: number
@@ -18,12 +19,22 @@ interface DocumentRequest {
 
 export const AdminDocumentRequests: React.FC = () => {
   const { } = useAuth()
-  const [requests, setRequests] = useState<DocumentRequest[]>([])
-  const [loading, setLoading] = useState(true)
-  const [error, setError] = useState<string | null>(null)
+  const {
+    items: requests,
+    hasMore,
+    isLoading: loading,
+    isLoadingMore,
+    error,
+    setError,
+    reload,
+    loadMore
+  } = useCursorList<DocumentRequest>(documentsAPI.getAllDocumentRequests)
+  const [stats, setStats] = useState<{ total: number; by_status: Record<string, number> }>({ total: 0, by_status: {} })
   const [selectedRequest, setSelectedRequest] = useState<DocumentRequest | null>(null)
   const [showModal, setShowModal] = useState(false)
   const [filterStatus, setFilterStatus] = useState('all')
+  const [dateFrom, setDateFrom] = useState('')
+  const [dateTo, setDateTo] = useState('')
 
   const [responseForm, setResponseForm] = useState({
     status: 'approved',
@@ -31,24 +42,25 @@ export const AdminDocumentRequests: React.FC = () => {
   })
 
   useEffect(() => {
-    fetchRequests()
+    fetchStats()
   }, [])
 
-  const fetchRequests = async () => {
+  // Filters are applied by the server; changing one starts again from the first page
+  useEffect(() => {
+    fetchRequests()
+  }, [filterStatus, dateFrom, dateTo])
+
+  const fetchRequests = () =>
+    reload({ status: filterStatus, date_from: dateFrom, date_to: dateTo })
+
+  const fetchStats = async () => {
     try {
-      setLoading(true)
-      setError(null)
-      
-      const response = await api.get('/documents/requests')
+      const response = await documentsAPI.getDocumentRequestStats()
       if (response.data.success) {
-        setRequests(response.data.data || [])
-      } else {
-        setError(response.data.error || 'Failed to fetch document requests')
+        setStats(response.data.data)
       }
-    } catch (err: any) {
-      setError(err.response?.data?.error || 'Failed to fetch document requests')
-    } finally {
-      setLoading(false)
+    } catch (err) {
+      console.error('Failed to load request counts:', err)
     }
   }
 
@@ -77,6 +89,7 @@ export const AdminDocumentRequests: React.FC = () => {
         setSelectedRequest(null)
         setResponseForm({ status: 'approved', notes: '' })
         fetchRequests()
+        fetchStats()
       } else {
         setError(response.data.error || 'Failed to update request')
       }
@@ -85,10 +98,6 @@ export const AdminDocumentRequests: React.FC = () => {
     }
   }
 
-  const filteredRequests = requests.filter(request => 
-    filterStatus === 'all' || request.status === filterStatus
-  )
-
   const getStatusColor = (status: string) => {
     switch (status) {
       case 'pending': return 'bg-yellow-100 text-yellow-800'
@@ -110,7 +119,7 @@ export const AdminDocumentRequests: React.FC = () => {
     })
   }
 
-  if (loading) {
+  if (loading && requests.length === 0) {
     return (
       <div className="min-h-screen bg-gray-50 py-8">
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
@@ -155,7 +164,7 @@ export const AdminDocumentRequests: React.FC = () => {
               </div>
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Total Requests</p>
-                <p className="text-2xl font-semibold text-gray-900">{requests.length}</p>
+                <p className="text-2xl font-semibold text-gray-900">{stats.total}</p>
               </div>
             </div>
           </div>
@@ -170,7 +179,7 @@ export const AdminDocumentRequests: React.FC = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Pending</p>
                 <p className="text-2xl font-semibold text-gray-900">
-                  {requests.filter(r => r.status === 'pending').length}
+                  {stats.by_status.pending || 0}
                 </p>
               </div>
             </div>
@@ -186,7 +195,7 @@ export const AdminDocumentRequests: React.FC = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Approved</p>
                 <p className="text-2xl font-semibold text-gray-900">
-                  {requests.filter(r => r.status === 'approved').length}
+                  {stats.by_status.approved || 0}
                 </p>
               </div>
             </div>
@@ -202,7 +211,7 @@ export const AdminDocumentRequests: React.FC = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Rejected</p>
                 <p className="text-2xl font-semibold text-gray-900">
-                  {requests.filter(r => r.status === 'rejected').length}
+                  {stats.by_status.rejected || 0}
                 </p>
               </div>
             </div>
@@ -227,6 +236,26 @@ export const AdminDocumentRequests: React.FC = () => {
                 <option value="completed">Completed</option>
               </select>
             </div>
+            <div className="flex items-end space-x-3">
+              <div>
+                <label className="block text-sm font-medium text-gray-700 mb-2">From</label>
+                <input
+                  type="date"
+                  value={dateFrom}
+                  onChange={(e) => setDateFrom(e.target.value)}
+                  className="px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+                />
+              </div>
+              <div>
+                <label className="block text-sm font-medium text-gray-700 mb-2">To</label>
+                <input
+                  type="date"
+                  value={dateTo}
+                  onChange={(e) => setDateTo(e.target.value)}
+                  className="px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+                />
+              </div>
+            </div>
             <button
               onClick={() => window.location.href = '/admin/document-management'}
               className="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md text-white bg-blue-600 hover:bg-blue-700"
@@ -240,7 +269,7 @@ export const AdminDocumentRequests: React.FC = () => {
         </div>
 
         {/* Requests List */}
-        {filteredRequests.length === 0 ? (
+        {requests.length === 0 ? (
           <div className="bg-white rounded-lg shadow-sm border border-gray-200 p-8 text-center">
             <svg className="mx-auto h-12 w-12 text-gray-400" fill="none" viewBox="0 0 24 24" stroke="currentColor">
               <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
@@ -255,7 +284,7 @@ export const AdminDocumentRequests: React.FC = () => {
           </div>
         ) : (
           <div className="space-y-4">
-            {filteredRequests.map(request => (
+            {requests.map(request => (
               <div key={request.id} className="bg-white rounded-lg shadow-sm border border-gray-200 p-6">
                 <div className="flex items-start justify-between mb-4">
                   <div className="flex items-start space-x-3">
@@ -317,6 +346,17 @@ export const AdminDocumentRequests: React.FC = () => {
                 )}
               </div>
             ))}
+            {hasMore && (
+              <div className="text-center">
+                <button
+                  onClick={loadMore}
+                  disabled={isLoadingMore}
+                  className="px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50"
+                >
+                  {isLoadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
           </div>
         )}
 
@@ -5,6 +5,7 @@ import { RequestActionForm, RequestActionFormData } from '../../components/forms
 
 interface Request {
   id: number
+  key: string  // Typed id ('document-42', 'sos-7'); ids alone repeat across request types
   type: string
   requester_name: string
   status: string
@@ -86,10 +87,10 @@ export const RequestManagement: React.FC = () => {
     }
   }
 
-  const fetchRequestDetails = async (requestId: number) => {
+  const fetchRequestDetails = async (request: Request) => {
     try {
       setLoadingDetails(true)
-      const response = await adminAPI.getRequestDetails(requestId)
+      const response = await adminAPI.getRequestDetails(request.key)
       
       if (response.data.success) {
         setRequestDetails(response.data.data)
@@ -98,7 +99,7 @@ export const RequestManagement: React.FC = () => {
         // Load requirement files for document requests
         if (response.data.data.type === 'document') {
           try {
-            const filesResponse = await adminAPI.getDocumentRequestFiles(requestId)
+            const filesResponse = await adminAPI.getDocumentRequestFiles(request.id)
             if (filesResponse.data.success) {
               setRequirementFiles(filesResponse.data.data || [])
             }
@@ -446,7 +447,7 @@ export const RequestManagement: React.FC = () => {
         ) : (
           <div className="space-y-4">
             {filteredRequests.map(request => (
-              <div key={request.id} className="bg-white rounded-lg shadow-sm border border-gray-200 p-6">
+              <div key={request.key} className="bg-white rounded-lg shadow-sm border border-gray-200 p-6">
                 <div className="flex items-start justify-between mb-4">
                   <div>
                     <h3 className="text-lg font-semibold text-gray-900">
@@ -494,7 +495,7 @@ export const RequestManagement: React.FC = () => {
                     onClick={() => {
                       setSelectedRequest(request)
                       setShowModal(true)
-                      fetchRequestDetails(request.id)
+                      fetchRequestDetails(request)
                     }}
                     className="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md text-white bg-blue-600 hover:bg-blue-700"
                   >
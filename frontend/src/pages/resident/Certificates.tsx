@@ -3,6 +3,7 @@ import { documentsAPI } from '../../services/api'
 import { X, FileText } from 'lucide-react'
 import { RequirementsDisplay } from '../../components/common/RequirementsDisplay'
 import { FileUpload } from '../../components/common/FileUpload'
+import { useCursorList } from '../../hooks/useCursorList'
 
 interface DocumentType {
   id: number
@@ -29,8 +30,16 @@ interface DocumentRequest {
 
 export const Certificates: React.FC = () => {
   const [documentTypes, setDocumentTypes] = useState<DocumentType[]>([])
-  const [myRequests, setMyRequests] = useState<DocumentRequest[]>([])
-  const [loading, setLoading] = useState(true)
+  const {
+    items: myRequests,
+    hasMore,
+    isLoading: loading,
+    isLoadingMore,
+    error: requestsError,
+    reload,
+    loadMore
+  } = useCursorList<DocumentRequest>(documentsAPI.getMyDocumentRequests)
+  const [totalRequests, setTotalRequests] = useState(0)
   const [error, setError] = useState<string | null>(null)
   const [activeTab, setActiveTab] = useState<'available' | 'my-requests'>('available')
   
@@ -63,17 +72,16 @@ export const Certificates: React.FC = () => {
     }
   }
 
+  // First page only; older requests are loaded on demand
   const fetchMyRequests = async () => {
+    reload()
     try {
-      const response = await documentsAPI.getMyDocumentRequests()
-      // API returns {success: true, data: [...]}
-      setMyRequests(response.data.data || [])
-    } catch (err: any) {
-      console.error('Error fetching my requests:', err)
-      setError(err.response?.data?.message || 'Failed to fetch requests')
-      setMyRequests([]) // Ensure it's always an array
-    } finally {
-      setLoading(false)
+      const response = await documentsAPI.getDocumentRequestStats()
+      if (response.data.success) {
+        setTotalRequests(response.data.data.total)
+      }
+    } catch (err) {
+      console.error('Error fetching request count:', err)
     }
   }
 
@@ -152,7 +160,7 @@ export const Certificates: React.FC = () => {
     }
   }
 
-  if (loading) {
+  if (loading && myRequests.length === 0) {
     return (
       <div className="animate-pulse">
         <div className="h-8 bg-gray-200 rounded w-1/4 mb-8"></div>
@@ -175,9 +183,9 @@ export const Certificates: React.FC = () => {
         <p className="text-gray-600">Request official documents and certificates from the barangay.</p>
       </div>
 
-        {error && (
+        {(error || requestsError) && (
           <div className="mb-6 bg-red-50 border border-red-200 rounded-lg p-4">
-            <p className="text-red-800">{error}</p>
+            <p className="text-red-800">{error || requestsError}</p>
           </div>
         )}
 
@@ -202,7 +210,7 @@ export const Certificates: React.FC = () => {
                   : 'border-transparent text-gray-500 hover:text-gray-700 hover:border-gray-300'
               }`}
             >
-              My Requests ({Array.isArray(myRequests) ? myRequests.length : 0})
+              My Requests ({totalRequests})
             </button>
           </nav>
         </div>
@@ -359,6 +367,17 @@ export const Certificates: React.FC = () => {
                     )}
                   </div>
                 ))}
+                {hasMore && (
+                  <div className="text-center">
+                    <button
+                      onClick={loadMore}
+                      disabled={isLoadingMore}
+                      className="px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50"
+                    >
+                      {isLoadingMore ? 'Loading...' : 'Load more'}
+                    </button>
+                  </div>
+                )}
               </div>
             )}
           </div>
@@ -14,6 +14,7 @@ export const api = axios.create({
 // Utility function to clear all tokens
 export const clearAllTokens = () => {
   localStorage.removeItem('token')
+  localStorage.removeItem('refresh_token')
   sessionStorage.removeItem('token')
   console.log('🧹 All tokens cleared')
 }
@@ -32,13 +33,47 @@ api.interceptors.request.use(
   }
 )
 
+// Access tokens are short-lived; concurrent 401s share one refresh
+let refreshRequest: Promise<string> | null = null
+
+const refreshAccessToken = () => {
+  if (!refreshRequest) {
+    const refreshToken = localStorage.getItem('refresh_token')
+    refreshRequest = axios
+      .post(`${API_BASE_URL}/auth/refresh`, null, {
+        headers: { Authorization: `Bearer ${refreshToken}` },
+        timeout: 10000,
+      })
+      .then((response) => {
+        localStorage.setItem('token', response.data.access_token)
+        return response.data.access_token as string
+      })
+      .finally(() => {
+        refreshRequest = null
+      })
+  }
+  return refreshRequest
+}
+
 // Response interceptor to handle auth errors
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config
+    if (error.response?.status === 401 && original && !original._retried && localStorage.getItem('refresh_token')) {
+      original._retried = true
+      try {
+        const token = await refreshAccessToken()
+        original.headers.Authorization = `Bearer ${token}`
+        return api(original)
+      } catch {
+        // Refresh token expired or revoked: fall through to a fresh login
+      }
+    }
     if (error.response?.status === 401) {
       console.log('🔒 401 Error detected - clearing token and redirecting to login')
       localStorage.removeItem('token')
+      localStorage.removeItem('refresh_token')
       sessionStorage.removeItem('token') // Clear from session storage too
       // Force a hard redirect to clear any cached state
       window.location.replace('/login')
@@ -53,8 +88,13 @@ export const authAPI = {
     api.post('/auth/login', data),
   register: (data: any) => 
     api.post('/auth/register', data),
+  // Tokens are read now, before the caller clears them from storage
   logout: () => 
-    api.post('/auth/logout'),
+    api.post(
+      '/auth/logout',
+      { refresh_token: localStorage.getItem('refresh_token') },
+      { headers: { Authorization: `Bearer ${localStorage.getItem('token')}` } }
+    ),
   getProfile: () => 
     api.get('/auth/profile'),
   updateProfile: (data: any) => {
@@ -92,8 +132,8 @@ export const adminAPI = {
     api.post(`/admin/residents/${id}/reject`, data),
   getAllRequests: (params?: any) => 
     api.get('/admin/requests', { params }),
-  getRequestDetails: (requestId: number) => 
-    api.get(`/admin/requests/${requestId}/details`),
+  getRequestDetails: (requestKey: string) => 
+    api.get(`/admin/requests/${requestKey}/details`),
   getAllUsers: (params?: any) => 
     api.get('/admin/users', { params }),
   getDocumentRequestFiles: (requestId: number) => 
@@ -234,14 +274,16 @@ export const documentsAPI = {
   // Requests
   createDocumentRequest: (data: any) => 
     api.post('/documents/requests', data),
-  getMyDocumentRequests: () => 
-    api.get('/documents/requests'),
+  getMyDocumentRequests: (params?: any) => 
+    api.get('/documents/requests', { params }),
+  getDocumentRequestStats: () => 
+    api.get('/documents/requests/stats'),
   getDocumentRequest: (requestId: number) => 
     api.get(`/documents/requests/${requestId}`),
   
   // Admin Requests
-  getAllDocumentRequests: () => 
-    api.get('/documents/requests'),
+  getAllDocumentRequests: (params?: any) => 
+    api.get('/documents/requests', { params }),
   approveDocumentRequest: (requestId: number, data?: any) => 
     api.post(`/documents/requests/${requestId}/approve`, data),
   rejectDocumentRequest: (requestId: number, data: { rejection_reason: string }) => 
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+BarangayLink Document PDF Benchmark
+Measures how many document PDFs generate_document_pdf renders per second.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+from utils.document_pdf import generate_document_pdf
+from utils.qr_code import qr_runs
+
+def sample_context(index, document_types):
+    """A document_pdf_context()-shaped dict without touching the database"""
+    now = datetime.now()
+    return {
+        'id': index,
+        'barangay_name': 'San Roque',
+        'document_type_name': document_types[index % len(document_types)],
+        'processed_at': now,
+        'expires_at': now + timedelta(days=30),
+        'requester_name': f'Juan Dela Cruz {index}',
+        'purpose': 'Employment requirement',
+        'quantity': 1,
+        'status': 'ready',
+        'qr_payload': f'https://barangaylink.example/verify-document/{index:036d}'
+    }
+
+def measure(label, func, contexts, repeat):
+    """Run func over contexts repeat times and print renders per second"""
+    func(contexts[0])  # Warm up imports and caches
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for context in contexts:
+            func(context)
+    elapsed = time.perf_counter() - started
+    renders = repeat * len(contexts)
+    print(f"  {label:<28} {renders / elapsed:8.1f} renders/s  ({elapsed / renders * 1000:.2f} ms each)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark document PDF rendering')
+    parser.add_argument('--documents', type=int, default=50, help='Distinct documents per round')
+    parser.add_argument('--repeat', type=int, default=4, help='Rounds to run')
+    parser.add_argument('--types', type=int, default=3, help='Distinct document types')
+    args = parser.parse_args()
+
+    document_types = [f'Barangay Clearance {n}' if n else 'Barangay Clearance' for n in range(args.types)]
+    contexts = [sample_context(i, document_types) for i in range(1, args.documents + 1)]
+
+    print(f"📄 Rendering {args.documents} documents x {args.repeat} rounds ({args.types} document types)")
+    measure('PDF (QR encoding cached)', generate_document_pdf, contexts, args.repeat)
+
+    def uncached(context):
+        qr_runs.cache_clear()
+        return generate_document_pdf(context)
+    measure('QR encoding + PDF', uncached, contexts, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+BarangayLink Request Priority Benchmark
+Measures how fast request priorities are scored, against the former per-call keyword scans.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+from utils.request_priority import base_score, priority_level, priority_score
+
+WORDS = [
+    'for', 'my', 'new', 'the', 'local', 'requirement', 'employment', 'job', 'hospital', 'bank', 'loan',
+    'school', 'enrollment', 'scholarship', 'travel', 'passport', 'medical', 'urgent', 'business', 'permit',
+    'insurance', 'claim', 'police', 'clearance', 'application', 'government', 'funeral', 'assistance'
+]
+DOCUMENT_TYPES = ['Barangay Clearance', 'Certificate of Indigency', 'Certificate of Residency', 'Business Permit', 'Medical Assistance Certificate']
+
+def legacy_score(document_type_name, purpose, created_at):
+    """The scoring as it was done on every admin page load before it was compiled"""
+    score = 20
+    high_priority_docs = ['medical', 'emergency', 'death', 'funeral', 'hospital', 'accident']
+    medium_priority_docs = ['employment', 'business', 'scholarship', 'education']
+    low_priority_docs = ['indigency', 'clearance', 'certificate', 'residency']
+    doc_name_lower = document_type_name.lower()
+    if any(keyword in doc_name_lower for keyword in high_priority_docs):
+        score += 30
+    elif any(keyword in doc_name_lower for keyword in medium_priority_docs):
+        score += 15
+    elif any(keyword in doc_name_lower for keyword in low_priority_docs):
+        score += 5
+    purpose_lower = purpose.lower()
+    urgent_keywords = ['emergency', 'urgent', 'asap', 'immediately', 'hospital', 'medical', 'death', 'funeral', 'accident']
+    high_keywords = ['employment', 'job', 'work', 'business', 'scholarship', 'education', 'deadline']
+    medium_keywords = ['government', 'official', 'requirement', 'application']
+    if any(keyword in purpose_lower for keyword in urgent_keywords):
+        score += 40
+    elif any(keyword in purpose_lower for keyword in high_keywords):
+        score += 25
+    elif any(keyword in purpose_lower for keyword in medium_keywords):
+        score += 10
+    days_old = (datetime.now() - datetime.fromisoformat(created_at)).days
+    if days_old >= 7:
+        score += 20
+    elif days_old >= 3:
+        score += 10
+    elif days_old >= 1:
+        score += 5
+    return score
+
+def synthetic_requests(count, seed):
+    """(document type, purpose, created_at ISO string) tuples"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    return [
+        (
+            rng.choice(DOCUMENT_TYPES),
+            ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))).capitalize(),
+            (now - timedelta(hours=rng.randint(0, 24 * 14))).isoformat()
+        )
+        for _ in range(count)
+    ]
+
+def measure(label, func, requests):
+    started = time.perf_counter()
+    for document_type_name, purpose, created_at in requests:
+        func(document_type_name, purpose, created_at)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<32} {len(requests) / elapsed:12,.0f} requests/s  ({elapsed * 1000:.0f} ms total)")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark request priority scoring')
+    parser.add_argument('--requests', type=int, default=100_000, help='Synthetic requests to score')
+    parser.add_argument('--seed', type=int, default=7, help='Random seed for the synthetic purposes')
+    args = parser.parse_args()
+
+    requests = synthetic_requests(args.requests, args.seed)
+
+    # The compiled rules must agree with the former scans before their speed means anything
+    mismatches = sum(
+        1 for document_type_name, purpose, created_at in requests[:10_000]
+        if legacy_score(document_type_name, purpose, created_at) != priority_score('document', document_type_name, purpose, created_at=created_at, now=datetime.now())
+    )
+    print(f"🔎 {mismatches} mismatching scores in the first {min(len(requests), 10_000):,} requests")
+
+    print(f"⏱️ Scoring {args.requests:,} synthetic document requests")
+    legacy = measure('Keyword scans + date parse', legacy_score, requests)
+    compiled = measure('Compiled rules (on write)', lambda name, purpose, _: base_score('document', name, purpose), requests)
+    measure('Compiled rules + level', lambda name, purpose, _: priority_level(base_score('document', name, purpose)), requests)
+    print(f"  Speedup on write: {legacy / compiled:.1f}x; reads now use the stored score instead of scoring")
+
+if __name__ == "__main__":
+    main()
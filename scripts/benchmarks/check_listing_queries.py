@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+BarangayLink Listing Query Check
+Fails if an admin listing endpoint issues more queries per page than its budget,
+or if the number of queries grows with the page size (an N+1).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Run against a throwaway SQLite database, never the configured one
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix='barangaylink-listing-'), 'listing.db')
+os.environ['RAILWAY_ENVIRONMENT'] = '1'
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import app
+from database import db
+from models.location import Location
+from models.resident_profile import ResidentProfile
+from models.user import User
+
+# Endpoint -> most queries one page may cost, including the JWT blocklist and admin checks
+LISTINGS = {
+    '/api/admin/residents/pending': 6,
+    '/api/admin/users': 6
+}
+
+def seed(residents):
+    """A province, municipality and barangay with one admin and `residents` pending residents with profiles"""
+    db.create_all()
+    province = Location(psgc_code='0100000000', name='Sample Province', geographic_level='Prov', level=2)
+    db.session.add(province)
+    db.session.flush()
+    municipality = Location(psgc_code='0101000000', name='Sample Municipality', geographic_level='Mun', level=3, parent_id=province.id)
+    db.session.add(municipality)
+    db.session.flush()
+    barangay = Location(psgc_code='0101001000', name='Sample Barangay', geographic_level='Bgy', level=4, parent_id=municipality.id)
+    db.session.add(barangay)
+    db.session.flush()
+
+    location = {'province_id': province.id, 'municipality_id': municipality.id, 'barangay_id': barangay.id}
+    admin = User(username='admin', email='admin@example.com', password_hash='-', first_name='Barangay', last_name='Admin',
+                 role='admin', status='approved', email_verified=True, **location)
+    db.session.add(admin)
+    for number in range(residents):
+        resident = User(username=f'resident{number}', email=f'resident{number}@example.com', password_hash='-',
+                        first_name='Resident', last_name=str(number), role='resident', status='pending',
+                        email_verified=True, **location)
+        db.session.add(resident)
+        db.session.flush()
+        db.session.add(ResidentProfile(user_id=resident.id, barangay_id=barangay.id, occupation='Teacher'))
+    db.session.commit()
+    return create_access_token(identity=str(admin.id))
+
+def count_queries(client, url, headers):
+    """(status code, number of SQL statements) for one request"""
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return response.status_code, len(statements)
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the query count of the admin listing endpoints')
+    parser.add_argument('--residents', type=int, default=60, help='Pending residents to seed')
+    parser.add_argument('--page-size', type=int, default=50, help='Rows on the large page')
+    args = parser.parse_args()
+
+    failures = 0
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {seed(args.residents)}'}
+        client = app.test_client()
+        print(f"🔎 Query counts with {args.residents} pending residents")
+        for path, budget in LISTINGS.items():
+            client.get(f'{path}?per_page=1', headers=headers)  # Warm the location tree
+            _, small = count_queries(client, f'{path}?per_page=1', headers)
+            status, large = count_queries(client, f'{path}?per_page={args.page_size}', headers)
+            ok = status == 200 and large <= budget and large == small
+            failures += not ok
+            print(f"  {'✅' if ok else '❌'} {path:<32} {small} queries for 1 row, {large} for {args.page_size} rows (budget {budget}, HTTP {status})")
+
+    if failures:
+        print(f"💥 {failures} listing(s) over budget or scaling with page size")
+        sys.exit(1)
+    print("🎉 Every listing runs in a constant number of queries")
+
+if __name__ == "__main__":
+    main()